@@ -1,6 +1,9 @@
 import streamlit as st
-from travel_agent import TravelAssistant
+from assistant_registry import get_registry
+from pricing import RESTAURANT_BUDGETS, ACCOMMODATION_BUDGETS
 import os
+import uuid
+import hashlib
 from dotenv import load_dotenv
 from datetime import datetime, date, timedelta
 import requests  # requests 모듈 추가
@@ -8,9 +11,18 @@ import requests  # requests 모듈 추가
 # 환경 변수 로드
 load_dotenv()
 
+# 프로세스 전역 어시스턴트 레지스트리 (재실행/세션 간 공유)
+@st.cache_resource(show_spinner=False)
+def load_assistant_registry():
+    return get_registry().warm_up()
+
 # 세션 상태 초기화
 if 'destination' not in st.session_state:
     st.session_state.destination = ""
+if 'session_id' not in st.session_state:
+    st.session_state.session_id = uuid.uuid4().hex
+if 'assistant' not in st.session_state:
+    st.session_state.assistant = load_assistant_registry().session_view(st.session_state.session_id)
 
 # 페이지 설정
 st.set_page_config(
@@ -147,8 +159,8 @@ with st.container():
         st.error("해당 기능은 현재 준비 중입니다. 다른 메뉴를 선택해주세요.")
         st.stop()
 
-    # TravelAssistant 인스턴스 생성
-    assistant = TravelAssistant()
+    # 세션별 어시스턴트 뷰 (공유 인스턴스를 재사용)
+    assistant = st.session_state.assistant
 
     def show_restaurant_recommendations():
         st.title("🍽️ 맛집 추천")
@@ -157,13 +169,19 @@ with st.container():
         location = st.text_input("지역을 입력하세요 (예: 서울, 부산)", value=st.session_state.destination)
         if location != st.session_state.destination:
             st.session_state.destination = location
+        show_destination_suggestions(location)
         cuisine = st.selectbox("음식 종류", ["한식", "중식", "일식", "양식", "분식", "기타"])
-        budget = st.selectbox("예산 범위", ["10,000원 이하", "10,000-30,000원", "30,000-50,000원", "50,000원 이상"])
+        budget = st.selectbox("예산 범위", list(RESTAURANT_BUDGETS))
+        near = st.text_input("기준 위치 (선택사항, 숙소/관광지 이름 또는 위도,경도)")
+        radius_km = st.slider("검색 반경 (km)", 0.5, 10.0, 2.0, 0.5) if near else None
         
         if st.button("맛집 찾기"):
             with st.spinner("맛집을 찾고 있습니다..."):
-                # 맛집 추천
-                restaurants = assistant.find_restaurants(location, cuisine=cuisine, budget=budget)
+                # 맛집 추천 (기준 위치가 있으면 가까운 순)
+                restaurants = assistant.find_restaurants(
+                    location, cuisine=cuisine, budget=RESTAURANT_BUDGETS[budget],
+                    near=near or None, radius_km=radius_km
+                )
                 
                 if isinstance(restaurants, str):
                     st.error(restaurants)
@@ -181,6 +199,8 @@ with st.container():
                                 st.markdown(f"**가격대**: {restaurant['price_range']}")
                             with col2:
                                 st.markdown(f"**주소**: {restaurant['address']}")
+                                if "distance_km" in restaurant:
+                                    st.markdown(f"**거리**: {restaurant['distance_km']:.1f}km")
                                 st.markdown(f"**영업시간**: {restaurant['opening_hours']}")
                             
                             # 설명
@@ -194,6 +214,147 @@ with st.container():
                             
                             st.markdown("---")
 
+    def show_weather(weather):
+        if isinstance(weather, dict):
+            st.subheader("🌤️ 날씨 정보")
+            
+            col1, col2 = st.columns(2)
+            with col1:
+                st.write("**현재 날씨**")
+                current = weather['현재 날씨']
+                st.write(f"🌡️ 온도: {current['온도']}")
+                st.write(f"🌡️ 체감온도: {current['체감온도']}")
+                st.write(f"☁️ 날씨: {current['날씨']}")
+                st.write(f"💧 습도: {current['습도']}")
+            
+            with col2:
+                st.write("**일일 예보**")
+                forecast = weather['일일 예보']
+                st.write(f"📈 최고기온: {forecast['최고기온']}")
+                st.write(f"📉 최저기온: {forecast['최저기온']}")
+                st.write(f"🌧️ 강수확률: {forecast['강수확률']}")
+                st.write(f"☔ 강수량: {forecast['총강수량']}")
+
+    def show_exchange(exchange_info):
+        if isinstance(exchange_info, dict):
+            st.subheader("💱 환율 정보")
+            currency_info = exchange_info["currency_info"]
+            rates = exchange_info["exchange_rates"]
+            base_currency = exchange_info["base_currency"]
+            
+            col1, col2 = st.columns(2)
+            with col1:
+                st.write("**통화 정보**")
+                st.write(f"통화명: {currency_info['통화명']}")
+                st.write(f"통화 기호: {currency_info['기호']}")
+            
+            with col2:
+                st.write("**환율 정보**")
+                if base_currency == "KRW":
+                    st.write("1,000원 기준:")
+                    if "USD" in rates:
+                        st.write(f"USD: ${rates['USD']:.2f}")
+                    if "JPY" in rates:
+                        st.write(f"JPY: ¥{rates['JPY']:.0f}")
+                elif base_currency == "JPY":
+                    st.write("100엔 기준:")
+                    if "KRW" in rates:
+                        st.write(f"KRW: ₩{rates['KRW']*1000:.0f}")
+                    if "USD" in rates:
+                        st.write(f"USD: ${rates['USD']:.2f}")
+                elif base_currency == "USD":
+                    st.write("1달러 기준:")
+                    if "KRW" in rates:
+                        st.write(f"KRW: ₩{rates['KRW']:.0f}")
+                    if "JPY" in rates:
+                        st.write(f"JPY: ¥{rates['JPY']:.0f}")
+                elif base_currency == "EUR":
+                    st.write("1유로 기준:")
+                    if "KRW" in rates:
+                        st.write(f"KRW: ₩{rates['KRW']:.0f}")
+                    if "USD" in rates:
+                        st.write(f"USD: ${rates['USD']:.2f}")
+                else:
+                    st.write(f"1 {base_currency} 기준:")
+                    if "KRW" in rates:
+                        st.write(f"KRW: ₩{rates['KRW']:,.2f}")
+                    if "USD" in rates:
+                        st.write(f"USD: ${rates['USD']:.4f}")
+                rates_meta = exchange_info.get("rates_meta", {})
+                if rates_meta.get("updated_at"):
+                    note = " (갱신 중)" if rates_meta.get("stale") else ""
+                    st.caption(f"환율 기준 시각: {rates_meta['updated_at']}{note}")
+            
+            # 결제 정보
+            st.subheader("💳 결제 정보")
+            payment = currency_info["현금/카드"]
+            for method, info in payment.items():
+                with st.expander(f"**{method}**"):
+                    st.write(info)
+        else:
+            st.warning(exchange_info)
+
+    def show_destination_photo(photos):
+        if isinstance(photos, list) and photos:
+            # 첫 번째 이미지만 표시
+            photo = photos[0]
+            try:
+                st.image(
+                    photo['url'],
+                    caption=photo['description'],
+                    use_container_width=True
+                )
+            except Exception as e:
+                st.warning(f"이미지를 불러올 수 없습니다: {photo['description']}")
+
+    def show_paged(state_key, fetch_page, render_item, empty_message):
+        # 지금까지 펼친 페이지의 커서만 세션에 기억하고, 화면에 보이는 페이지만 다시 읽습니다
+        cursors = st.session_state.setdefault(state_key, [None])
+        next_cursor = None
+        shown = 0
+        for cursor in cursors:
+            page = fetch_page(cursor)
+            for item in page["items"]:
+                render_item(item)
+            shown += len(page["items"])
+            next_cursor = page["next_cursor"]
+            if next_cursor is None:
+                break
+        
+        if shown == 0:
+            st.info(empty_message)
+        elif next_cursor:
+            st.button(
+                "더 보기",
+                key=f"{state_key}:more",
+                on_click=lambda: cursors.append(next_cursor)
+            )
+
+    def choose_destination(name):
+        st.session_state.destination = name
+
+    def show_destination_suggestions(text):
+        # 입력한 이름이 여행지 이름/별칭과 일치하지 않으면 이름/초성으로 시작하는 여행지를 인기순으로,
+        # 그다음 철자가 비슷한 여행지를 제안합니다. 비슷한 여행지는 사용자가 골라야만 바뀝니다.
+        if not text.strip() or assistant.resolve_destination(text) in assistant.catalog.destinations:
+            return
+        suggestions = assistant.autocomplete_destinations(text, limit=5)
+        suggested = {suggestion["destination"] for suggestion in suggestions}
+        for destination_id, _ in assistant.find_destinations(text, limit=5):
+            if len(suggestions) < 5 and destination_id not in suggested:
+                suggestions.append({"id": destination_id, "label": destination_id, "destination": destination_id})
+                suggested.add(destination_id)
+        if suggestions:
+            st.caption("추천 여행지")
+            columns = st.columns(len(suggestions))
+            for column, suggestion in zip(columns, suggestions):
+                column.button(
+                    suggestion["label"],
+                    key=f"suggest:{text}:{suggestion['id']}",
+                    on_click=choose_destination,
+                    args=(suggestion["destination"],)
+                )
+
     # 메인 콘텐츠
     if menu == "🏠 홈":
         st.title("🧳 여행 도우미 AI")
@@ -202,102 +363,41 @@ with st.container():
         # 여행지 입력
         destination = st.text_input("여행지를 입력하세요 (예: 서울, 도쿄, 뉴욕, 파리, 런던, 로마, 베니스, 바르셀로나, 암스테르담, 싱가포르, 방콕, 두바이)", 
                                   value=st.session_state.destination)
+        show_destination_suggestions(destination)
         
         # 검색 버튼
-        if st.button("검색", use_container_width=True):
+        searched = st.button("검색", use_container_width=True)
+        if searched:
             if destination:
                 if destination != st.session_state.destination:
                     st.session_state.destination = destination
+                resolved = assistant.resolve_destination(destination)
+                if resolved != destination.strip():
+                    st.caption(f"'{destination}'을(를) '{resolved}'(으)로 검색합니다.")
                 
                 with st.spinner(f"{destination} 여행 정보를 불러오는 중..."):
-                    # 날씨 정보
-                    weather = assistant.get_weather(destination, datetime.now().strftime("%Y-%m-%d"))
-                    if isinstance(weather, dict):
-                        st.subheader("🌤️ 날씨 정보")
-                        
-                        col1, col2 = st.columns(2)
-                        with col1:
-                            st.write("**현재 날씨**")
-                            current = weather['현재 날씨']
-                            st.write(f"🌡️ 온도: {current['온도']}")
-                            st.write(f"🌡️ 체감온도: {current['체감온도']}")
-                            st.write(f"☁️ 날씨: {current['날씨']}")
-                            st.write(f"💧 습도: {current['습도']}")
-                        
-                        with col2:
-                            st.write("**일일 예보**")
-                            forecast = weather['일일 예보']
-                            st.write(f"📈 최고기온: {forecast['최고기온']}")
-                            st.write(f"📉 최저기온: {forecast['최저기온']}")
-                            st.write(f"🌧️ 강수확률: {forecast['강수확률']}")
-                            st.write(f"☔ 강수량: {forecast['총강수량']}")
-                    
-                    # 환율 정보
-                    exchange_info = assistant.get_exchange_info(destination)
-                    if isinstance(exchange_info, dict):
-                        st.subheader("💱 환율 정보")
-                        currency_info = exchange_info["currency_info"]
-                        rates = exchange_info["exchange_rates"]
-                        base_currency = exchange_info["base_currency"]
-                        
-                        col1, col2 = st.columns(2)
-                        with col1:
-                            st.write("**통화 정보**")
-                            st.write(f"통화명: {currency_info['통화명']}")
-                            st.write(f"통화 기호: {currency_info['기호']}")
-                        
-                        with col2:
-                            st.write("**환율 정보**")
-                            if base_currency == "KRW":
-                                st.write("1,000원 기준:")
-                                if "USD" in rates:
-                                    st.write(f"USD: ${rates['USD']:.2f}")
-                                if "JPY" in rates:
-                                    st.write(f"JPY: ¥{rates['JPY']:.0f}")
-                            elif base_currency == "JPY":
-                                st.write("100엔 기준:")
-                                if "KRW" in rates:
-                                    st.write(f"KRW: ₩{rates['KRW']*1000:.0f}")
-                                if "USD" in rates:
-                                    st.write(f"USD: ${rates['USD']:.2f}")
-                            elif base_currency == "USD":
-                                st.write("1달러 기준:")
-                                if "KRW" in rates:
-                                    st.write(f"KRW: ₩{rates['KRW']:.0f}")
-                                if "JPY" in rates:
-                                    st.write(f"JPY: ¥{rates['JPY']:.0f}")
-                            elif base_currency == "EUR":
-                                st.write("1유로 기준:")
-                                if "KRW" in rates:
-                                    st.write(f"KRW: ₩{rates['KRW']:.0f}")
-                                if "USD" in rates:
-                                    st.write(f"USD: ${rates['USD']:.2f}")
-                        
-                        # 결제 정보
-                        st.subheader("💳 결제 정보")
-                        payment = currency_info["현금/카드"]
-                        for method, info in payment.items():
-                            with st.expander(f"**{method}**"):
-                                st.write(info)
-                    else:
-                        st.warning(exchange_info)
+                    # 날씨, 환율, 사진을 동시에 조회하고 도착하는 순서대로 표시
+                    sections = {
+                        "weather": (st.empty(), show_weather, "날씨"),
+                        "exchange": (st.empty(), show_exchange, "환율"),
+                        "photos": (st.empty(), show_destination_photo, "사진")
+                    }
+                    overview = assistant.iter_destination_overview(
+                        destination, datetime.now().strftime("%Y-%m-%d")
+                    )
+                    for section, result in overview:
+                        slot, show, label = sections[section]
+                        with slot.container():
+                            if result is None:
+                                st.warning(f"{label} 정보를 제시간에 불러오지 못했습니다.")
+                            else:
+                                show(result)
             else:
                 st.error("여행지를 입력해주세요.")
 
         # 여행지 입력 시 대표 이미지 표시
-        if destination:
-            photos = assistant.get_travel_photos(destination)
-            if isinstance(photos, list) and photos:
-                # 첫 번째 이미지만 표시
-                photo = photos[0]
-                try:
-                    st.image(
-                        photo['url'],
-                        caption=photo['description'],
-                        use_container_width=True
-                    )
-                except Exception as e:
-                    st.warning(f"이미지를 불러올 수 없습니다: {photo['description']}")
+        if destination and not searched:
+            show_destination_photo(assistant.get_travel_photos(destination))
 
     # 맛집 추천 페이지
     elif menu == "🍽️ 맛집 추천":
@@ -327,6 +427,7 @@ with st.container():
             location = st.text_input("지역", value=st.session_state.destination)
             if location != st.session_state.destination:
                 st.session_state.destination = location
+            show_destination_suggestions(location)
             check_in = st.date_input("체크인", date.today())
             check_out = st.date_input("체크아웃", date.today() + timedelta(days=1))
         
@@ -334,8 +435,9 @@ with st.container():
             guests = st.number_input("숙박 인원", min_value=1, max_value=10, value=2)
             budget = st.selectbox(
                 "예산",
-                ["5만원 이하", "5-10만원", "10-20만원", "20만원 이상"]
+                list(ACCOMMODATION_BUDGETS)
             )
+            near = st.text_input("기준 위치 (선택사항, 관광지 이름 또는 위도,경도)")
         
         if st.button("숙소 찾기", use_container_width=True):
             booking_url = f"https://www.booking.com/searchresults.html?ss={location}"
@@ -354,10 +456,21 @@ with st.container():
                     check_in=check_in,
                     check_out=check_out,
                     guests=guests,
-                    budget=budget
+                    budget=ACCOMMODATION_BUDGETS[budget],
+                    near=near or None
                 )
-                st.success("숙소 추천이 완성되었습니다!")
-                st.write(result)
+                if isinstance(result, dict) and result["available"]:
+                    st.success(f"{near} 주변에서 예약 가능한 숙소 {len(result['options'])}곳을 찾았습니다!")
+                    for option in result["options"]:
+                        st.markdown(
+                            f"- **{option['name']}** ({option['distance_km']:.1f}km) · {option['price']} · "
+                            f"⭐ {option['rating']} · 남은 객실 {option['remaining']}"
+                        )
+                elif isinstance(result, dict):
+                    st.info(f"{near} 주변에 선택한 기간과 예산으로 예약 가능한 숙소가 없습니다.")
+                else:
+                    st.success("숙소 추천이 완성되었습니다!")
+                    st.write(result)
 
     # 환율 정보 페이지
     elif menu == "💱 환율 정보":
@@ -366,6 +479,7 @@ with st.container():
         location = st.text_input("국가/도시를 입력하세요 (예: 서울, 도쿄, 뉴욕, 파리, 런던)", value=st.session_state.destination)
         if location != st.session_state.destination:
             st.session_state.destination = location
+        show_destination_suggestions(location)
         
         if st.button("환율 정보 조회", use_container_width=True):
             with st.spinner("환율 정보를 조회하고 있습니다..."):
@@ -459,11 +573,12 @@ with st.container():
                     
                     # 사진 그리드 표시
                     cols = st.columns(min(3, len(photos)))
-                    for i, photo in enumerate(photos):
+                    # base64 data URI 대신 JPEG 바이트를 그대로 전달 (브라우저 캐시 가능한 미디어 URL로 제공됨)
+                    images = assistant.get_photos_bytes([photo["url"] for photo in photos])
+                    for i, (photo, img_bytes) in enumerate(zip(photos, images)):
                         with cols[i % len(cols)]:
-                            img_str = assistant.get_photo_base64(photo["url"])
-                            if img_str:
-                                st.image(f"data:image/jpeg;base64,{img_str}")
+                            if img_bytes:
+                                st.image(img_bytes)
                                 st.caption(f"📷 {photo['photographer']}")
                                 if photo["description"]:
                                     st.caption(photo["description"])
@@ -556,21 +671,33 @@ with st.container():
         with tab2:
             st.subheader("리뷰 보기")
             destination = st.text_input("여행지 검색")
+            review_order = {"최신순": "newest", "평점순": "rating"}[
+                st.radio("정렬", ["최신순", "평점순"], horizontal=True)
+            ]
             
             if destination:
-                reviews = assistant.get_reviews(destination)
-                avg_rating = assistant.get_average_rating(destination)
+                rating_summary = assistant.get_rating_summary(destination)
                 
-                if avg_rating > 0:
-                    st.metric("평균 평점", f"{avg_rating:.1f} / 5.0")
+                if rating_summary["count"] > 0:
+                    col1, col2 = st.columns(2)
+                    with col1:
+                        st.metric("평균 평점", f"{rating_summary['average']:.1f} / 5.0")
+                        st.caption(f"리뷰 {rating_summary['count']}개 · 최근 리뷰 기준 {rating_summary['decayed_average']:.1f}")
+                    with col2:
+                        for star in range(5, 0, -1):
+                            st.write(f"{'⭐' * star} {rating_summary['histogram'][star]}")
                 
-                if reviews:
-                    for review in reviews:
-                        with st.expander(f"⭐ {review['rating']}점 - {review['date']}"):
-                            st.write(f"작성자: {review['user_id']}")
-                            st.write(review['comment'])
-                else:
-                    st.info("아직 등록된 리뷰가 없습니다.")
+                def render_review(review):
+                    with st.expander(f"⭐ {review['rating']}점 - {review['date']}"):
+                        st.write(f"작성자: {review['user_id']}")
+                        st.write(review['comment'])
+                
+                show_paged(
+                    f"reviews:{destination}:{review_order}",
+                    lambda cursor: assistant.get_reviews_page(destination, review_order, cursor, limit=10),
+                    render_review,
+                    "아직 등록된 리뷰가 없습니다."
+                )
 
     # 여행 팁 페이지
     elif menu == "여행 팁":
@@ -604,18 +731,19 @@ with st.container():
             )
             
             if destination:
-                tips = assistant.get_travel_tips(
-                    destination,
-                    category if category != "전체" else None
-                )
+                tip_category = category if category != "전체" else None
                 
-                if tips:
-                    for tip in tips:
-                        with st.expander(f"{tip['category']} - {tip['date']}"):
-                            st.write(f"작성자: {tip['user_id']}")
-                            st.write(tip['tip'])
-                else:
-                    st.info("아직 등록된 여행 팁이 없습니다.")
+                def render_tip(tip):
+                    with st.expander(f"{tip['category']} - {tip['date']}"):
+                        st.write(f"작성자: {tip['user_id']}")
+                        st.write(tip['tip'])
+                
+                show_paged(
+                    f"tips:{destination}:{category}",
+                    lambda cursor: assistant.get_travel_tips_page(destination, tip_category, cursor, limit=10),
+                    render_tip,
+                    "아직 등록된 여행 팁이 없습니다."
+                )
 
     # 여행지 비교 페이지
     elif menu == "여행지 비교":
@@ -663,6 +791,10 @@ with st.container():
                     "서비스 종류",
                     ["숙소", "투어", "액티비티", "레스토랑", "교통편"]
                 )
+                stay_nights = st.number_input("이용 일수 (숙박일수)", min_value=1, max_value=30, value=1)
+                guests = st.number_input("인원", min_value=1, max_value=10, value=2)
+                # 숙소는 인원에 필요한 객실 수만큼 확인하고 차감합니다
+                room_guests = guests if service_type == "숙소" else None
             
             with col2:
                 details = st.text_area("예약 상세 정보")
@@ -674,20 +806,43 @@ with st.container():
                         availability = assistant.check_availability(
                             destination=destination,
                             date=date.strftime("%Y-%m-%d"),
-                            service_type=service_type
+                            service_type=service_type,
+                            check_out=(date + timedelta(days=stay_nights)).strftime("%Y-%m-%d"),
+                            guests=room_guests
                         )
-                        st.write(availability)
+                        if isinstance(availability, dict) and availability["available"]:
+                            for option in availability["options"]:
+                                st.write(
+                                    f"**{option['name']}** · {option['price']} · "
+                                    f"⭐ {option['rating']} · 남은 수량 {option['remaining']}"
+                                )
+                        elif isinstance(availability, dict):
+                            st.info("선택한 기간에 예약 가능한 상품이 없습니다.")
+                        else:
+                            st.warning(availability)
             
             if st.button("예약하기"):
                 if destination and date and service_type and details and user_id:
+                    # 같은 세션에서 같은 내용으로 다시 누르면 같은 키가 만들어져 중복 예약되지 않습니다
+                    form = "|".join([
+                        st.session_state.session_id, destination, date.isoformat(), str(stay_nights),
+                        str(room_guests), service_type, details, user_id
+                    ])
+                    idempotency_key = hashlib.sha256(form.encode("utf-8")).hexdigest()
                     with st.spinner("예약을 진행하고 있습니다..."):
                         booking = assistant.make_booking(
                             destination=destination,
                             date=date.strftime("%Y-%m-%d"),
                             service_type=service_type,
-                            details=details
+                            details=details,
+                            idempotency_key=idempotency_key,
+                            check_out=(date + timedelta(days=stay_nights)).strftime("%Y-%m-%d"),
+                            guests=room_guests
                         )
-                        st.success(f"예약이 완료되었습니다! 예약 번호: {booking['id']}")
+                        if isinstance(booking, dict):
+                            st.success(f"예약이 완료되었습니다! 예약 번호: {booking['id']} ({booking['option']})")
+                        else:
+                            st.error(booking)
                 else:
                     st.error("모든 필드를 입력해주세요.")
         
@@ -696,6 +851,8 @@ with st.container():
             destination = st.text_input("여행지 검색 (선택사항)")
             
             bookings = assistant.get_booking_history(destination if destination else None)
+            if isinstance(bookings, list):
+                bookings = {destination: bookings} if bookings else {}
             
             if bookings:
                 for dest, booking_list in bookings.items():
@@ -703,6 +860,12 @@ with st.container():
                     for booking in booking_list:
                         with st.expander(f"예약 번호: {booking['id']} - {booking['date']}"):
                             st.write(f"서비스: {booking['service_type']}")
+                            if booking.get('option'):
+                                st.write(f"옵션: {booking['option']}")
+                            if booking.get('check_out'):
+                                st.write(f"체크아웃: {booking['check_out']}")
+                            if booking.get('units', 1) > 1:
+                                st.write(f"객실 수: {booking['units']}")
                             st.write(f"상태: {booking['status']}")
                             st.write(f"예약일: {booking['created_at']}")
                             st.write("상세 정보:")
@@ -736,6 +899,10 @@ with st.container():
                         
                         for attraction in attractions:
                             with st.expander(f"⭐ {attraction['name']} - 평점: {attraction['rating']}"):
+                                st.caption(f"{attraction['category']} · 리뷰 {attraction['review_count']:,}개")
+                                if attraction["photo_url"]:
+                                    st.image(attraction["photo_url"])
+                                
                                 # 주소와 연락처 정보
                                 col1, col2 = st.columns(2)
                                 with col1:
@@ -923,10 +1090,17 @@ with st.container():
                         st.write(f"**기간**: {itinerary['duration']}일")
                         st.write(f"**예산**: {itinerary['budget']}")
                         st.write(f"**선호사항**: {', '.join(itinerary['preferences'])}")
+                        st.write(f"**총 이동 시간**: 약 {itinerary['total_travel_minutes']}분")
+                        if itinerary["unscheduled"]:
+                            st.caption(
+                                "영업시간이 맞지 않아 일정에 넣지 못한 곳: "
+                                + ", ".join(attraction["name"] for attraction in itinerary["unscheduled"])
+                            )
                         
                         # 일별 계획
                         for plan in itinerary["daily_plans"]:
                             st.subheader(f"Day {plan['day']} - {plan['date']}")
+                            st.caption(f"이동 시간 약 {plan['travel_minutes']}분")
                             
                             # 날씨 정보
                             if plan["weather"]:
@@ -938,27 +1112,33 @@ with st.container():
                             if plan["morning"]:
                                 st.write("**오전**")
                                 for attraction in plan["morning"]:
-                                    with st.expander(f"⭐ {attraction['name']}"):
-                                        st.write(f"주소: {attraction['address']}")
-                                        if "photo_url" in attraction:
+                                    with st.expander(f"⭐ {attraction['arrival']}-{attraction['departure']} {attraction['name']}"):
+                                        st.write(f"주소: {attraction.get('address', '주소 정보 없음')}")
+                                        if attraction["travel_minutes"]:
+                                            st.write(f"이동: 약 {attraction['travel_minutes']}분")
+                                        if attraction.get("photo_url"):
                                             st.image(attraction["photo_url"])
                             
                             # 오후 계획
                             if plan["afternoon"]:
                                 st.write("**오후**")
                                 for attraction in plan["afternoon"]:
-                                    with st.expander(f"⭐ {attraction['name']}"):
-                                        st.write(f"주소: {attraction['address']}")
-                                        if "photo_url" in attraction:
+                                    with st.expander(f"⭐ {attraction['arrival']}-{attraction['departure']} {attraction['name']}"):
+                                        st.write(f"주소: {attraction.get('address', '주소 정보 없음')}")
+                                        if attraction["travel_minutes"]:
+                                            st.write(f"이동: 약 {attraction['travel_minutes']}분")
+                                        if attraction.get("photo_url"):
                                             st.image(attraction["photo_url"])
                             
                             # 저녁 계획
                             if plan["evening"]:
                                 st.write("**저녁**")
                                 for attraction in plan["evening"]:
-                                    with st.expander(f"⭐ {attraction['name']}"):
-                                        st.write(f"주소: {attraction['address']}")
-                                        if "photo_url" in attraction:
+                                    with st.expander(f"⭐ {attraction['arrival']}-{attraction['departure']} {attraction['name']}"):
+                                        st.write(f"주소: {attraction.get('address', '주소 정보 없음')}")
+                                        if attraction["travel_minutes"]:
+                                            st.write(f"이동: 약 {attraction['travel_minutes']}분")
+                                        if attraction.get("photo_url"):
                                             st.image(attraction["photo_url"])
                             
                             # 이벤트
@@ -0,0 +1,136 @@
+import atexit
+import threading
+
+from travel_agent import TravelAssistant
+
+
+class SessionAssistant:
+    """공유 TravelAssistant 위에 올라가는 세션별 뷰입니다.
+
+    리뷰, 팁, 예약 저장소(storage)는 모든 세션이 함께 사용하고,
+    이 세션에서 만든 예약 번호만 따로 기억합니다.
+    """
+
+    def __init__(self, registry, session_id):
+        self._registry = registry
+        self.session_id = session_id
+        self.booking_ids = []
+
+    @property
+    def assistant(self):
+        # reload() 이후에도 항상 현재 인스턴스를 바라보도록 매번 조회합니다
+        return self._registry.get()
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self.assistant, name)
+
+    def make_booking(self, destination, date, service_type, details, option=None, idempotency_key=None,
+                     check_out=None, guests=None):
+        """예약을 진행하고 세션 예약 목록에 기록합니다."""
+        booking = self.assistant.make_booking(
+            destination, date, service_type, details,
+            option=option,
+            idempotency_key=idempotency_key,
+            check_out=check_out,
+            guests=guests
+        )
+        if isinstance(booking, dict) and booking["id"] not in self.booking_ids:
+            self.booking_ids.append(booking["id"])
+        return booking
+
+    def get_session_bookings(self):
+        """이 세션에서 만든 예약만 조회합니다."""
+        history = self.assistant.get_booking_history()
+        if not isinstance(history, dict):
+            return history
+        own_ids = set(self.booking_ids)
+        return [
+            booking
+            for bookings in history.values()
+            for booking in bookings
+            if booking["id"] in own_ids
+        ]
+
+
+class AssistantRegistry:
+    """프로세스 전체에서 하나의 TravelAssistant를 공유하는 레지스트리입니다."""
+
+    def __init__(self, factory=TravelAssistant):
+        self._factory = factory
+        self._lock = threading.Lock()
+        self._assistant = None
+
+    def get(self):
+        """공유 인스턴스를 반환합니다. 없으면 한 번만 생성합니다."""
+        assistant = self._assistant
+        if assistant is not None:
+            return assistant
+        with self._lock:
+            if self._assistant is None:
+                self._assistant = self._factory()
+            return self._assistant
+
+    def warm_up(self):
+        """첫 요청 전에 인스턴스를 만들고 카탈로그를 읽어 둡니다."""
+        self.get().warm_up()
+        return self
+
+    def reload(self):
+        """환경 설정을 다시 읽어 인스턴스를 교체합니다. 저장소 데이터는 유지됩니다."""
+        with self._lock:
+            old = self._assistant
+            new = self._factory()
+            if old is not None:
+                # 기존 저장소를 새 인스턴스로 옮기고, 새로 열린 저장소는 이전 인스턴스와 함께 닫습니다
+                old.use_storage(new.use_storage(old.storage))
+            self._assistant = new
+        if old is not None:
+            old.close()
+        new.warm_up()
+        return new
+
+    def shutdown(self):
+        """공유 인스턴스를 정리합니다. 이후 get()을 호출하면 새로 생성됩니다."""
+        with self._lock:
+            old = self._assistant
+            self._assistant = None
+        if old is not None:
+            old.close()
+
+    def session_view(self, session_id):
+        """세션별 뷰를 생성합니다."""
+        return SessionAssistant(self, session_id)
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def get_registry():
+    """프로세스 전역 레지스트리를 반환합니다."""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = AssistantRegistry()
+                atexit.register(_registry.shutdown)
+    return _registry
+
+
+if __name__ == "__main__":
+    # 간단한 세션 예약 테스트 코드
+    registry = AssistantRegistry()
+    try:
+        session = registry.session_view("test-session")
+        booking = session.make_booking(
+            "서울", "2026-10-19", "숙소", "2명",
+            idempotency_key="session-test", check_out="2026-10-21"
+        )
+        assert isinstance(booking, dict), booking
+        assert booking["check_out"] == "2026-10-21"
+        assert [item["id"] for item in session.get_session_bookings()] == [booking["id"]]
+        print(f"세션 예약: {booking['id']} {booking['option']} {booking['date']} ~ {booking['check_out']}")
+    finally:
+        registry.shutdown()
@@ -0,0 +1,89 @@
+from array import array
+
+from catalog import FrozenDict, FrozenList
+
+DEFAULT_LIMIT = 10
+# (도시, 카테고리)마다 미리 계산해 두는 인기순 관광지 수
+TOP_N = 20
+# 리뷰 수가 적은 곳의 평점을 전체 평균 쪽으로 당길 때 쓰는 가상의 리뷰 수
+PRIOR_REVIEWS = 5000
+
+# 카탈로그에 없는 항목을 화면에 보여 줄 때의 기본값
+ATTRACTION_DEFAULTS = {
+    "phone": "전화번호 정보 없음",
+    "website": "웹사이트 정보 없음",
+    "photo_url": None,
+    "reviews": FrozenList()
+}
+
+
+def popularity_score(rating, review_count, mean_rating, prior=PRIOR_REVIEWS):
+    """평점과 리뷰 수를 합친 인기 점수(베이지안 평균)입니다.
+
+    리뷰가 많을수록 자기 평점에, 적을수록 전체 평균 평점에 가까워집니다.
+    """
+    return (rating * review_count + mean_rating * prior) / (review_count + prior)
+
+
+class AttractionIndex:
+    """인기 관광지 색인입니다.
+
+    인기 점수가 높은 순서로 관광지 번호를 매기므로 도시/카테고리별 목록이 모두
+    인기순으로 정렬되어 있고, (도시, 카테고리)별 상위 TOP_N개는 미리 잘라 둡니다.
+    """
+
+    def __init__(self, attractions_by_city):
+        self.source = attractions_by_city
+        rows = [
+            (city, attraction)
+            for city, attractions in attractions_by_city.items()
+            for attraction in attractions
+        ]
+        reviews = sum(attraction["review_count"] for _, attraction in rows)
+        mean_rating = (
+            sum(attraction["rating"] * attraction["review_count"] for _, attraction in rows) / reviews
+            if reviews else 0.0
+        )
+        scored = sorted(
+            (
+                (popularity_score(attraction["rating"], attraction["review_count"], mean_rating), city, attraction)
+                for city, attraction in rows
+            ),
+            key=lambda row: (-row[0], row[2]["name"])
+        )
+
+        self.records = []
+        self.scores = array("d")
+        self.by_city = {}
+        self.by_category = {}
+        self.tops = {}
+        for attraction_id, (score, city, attraction) in enumerate(scored):
+            record = FrozenDict(ATTRACTION_DEFAULTS, **attraction, city=city, popularity=round(score, 4))
+            self.records.append(record)
+            self.scores.append(score)
+            self.by_city.setdefault(city, array("l")).append(attraction_id)
+            self.by_category.setdefault(attraction["category"], array("l")).append(attraction_id)
+            for key in ((city, None), (city, attraction["category"]), (None, None), (None, attraction["category"])):
+                top = self.tops.setdefault(key, array("l"))
+                if len(top) < TOP_N:
+                    top.append(attraction_id)
+
+    def __len__(self):
+        return len(self.records)
+
+    def top(self, city=None, category=None, limit=DEFAULT_LIMIT):
+        """도시/카테고리 조건에 맞는 관광지를 인기순으로 limit개(None이면 모두) 반환합니다."""
+        if limit is not None and limit <= TOP_N:
+            return [self.records[attraction_id] for attraction_id in self.tops.get((city, category), ())[:limit]]
+        # 미리 계산한 개수보다 많이 요청하면 짧은 쪽 목록을 기준으로 다른 조건을 확인합니다
+        city_postings = self.by_city.get(city, array("l")) if city is not None else None
+        if category is None:
+            postings = city_postings if city_postings is not None else range(len(self.records))
+        else:
+            postings = self.by_category.get(category, array("l"))
+            if city_postings is not None and len(city_postings) < len(postings):
+                postings = [attraction_id for attraction_id in city_postings
+                            if self.records[attraction_id]["category"] == category]
+            elif city is not None:
+                postings = [attraction_id for attraction_id in postings if self.records[attraction_id]["city"] == city]
+        return [self.records[attraction_id] for attraction_id in postings[:limit]]
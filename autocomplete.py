@@ -0,0 +1,191 @@
+import heapq
+from array import array
+from bisect import bisect_left
+
+from destination_resolver import CHOSEONG, choseong, is_hangul, normalize
+
+DEFAULT_LIMIT = 10
+# 노드마다 미리 계산해 두는 인기순 후보 수 (한 번에 돌려줄 수 있는 최대 개수)
+MAX_LIMIT = 20
+# 이보다 작은 노드는 후보를 저장하지 않고 조회할 때 바로 순위를 매깁니다
+LEAF_SIZE = 64
+# 어떤 이름 글자보다도 뒤에 정렬되는 문자 (접두사 구간의 끝을 찾을 때 사용)
+_END = "\U0010ffff"
+_CHOSEONG_SET = frozenset(CHOSEONG)
+
+
+class Autocomplete:
+    """여행지/장소 이름 접두사 자동 완성 색인입니다.
+
+    이름, 별칭, 한글 이름의 초성을 정규화한 검색어를 정렬해 둔 배열이 압축 트라이 역할을 합니다.
+    트라이 노드 하나는 정렬된 배열의 연속 구간과 같으므로 접두사에 해당하는 노드는 이진 탐색
+    두 번으로 찾고, LEAF_SIZE보다 큰 노드에만 인기순 상위 MAX_LIMIT개 장소를 미리 계산해 둡니다.
+    노드 객체를 따로 만들지 않으므로 검색어 문자열 외에는 메모리를 거의 쓰지 않습니다.
+    """
+
+    def __init__(self, places):
+        """places는 (장소 ID, 표시 이름, 검색 이름 목록, 인기도[, 여행지])의 목록입니다.
+
+        여행지를 주지 않으면 장소 ID가 곧 여행지입니다.
+        """
+        # 색인을 만든 원본 데이터 (바뀌었는지 확인할 때 사용)
+        self.source = None
+        self.geo = None
+        self.ids = []
+        self.labels = []
+        self.destinations = []
+        self.popularity = array("d")
+        rows = set()
+        for place_id, label, names, popularity, *destination in places:
+            number = len(self.ids)
+            self.ids.append(place_id)
+            self.labels.append(label)
+            self.destinations.append(destination[0] if destination else place_id)
+            self.popularity.append(popularity)
+            for name in names:
+                key = normalize(name)
+                if not key:
+                    continue
+                rows.add((key, number))
+                if any(is_hangul(char) for char in key):
+                    rows.add((choseong(key), number))
+        rows = sorted(rows)
+        self.keys = [key for key, _ in rows]
+        self.places = array("l", (number for _, number in rows))
+        self.tops = {}
+        if self.keys:
+            self._build(0, len(self.keys))
+
+    @classmethod
+    def from_destinations(cls, destinations, geo=None):
+        """카탈로그 여행지(이름, 별칭, 인기도)로 색인을 만듭니다.
+
+        좌표 데이터(geo)를 주면 카탈로그에 없는 도시와 장소 이름도 넣습니다. 이 항목들은 인기도가 0이라
+        같은 접두사의 카탈로그 여행지 뒤에 나오고, 장소를 고르면 그 장소가 있는 여행지로 이동합니다.
+        """
+        places = [
+            (destination_id, destination_id, [destination_id, *info.get("aliases", ())], info.get("popularity", 0))
+            for destination_id, info in destinations.items()
+        ]
+        if geo is not None:
+            places.extend((city, city, [city], 0) for city in geo.cities if city not in destinations)
+            places.extend(
+                (f"{venue['destination']}/{venue['name']}", f"{venue['name']} ({venue['destination']})",
+                 [venue["name"]], 0, venue["destination"])
+                for venue in geo.venues
+            )
+        index = cls(places)
+        index.source = destinations
+        index.geo = geo
+        return index
+
+    def __len__(self):
+        return len(self.ids)
+
+    def _rank(self, numbers, limit):
+        # 같은 장소가 이름/별칭/초성으로 여러 번 나올 수 있으므로 한 번씩만 셉니다
+        popularity = self.popularity
+        return heapq.nsmallest(limit, set(numbers), key=lambda number: (-popularity[number], number))
+
+    def _build(self, lo, hi):
+        """keys[lo:hi] 노드의 인기순 상위 장소를 계산하고, 큰 노드는 결과를 저장해 둡니다."""
+        if hi - lo <= LEAF_SIZE:
+            return self._rank(self.places[lo:hi], MAX_LIMIT)
+        keys = self.keys
+        first, last = keys[lo], keys[hi - 1]
+        # 정렬되어 있으므로 처음과 마지막 검색어의 공통 접두사가 노드 전체의 접두사입니다
+        depth = 0
+        while depth < len(first) and depth < len(last) and first[depth] == last[depth]:
+            depth += 1
+        candidates = []
+        position = lo
+        while position < hi and len(keys[position]) == depth:
+            candidates.append(self.places[position])
+            position += 1
+        while position < hi:
+            end = bisect_left(keys, keys[position][:depth + 1] + _END, position, hi)
+            candidates.extend(self._build(position, end))
+            position = end
+        top = self._rank(candidates, MAX_LIMIT)
+        self.tops[(lo, hi)] = array("l", top)
+        return top
+
+    def complete(self, prefix, limit=DEFAULT_LIMIT):
+        """prefix로 시작하는 장소를 인기순으로 최대 limit개(MAX_LIMIT 이하) 반환합니다.
+
+        "ㄷㅋ"처럼 초성이 섞여 있으면 초성으로 검색합니다.
+        """
+        key = normalize(prefix)
+        if not key:
+            return []
+        if any(char in _CHOSEONG_SET for char in key):
+            key = choseong(key)
+        limit = min(limit, MAX_LIMIT)
+        lo = bisect_left(self.keys, key)
+        hi = bisect_left(self.keys, key + _END, lo)
+        if hi - lo <= LEAF_SIZE:
+            top = self._rank(self.places[lo:hi], limit)
+        else:
+            top = self.tops[(lo, hi)][:limit]
+        return [
+            {
+                "id": self.ids[number],
+                "label": self.labels[number],
+                "destination": self.destinations[number],
+                "popularity": self.popularity[number]
+            }
+            for number in top
+        ]
+
+
+if __name__ == "__main__":
+    # 간단한 성능/메모리 테스트 코드
+    import random
+    import time
+    import tracemalloc
+
+    from catalog import get_catalog_loader
+
+    index = Autocomplete.from_destinations(get_catalog_loader().get().destinations)
+    for query in ["도", "ㄷㅋ", "ㅂ", "바르", "to", "new", "la", "사"]:
+        print(f"  {query!r:>6} → {[item['id'] for item in index.complete(query, 5)]}")
+
+    # 좌표 데이터의 장소 이름도 자동 완성되고, 고르면 장소가 있는 여행지로 이동합니다
+    from geo import get_geo_dataset
+
+    catalog_destinations = get_catalog_loader().get().destinations
+    index = Autocomplete.from_destinations(catalog_destinations, get_geo_dataset())
+    venues = index.complete("서울 그랜드", 5)
+    assert [(item["label"], item["destination"]) for item in venues] == [("서울 그랜드 호텔 (서울)", "서울")], venues
+    assert index.complete("서", 1)[0]["id"] in catalog_destinations
+    print(f"  '서울 그랜드' → {[item['label'] for item in venues]}")
+
+    random.seed(0)
+    count = 100_000
+    syllables = [chr(0xAC00 + random.randrange(11172)) for _ in range(400)]
+    places = []
+    for number in range(count):
+        name = "".join(random.choice(syllables) for _ in range(random.randint(2, 5)))
+        latin = "".join(random.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(random.randint(4, 10)))
+        places.append((f"P{number}", name, [name, latin], random.paretovariate(1.2)))
+
+    started = time.perf_counter()
+    index = Autocomplete(places)
+    elapsed = time.perf_counter() - started
+    # 메모리는 따로 한 번 더 만들어 측정합니다 (tracemalloc을 켜면 생성이 느려짐)
+    tracemalloc.start()
+    measured = Autocomplete(places)
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del measured
+    print(f"색인 생성: 장소 {len(index):,}개, 검색어 {len(index.keys):,}개, 저장 노드 {len(index.tops):,}개, "
+          f"{elapsed:.2f}s, 약 {memory / 1024 / 1024:.1f}MB")
+
+    queries = []
+    for name, latin in ((place[2][0], place[2][1]) for place in random.sample(places, 500)):
+        queries += [name[:1], name[:2], choseong(name[:2]), latin[:1], latin[:3]]
+    started = time.perf_counter()
+    for query in queries:
+        index.complete(query, 10)
+    elapsed = (time.perf_counter() - started) / len(queries) * 1000
+    print(f"상위 10개 자동 완성: 평균 {elapsed:.4f}ms ({len(queries):,}회)")
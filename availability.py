@@ -0,0 +1,213 @@
+import json
+import os
+import threading
+from array import array
+from datetime import date, datetime, timedelta
+
+from catalog import CatalogError
+from pricing import PriceColumn, parse_price
+
+DEFAULT_PROPERTIES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "properties.json")
+PROPERTY_FIELDS = ("id", "name", "destination", "service_type", "price", "rating", "capacity")
+SORT_ORDERS = ("price", "rating")
+
+
+def to_date(value):
+    """문자열/날짜/일시 값을 date로 변환합니다."""
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value)[:10])
+
+
+def nights(check_in, check_out=None):
+    """체크인부터 체크아웃 전날까지의 날짜 목록입니다. 체크아웃이 없으면 1박입니다.
+
+    체크아웃이 체크인과 같거나 앞이면 ValueError를 발생시킵니다.
+    """
+    start = to_date(check_in)
+    end = to_date(check_out) if check_out else start + timedelta(days=1)
+    if end <= start:
+        raise ValueError(f"체크아웃 날짜({end})는 체크인 날짜({start})보다 뒤여야 합니다.")
+    return [start + timedelta(days=offset) for offset in range((end - start).days)]
+
+
+class PropertyGroup:
+    """여행지/서비스 종류 하나에 속한 예약 상품의 가용성 색인입니다.
+
+    상품 번호는 가격 오름차순으로 매기고, 날짜마다 "그날 예약 가능한 상품" 비트맵(정수)을
+    만들어 여러 날짜는 비트 AND 한 번으로 교집합을 구합니다. 비트맵은 요일별 휴무와
+    개별 휴무일로 계산하므로 기간 제한 없이 어느 날짜든 바로 구할 수 있습니다.
+    """
+
+    def __init__(self, properties):
+        records = sorted(properties, key=lambda item: (item["price"].min_minor, -item["rating"], item["name"]))
+        self.records = records
+        self.prices = PriceColumn(record["price"] for record in records)
+        self.ratings = array("d", (record["rating"] for record in records))
+        self.capacities = array("l", (record["capacity"] for record in records))
+        self.by_name = {record["name"]: position for position, record in enumerate(records)}
+        self.by_rating = array("l", sorted(
+            range(len(records)), key=lambda position: (-self.ratings[position], position)
+        ))
+        self.all_mask = (1 << len(records)) - 1
+
+        closed = [0] * 7
+        self.blocked = {}
+        for position, record in enumerate(records):
+            bit = 1 << position
+            for weekday in record.get("closed_weekdays", ()):
+                closed[weekday] |= bit
+            for blocked_date in record.get("blocked_dates", ()):
+                day = to_date(blocked_date)
+                self.blocked[day] = self.blocked.get(day, 0) | bit
+        self.weekday_masks = [self.all_mask & ~mask for mask in closed]
+
+    def __len__(self):
+        return len(self.records)
+
+    def day_mask(self, day):
+        """day에 예약 가능한 상품 비트맵입니다."""
+        return self.weekday_masks[day.weekday()] & ~self.blocked.get(day, 0)
+
+    def range_mask(self, days):
+        """모든 날짜에 예약 가능한 상품 비트맵입니다."""
+        mask = self.all_mask
+        for day in days:
+            mask &= self.day_mask(day)
+            if not mask:
+                break
+        return mask
+
+    def mask_of(self, names):
+        mask = 0
+        for name in names:
+            position = self.by_name.get(name)
+            if position is not None:
+                mask |= 1 << position
+        return mask
+
+    def _positions_by_price(self, mask):
+        # 번호가 가격 순이므로 낮은 비트부터 꺼내면 가격 오름차순입니다
+        while mask:
+            lowest = mask & -mask
+            yield lowest.bit_length() - 1
+            mask ^= lowest
+
+    def _positions_by_rating(self, mask):
+        for position in self.by_rating:
+            if mask >> position & 1:
+                yield position
+
+    def top(self, mask, sort="price", limit=5, budget=None):
+        """mask에 포함된 상품 중 가격/평점 순으로 상위 limit개를 반환합니다."""
+        if sort not in SORT_ORDERS:
+            raise ValueError(f"지원하지 않는 정렬 방식입니다: {sort}")
+        positions = self._positions_by_price(mask) if sort == "price" else self._positions_by_rating(mask)
+        results = []
+        for position in positions:
+            if budget is not None and not self.prices.overlaps(
+                position, budget.min_minor, budget.max_minor, budget.currency
+            ):
+                continue
+            results.append(self.records[position])
+            if len(results) >= limit:
+                break
+        return results
+
+
+def _parse_property(raw):
+    missing = [field for field in PROPERTY_FIELDS if field not in raw]
+    if missing:
+        raise CatalogError(f"properties.{raw.get('id', '?')}: {', '.join(missing)} 항목이 없습니다.")
+    price = parse_price(raw["price"])
+    if price is None:
+        raise CatalogError(f"properties.{raw['id']}: 가격을 해석할 수 없습니다: {raw['price']}")
+    record = dict(raw)
+    record["price"] = price
+    record["closed_weekdays"] = tuple(raw.get("closed_weekdays", ()))
+    record["blocked_dates"] = tuple(raw.get("blocked_dates", ()))
+    return record
+
+
+class AvailabilityIndex:
+    """여행지와 서비스 종류별 PropertyGroup 모음입니다."""
+
+    def __init__(self, properties):
+        grouped = {}
+        for record in properties:
+            grouped.setdefault((record["destination"], record["service_type"]), []).append(record)
+        self.groups = {key: PropertyGroup(records) for key, records in grouped.items()}
+
+    def __len__(self):
+        return sum(len(group) for group in self.groups.values())
+
+    def group(self, destination, service_type):
+        return self.groups.get((destination, service_type))
+
+
+def load_properties(path):
+    """예약 상품 파일을 읽고 가격을 해석해 둡니다."""
+    with open(path, encoding="utf-8") as f:
+        raw = json.load(f)
+    if not isinstance(raw, dict) or not isinstance(raw.get("properties"), list):
+        raise CatalogError("properties 항목(목록)이 필요합니다.")
+    return [_parse_property(item) for item in raw["properties"]]
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_availability_index():
+    """프로세스 전역 가용성 색인을 반환합니다."""
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                path = os.getenv("PROPERTIES_PATH", DEFAULT_PROPERTIES_PATH)
+                _index = AvailabilityIndex(load_properties(path))
+    return _index
+
+
+if __name__ == "__main__":
+    # 간단한 성능 테스트 코드
+    import random
+    import time
+
+    random.seed(0)
+    count = 5000
+    start = date(2025, 1, 1)
+    properties = [
+        {
+            "id": f"B{i}",
+            "name": f"숙소 {i}",
+            "destination": "서울",
+            "service_type": "숙소",
+            "price": parse_price(f"{random.randrange(30, 400) * 1000:,}원"),
+            "rating": round(random.uniform(3.0, 5.0), 1),
+            "capacity": 10,
+            "closed_weekdays": tuple(random.sample(range(7), random.choice([0, 0, 1]))),
+            "blocked_dates": tuple(
+                (start + timedelta(days=random.randrange(365))).isoformat() for _ in range(30)
+            )
+        }
+        for i in range(count)
+    ]
+
+    started = time.perf_counter()
+    index = AvailabilityIndex(properties)
+    print(f"색인 생성: 상품 {len(index):,}개, {(time.perf_counter() - started) * 1000:.1f}ms")
+
+    group = index.group("서울", "숙소")
+    budget = parse_price("5-10만원")
+    queries = 1000
+    started = time.perf_counter()
+    for i in range(queries):
+        days = nights(start + timedelta(days=i % 300), start + timedelta(days=i % 300 + 7))
+        mask = group.range_mask(days)
+        group.top(mask, "price", 10, budget)
+        group.top(mask, "rating", 10)
+    elapsed = (time.perf_counter() - started) / queries * 1000
+    print(f"7박 조회 + 가격/평점 상위 10개: 평균 {elapsed:.3f}ms, 7박 모두 가능한 상품 {bin(mask).count('1'):,}개")
@@ -0,0 +1,239 @@
+import os
+import time
+from datetime import datetime, timedelta
+
+from availability import PropertyGroup, get_availability_index, nights
+from booking_ids import new_booking_id
+from pricing import parse_price
+
+# 상품 목록이 없는 여행지에 사용하는 예시 예약 옵션 (가격은 한 번만 해석해 둡니다)
+SAMPLE_BOOKING_OPTIONS = [
+    ("호텔 A", parse_price("100,000원"), 4.5),
+    ("호텔 B", parse_price("150,000원"), 4.8)
+]
+DEFAULT_CAPACITY = 10
+DEFAULT_OPTION_LIMIT = 5
+# 상품 목록에 객실 정원이 없으므로 숙박 인원은 객실 하나에 2명으로 계산합니다
+GUESTS_PER_ROOM = 2
+
+
+def rooms_for(guests):
+    """숙박 인원에 필요한 객실 수입니다."""
+    return max(1, -(-int(guests) // GUESTS_PER_ROOM))
+
+
+class SoldOutError(Exception):
+    """선택한 옵션에 남은 재고가 없을 때 발생합니다."""
+
+
+class BookingService:
+    """예약 가능 여부 조회와 예약 처리를 담당합니다.
+
+    예약 가능한 상품은 가용성 색인(날짜별 비트맵)에서 찾고, 이미 다 팔린 상품은
+    저장소의 재고로 걸러냅니다. 재고 차감과 예약 저장은 저장소에서 한 번에 처리됩니다.
+    SQLite는 쓰기 트랜잭션으로, 메모리 저장소는 여행지별 잠금으로 보호하므로
+    서로 다른 여행지 예약은 기다리지 않습니다. 같은 idempotency_key로 다시 요청하면
+    새 예약 없이 처음 예약을 그대로 돌려줍니다.
+    """
+
+    def __init__(self, storage, index=None, capacity=None):
+        self.storage = storage
+        self.index = index if index is not None else get_availability_index()
+        if capacity is None:
+            capacity = int(os.getenv("BOOKING_CAPACITY", str(DEFAULT_CAPACITY)))
+        self.capacity = capacity
+        self.default_group = PropertyGroup([
+            {
+                "id": f"SAMPLE-{position + 1}",
+                "name": name,
+                "price": price,
+                "rating": rating,
+                "capacity": capacity
+            }
+            for position, (name, price, rating) in enumerate(SAMPLE_BOOKING_OPTIONS)
+        ])
+
+    def _group(self, destination, service_type):
+        return self.index.group(destination, service_type) or self.default_group
+
+    def _search(self, group, destination, days, budget, sort, limit, names=None):
+        mask = group.range_mask(days)
+        if names is not None:
+            mask &= group.mask_of(names)
+        mask &= ~group.mask_of(self.storage.exhausted_options(destination, days))
+        return group.top(mask, sort, limit, parse_price(budget))
+
+    def availability(self, destination, date, service_type, budget=None, check_out=None,
+                     sort="price", limit=DEFAULT_OPTION_LIMIT, names=None, units=1):
+        """체크인부터 체크아웃 전날까지 매일 예약 가능한 상품을 가격/평점 순으로 limit개 반환합니다.
+
+        names를 주면 그 이름의 상품 중에서만 찾고, units를 주면 매일 units개 이상 남은 상품만 반환합니다.
+        """
+        days = nights(date, check_out)
+        group = self._group(destination, service_type)
+        # 남은 수량으로 더 걸러야 하면 후보를 모두 가져온 뒤 limit개로 자릅니다
+        records = self._search(group, destination, days, budget, sort, limit if units <= 1 else len(group), names)
+        capacities = {record["name"]: record["capacity"] for record in records}
+        remaining = dict(capacities)
+        for day in days:
+            for name, count in self.storage.remaining_inventory(destination, day, capacities).items():
+                remaining[name] = min(remaining[name], count)
+        records = [record for record in records if remaining[record["name"]] >= units][:limit]
+        options = [
+            {
+                "id": record["id"],
+                "name": record["name"],
+                "price": record["price"].label(),
+                "rating": record["rating"],
+                "remaining": remaining[record["name"]]
+            }
+            for record in records
+        ]
+        return {
+            "available": bool(options),
+            "options": options
+        }
+
+    def book(self, destination, date, service_type, details, option=None, idempotency_key=None, check_out=None,
+             units=1):
+        """체크인부터 체크아웃 전날까지 매일 재고를 units개(객실 수)씩 차감하고 예약을 저장합니다.
+
+        option을 지정하지 않으면 기간 내내 예약 가능한 가장 저렴한 상품부터 차례로 시도합니다.
+        check_out이 없으면 1박입니다. 반환값은 (예약, 새로 만들었는지 여부)입니다.
+        """
+        if idempotency_key:
+            existing = self.storage.find_booking(idempotency_key)
+            if existing is not None:
+                return existing, False
+        group = self._group(destination, service_type)
+        days = nights(date, check_out)
+        if option:
+            position = group.by_name.get(option)
+            if position is None:
+                raise ValueError(f"알 수 없는 예약 옵션입니다: {option}")
+            # 휴무일이나 막힌 날짜가 하루라도 있으면 예약할 수 없습니다
+            if not group.range_mask(days) >> position & 1:
+                raise SoldOutError(f"{option}은(는) {days[0]}부터 {len(days)}박 동안 예약할 수 없는 날짜가 있습니다.")
+            candidates = [group.records[position]]
+        else:
+            candidates = self._search(group, destination, days, None, "price", len(group))
+        for record in candidates:
+            booking = {
+                "id": new_booking_id(),
+                "destination": destination,
+                "date": date,
+                "service_type": service_type,
+                "details": details,
+                "status": "예약 완료",
+                "created_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                "option": record["name"],
+                "check_out": (days[-1] + timedelta(days=1)).isoformat(),
+                "units": units
+            }
+            saved, created = self.storage.reserve_booking(booking, record["capacity"], idempotency_key, days)
+            if saved is not None:
+                return saved, created
+        raise SoldOutError(f"{destination} {date}에 예약 가능한 옵션이 없습니다.")
+
+
+if __name__ == "__main__":
+    # 간단한 예약 정확도/동시 예약 경합 테스트 코드
+    import tempfile
+    from concurrent.futures import ThreadPoolExecutor
+    from availability import AvailabilityIndex
+    from storage import MemoryStorage, SQLiteStorage
+
+    threads = 16
+    attempts = 2000
+    capacity = 300
+
+    def run(storage, destinations):
+        service = BookingService(storage, index=AvailabilityIndex([]), capacity=capacity)
+
+        def attempt(i):
+            destination = destinations[(i // 2) % len(destinations)]
+            try:
+                # 두 번에 한 번은 같은 키로 다시 요청해 중복 클릭을 흉내 냅니다
+                _, created = service.book(destination, "2025-01-01", "숙소", f"요청 {i // 2}",
+                                          idempotency_key=f"{destination}:{i // 2}")
+                return "created" if created else "duplicate"
+            except SoldOutError:
+                return "sold_out"
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            results = list(executor.map(attempt, range(attempts)))
+        elapsed = time.perf_counter() - started
+
+        history = storage.get_bookings()
+        booked = sum(len(items) for items in history.values())
+        ids = [booking["id"] for items in history.values() for booking in items]
+        limit = len(destinations) * len(SAMPLE_BOOKING_OPTIONS) * capacity
+        assert booked == results.count("created") <= limit, "재고보다 많이 예약되었습니다"
+        assert len(set(ids)) == len(ids), "예약 번호가 중복되었습니다"
+        print(
+            f"  여행지 {len(destinations)}곳: 초당 {attempts / elapsed:,.0f}건 처리, "
+            f"예약 {results.count('created')}, 중복 요청 {results.count('duplicate')}, "
+            f"매진 {results.count('sold_out')}"
+        )
+
+    def check_stays(storage):
+        # 휴무일이 낀 기간은 옵션을 지정해도 예약되지 않고, 여러 박은 매일 재고가 줄어야 합니다
+        index = AvailabilityIndex([{
+            "id": "P1", "name": "수요일 휴무 호텔", "destination": "서울", "service_type": "숙소",
+            "price": parse_price("100,000원"), "rating": 4.0, "capacity": 2, "closed_weekdays": (2,)
+        }])
+        service = BookingService(storage, index=index)
+        try:
+            service.book("서울", "2026-10-20", "숙소", "화-수", option="수요일 휴무 호텔", check_out="2026-10-22")
+            raise AssertionError("휴무일에 예약되었습니다")
+        except SoldOutError:
+            pass
+        booking, _ = service.book("서울", "2026-10-22", "숙소", "목-토", option="수요일 휴무 호텔",
+                                  check_out="2026-10-25")
+        assert booking["check_out"] == "2026-10-25"
+        service.book("서울", "2026-10-24", "숙소", "토", option="수요일 휴무 호텔")
+        capacities = {"수요일 휴무 호텔": 2}
+        remaining = [storage.remaining_inventory("서울", day, capacities)["수요일 휴무 호텔"]
+                     for day in ("2026-10-22", "2026-10-23", "2026-10-24", "2026-10-25")]
+        assert remaining == [1, 1, 0, 2], remaining
+        # 토요일이 매진이므로 금-일 예약은 금요일 재고도 건드리지 않아야 합니다
+        try:
+            service.book("서울", "2026-10-23", "숙소", "금-토", check_out="2026-10-25")
+            raise AssertionError("매진된 날짜가 낀 기간이 예약되었습니다")
+        except SoldOutError:
+            pass
+        assert storage.remaining_inventory("서울", "2026-10-23", capacities)["수요일 휴무 호텔"] == 1
+        # 여러 객실 예약은 검색과 같은 수만큼 차감하고, 남은 객실이 모자라면 예약되지 않습니다
+        assert not service.availability("서울", "2026-10-26", "숙소", check_out="2026-10-27", units=3)["options"]
+        try:
+            service.book("서울", "2026-10-26", "숙소", "3실", check_out="2026-10-27", units=3)
+            raise AssertionError("남은 객실보다 많이 예약되었습니다")
+        except SoldOutError:
+            pass
+        booking, _ = service.book("서울", "2026-10-26", "숙소", "2실", check_out="2026-10-27", units=rooms_for(4))
+        assert booking["units"] == 2
+        assert storage.remaining_inventory("서울", "2026-10-26", capacities)["수요일 휴무 호텔"] == 0
+        assert storage.get_bookings("서울")[-1]["units"] == 2
+        try:
+            nights("2026-10-26", "2026-10-26")
+            raise AssertionError("체크아웃이 체크인과 같은 날짜가 허용되었습니다")
+        except ValueError:
+            pass
+
+    with tempfile.TemporaryDirectory() as directory:
+        for storage in (MemoryStorage(), SQLiteStorage(os.path.join(directory, "stays.db"))):
+            check_stays(storage)
+            storage.close()
+        print("휴무일/여러 박 예약 테스트: 통과")
+
+        backends = [
+            ("memory", MemoryStorage),
+            ("sqlite", lambda: SQLiteStorage(os.path.join(directory, f"bench-{time.time_ns()}.db")))
+        ]
+        for label, make_storage in backends:
+            print(f"{label} 저장소 ({threads} 스레드, {attempts}건 요청)")
+            for destinations in (["서울"], ["서울", "도쿄", "파리", "뉴욕", "런던", "로마", "방콕", "두바이"]):
+                storage = make_storage()
+                run(storage, destinations)
+                storage.close()
@@ -0,0 +1,208 @@
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass
+
+DEFAULT_CATALOG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "catalog.json")
+
+# 카탈로그에 반드시 있어야 하는 항목
+REQUIRED_SECTIONS = ("destinations", "currencies", "exchange_rates", "photos", "restaurants", "attractions")
+RESTAURANT_FIELDS = ("name", "cuisine", "description", "price_range", "rating", "address", "opening_hours", "specialties")
+ATTRACTION_FIELDS = ("name", "category", "rating", "review_count", "address", "opening_hours")
+ATTRACTION_CATEGORIES = ("명소", "박물관", "공원", "쇼핑", "문화재", "자연")
+CURRENCY_FIELDS = ("통화명", "기호", "소수점", "현금/카드")
+
+
+class CatalogError(ValueError):
+    """카탈로그 파일이 올바르지 않을 때 발생합니다."""
+
+
+class FrozenDict(dict):
+    """수정할 수 없는 dict입니다. 일반 dict처럼 읽고 JSON/pickle로 직렬화할 수 있습니다."""
+
+    __slots__ = ()
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("카탈로그 데이터는 수정할 수 없습니다.")
+
+    __setitem__ = __delitem__ = __ior__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+
+    def __reduce__(self):
+        return (FrozenDict, (dict(self),))
+
+
+class FrozenList(list):
+    """수정할 수 없는 list입니다."""
+
+    __slots__ = ()
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("카탈로그 데이터는 수정할 수 없습니다.")
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _readonly
+    append = extend = insert = pop = remove = clear = sort = reverse = _readonly
+
+    def __reduce__(self):
+        return (FrozenList, (list(self),))
+
+
+def freeze(value):
+    """JSON 값을 FrozenDict/FrozenList로 재귀 변환합니다."""
+    if isinstance(value, dict):
+        return FrozenDict((key, freeze(item)) for key, item in value.items())
+    if isinstance(value, list):
+        return FrozenList(freeze(item) for item in value)
+    return value
+
+
+@dataclass(frozen=True)
+class Catalog:
+    """정적 참조 데이터(여행지, 통화, 환율, 사진, 맛집, 관광지) 한 버전입니다."""
+
+    __slots__ = ("version", "destinations", "currencies", "exchange_rates", "photos", "restaurants", "attractions")
+
+    version: int
+    destinations: FrozenDict
+    currencies: FrozenDict
+    exchange_rates: FrozenDict
+    photos: FrozenDict
+    restaurants: FrozenDict
+    attractions: FrozenDict
+
+
+def validate(raw):
+    """카탈로그 구조를 검사합니다. 문제가 있으면 CatalogError를 발생시킵니다."""
+    if not isinstance(raw, dict):
+        raise CatalogError("카탈로그 최상위 값은 객체여야 합니다.")
+    if not isinstance(raw.get("version"), int):
+        raise CatalogError("version 항목(정수)이 필요합니다.")
+    for section in REQUIRED_SECTIONS:
+        if not isinstance(raw.get(section), dict):
+            raise CatalogError(f"{section} 항목(객체)이 필요합니다.")
+
+    alias_owners = {}
+    for city, info in raw["destinations"].items():
+        if not isinstance(info, dict) or "country" not in info or "currency" not in info:
+            raise CatalogError(f"destinations.{city}: country와 currency가 필요합니다.")
+        aliases = info.get("aliases", [])
+        if not isinstance(aliases, list) or not all(isinstance(alias, str) and alias.strip() for alias in aliases):
+            raise CatalogError(f"destinations.{city}: aliases는 문자열 목록이어야 합니다.")
+        if not isinstance(info.get("popularity", 0), (int, float)):
+            raise CatalogError(f"destinations.{city}: popularity는 숫자여야 합니다.")
+        for name in [city] + aliases:
+            # 같은 별칭이 두 여행지를 가리키면 어느 쪽으로 찾을지 정할 수 없습니다
+            owner = alias_owners.setdefault(name.casefold(), city)
+            if owner != city:
+                raise CatalogError(f"destinations.{city}: '{name}'은(는) 이미 {owner}의 이름/별칭입니다.")
+    for country, info in raw["currencies"].items():
+        missing = [field for field in CURRENCY_FIELDS if field not in info]
+        if missing:
+            raise CatalogError(f"currencies.{country}: {', '.join(missing)} 항목이 없습니다.")
+    for currency, rates in raw["exchange_rates"].items():
+        for target, rate in rates.items():
+            if not isinstance(rate, (int, float)) or rate <= 0:
+                raise CatalogError(f"exchange_rates.{currency}.{target}: 양수여야 합니다.")
+    for city, photos in raw["photos"].items():
+        for photo in photos:
+            if "url" not in photo or "description" not in photo:
+                raise CatalogError(f"photos.{city}: url과 description이 필요합니다.")
+    for city, restaurants in raw["restaurants"].items():
+        for restaurant in restaurants:
+            missing = [field for field in RESTAURANT_FIELDS if field not in restaurant]
+            if missing:
+                raise CatalogError(f"restaurants.{city}: {', '.join(missing)} 항목이 없습니다.")
+            if not isinstance(restaurant["rating"], (int, float)):
+                raise CatalogError(f"restaurants.{city}.{restaurant['name']}: rating은 숫자여야 합니다.")
+    for city, attractions in raw["attractions"].items():
+        for attraction in attractions:
+            missing = [field for field in ATTRACTION_FIELDS if field not in attraction]
+            if missing:
+                raise CatalogError(f"attractions.{city}: {', '.join(missing)} 항목이 없습니다.")
+            name = attraction["name"]
+            if attraction["category"] not in ATTRACTION_CATEGORIES:
+                raise CatalogError(f"attractions.{city}.{name}: 알 수 없는 카테고리입니다: {attraction['category']}")
+            if not isinstance(attraction["rating"], (int, float)):
+                raise CatalogError(f"attractions.{city}.{name}: rating은 숫자여야 합니다.")
+            if not isinstance(attraction["review_count"], int) or attraction["review_count"] < 0:
+                raise CatalogError(f"attractions.{city}.{name}: review_count는 0 이상의 정수여야 합니다.")
+            if not isinstance(attraction["opening_hours"], list):
+                raise CatalogError(f"attractions.{city}.{name}: opening_hours는 문자열 목록이어야 합니다.")
+
+
+def load_catalog(path):
+    """카탈로그 파일을 읽고 검사한 뒤 불변 구조로 변환합니다."""
+    with open(path, encoding="utf-8") as f:
+        raw = json.load(f)
+    validate(raw)
+    return Catalog(
+        version=raw["version"],
+        **{section: freeze(raw[section]) for section in REQUIRED_SECTIONS}
+    )
+
+
+class CatalogLoader:
+    """카탈로그를 한 번만 읽고, 파일이 바뀌면 다시 읽습니다.
+
+    새 파일이 검사를 통과하지 못하면 이전 카탈로그를 계속 사용합니다.
+    """
+
+    def __init__(self, path=None, check_interval=2.0):
+        self.path = path or os.getenv("CATALOG_PATH", DEFAULT_CATALOG_PATH)
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._catalog = None
+        self._mtime = None
+        self._checked_at = 0.0
+
+    def get(self):
+        """현재 카탈로그를 반환합니다. 처음 호출할 때 읽어 들입니다."""
+        catalog = self._catalog
+        if catalog is not None and time.monotonic() - self._checked_at < self.check_interval:
+            return catalog
+        with self._lock:
+            self._checked_at = time.monotonic()
+            try:
+                mtime = os.stat(self.path).st_mtime_ns
+            except OSError:
+                if self._catalog is None:
+                    raise
+                return self._catalog
+            if self._catalog is None or mtime != self._mtime:
+                self._load(mtime)
+            return self._catalog
+
+    def _load(self, mtime):
+        try:
+            catalog = load_catalog(self.path)
+        except (OSError, ValueError) as e:
+            if self._catalog is None:
+                raise
+            print(f"Error reloading catalog, keeping version {self._catalog.version}: {str(e)}")
+            # 같은 파일을 반복해서 다시 읽지 않도록 변경 시각만 기록합니다
+            self._mtime = mtime
+            return
+        self._catalog = catalog
+        self._mtime = mtime
+
+    def reload(self):
+        """파일 변경 여부와 관계없이 다시 읽습니다."""
+        with self._lock:
+            self._load(os.stat(self.path).st_mtime_ns)
+            self._checked_at = time.monotonic()
+            return self._catalog
+
+
+_loader = None
+_loader_lock = threading.Lock()
+
+
+def get_catalog_loader():
+    """프로세스 전역 카탈로그 로더를 반환합니다."""
+    global _loader
+    if _loader is None:
+        with _loader_lock:
+            if _loader is None:
+                _loader = CatalogLoader()
+    return _loader
@@ -0,0 +1,195 @@
+import functools
+import inspect
+import unicodedata
+from array import array
+
+# 한글 음절을 초성/중성/종성 자모로 분해할 때 사용하는 호환용 자모
+CHOSEONG = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+JUNGSEONG = "ㅏㅐㅑㅒㅓㅔㅕㅖㅗㅘㅙㅚㅛㅜㅝㅞㅟㅠㅡㅢㅣ"
+JONGSEONG = " ㄱㄲㄳㄴㄵㄶㄷㄹㄺㄻㄼㄽㄾㄿㅀㅁㅂㅄㅅㅆㅇㅈㅊㅋㅌㅍㅎ"
+HANGUL_START = 0xAC00
+HANGUL_END = 0xD7A3
+# 정규화 후 글자 단위로 바꿀 표: 악센트가 붙은 라틴 문자(ü, é, ệ 등)는 기본 글자로,
+# NFKC가 조합용 자모로 바꾼 따로 입력한 자모(ㄱ, ㅏ)는 다시 호환용 자모로 되돌립니다
+_CHAR_TABLE = {
+    code: unicodedata.normalize("NFD", chr(code))[0]
+    for code in [*range(0x00C0, 0x0250), *range(0x1E00, 0x1F00)]
+    if len(unicodedata.normalize("NFD", chr(code))) > 1
+}
+_CHAR_TABLE.update(
+    (ord(unicodedata.normalize("NFKC", jamo)), jamo)
+    for jamo in CHOSEONG + JUNGSEONG + JONGSEONG.strip()
+)
+
+# 이 점수(Dice 계수) 미만인 후보는 같은 여행지로 보지 않습니다
+MIN_SCORE = 0.3
+DEFAULT_CANDIDATES = 5
+
+
+def normalize(text):
+    """대소문자, 전각/반각, 공백과 문장 부호 차이를 없앤 비교용 문자열입니다."""
+    text = unicodedata.normalize("NFKC", str(text)).casefold().translate(_CHAR_TABLE)
+    # 글자와 숫자만 남깁니다
+    return "".join(filter(str.isalnum, text))
+
+
+def is_hangul(char):
+    return HANGUL_START <= ord(char) <= HANGUL_END
+
+
+def choseong(text):
+    """한글 음절을 초성으로 바꿉니다. 한글이 아닌 글자는 그대로 둡니다."""
+    return "".join(CHOSEONG[(ord(char) - HANGUL_START) // 588] if is_hangul(char) else char for char in text)
+
+
+def decompose(text):
+    """한글 음절을 자모로 풀어 씁니다. 한 글자 오타도 자모 몇 개의 차이로 비교할 수 있습니다."""
+    chars = []
+    for char in text:
+        if is_hangul(char):
+            offset = ord(char) - HANGUL_START
+            chars.append(CHOSEONG[offset // 588])
+            chars.append(JUNGSEONG[offset % 588 // 28])
+            if offset % 28:
+                chars.append(JONGSEONG[offset % 28])
+        else:
+            chars.append(char)
+    return "".join(chars)
+
+
+def trigrams(form):
+    """앞뒤 경계 표시를 붙인 3글자 조각 집합입니다."""
+    padded = f"^{form}$"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class DestinationResolver:
+    """여행지 이름과 별칭을 표준 여행지 ID(카탈로그 키)로 바꿔 주는 색인입니다.
+
+    정규화한 이름/별칭은 사전으로 바로 찾고, 그래도 없으면 자모로 분해한 이름의
+    3글자 조각 역색인에서 겹치는 조각 수로 비슷한 이름을 점수 순으로 찾습니다.
+    비슷한 이름은 사용자에게 제안할 후보일 뿐이며 resolve는 정확히 일치할 때만 바꿉니다.
+    """
+
+    def __init__(self, destinations):
+        self.source = destinations
+        self.exact = {}
+        self.forms = []
+        self.form_ids = []
+        self.form_sizes = array("l")
+        self.postings = {}
+        for destination_id, info in destinations.items():
+            for name in [destination_id, *info.get("aliases", ())]:
+                key = normalize(name)
+                if not key or key in self.exact:
+                    continue
+                self.exact[key] = destination_id
+                form = decompose(key)
+                grams = trigrams(form)
+                form_number = len(self.forms)
+                self.forms.append(form)
+                self.form_ids.append(destination_id)
+                self.form_sizes.append(len(grams))
+                for gram in grams:
+                    self.postings.setdefault(gram, array("l")).append(form_number)
+
+    def __len__(self):
+        return len(self.forms)
+
+    def __contains__(self, destination_id):
+        return destination_id in self.source
+
+    def candidates(self, text, limit=DEFAULT_CANDIDATES):
+        """비슷한 여행지를 [(여행지 ID, 점수)] 형태로 점수 내림차순 limit개 반환합니다."""
+        key = normalize(text)
+        if not key:
+            return []
+        exact = self.exact.get(key)
+        if exact is not None:
+            return [(exact, 1.0)]
+        grams = trigrams(decompose(key))
+        overlaps = {}
+        for gram in grams:
+            for form_number in self.postings.get(gram, ()):
+                overlaps[form_number] = overlaps.get(form_number, 0) + 1
+        best = {}
+        for form_number, overlap in overlaps.items():
+            score = 2 * overlap / (len(grams) + self.form_sizes[form_number])
+            destination_id = self.form_ids[form_number]
+            if score >= MIN_SCORE and score > best.get(destination_id, 0):
+                best[destination_id] = score
+        ranked = sorted(best.items(), key=lambda item: (-item[1], item[0]))
+        return [(destination_id, round(score, 3)) for destination_id, score in ranked[:limit]]
+
+    def resolve(self, text):
+        """이름이나 별칭이 정확히 일치하는 여행지 ID를 반환합니다. 없으면 None입니다.
+
+        "광주"가 "광저우"로 바뀌는 것처럼 비슷하기만 한 다른 도시로 예약/리뷰가 저장되지 않도록
+        철자가 비슷한 여행지로는 바꾸지 않습니다. 그런 후보는 candidates로 확인합니다.
+        """
+        return self.exact.get(normalize(text))
+
+
+def resolves_destination(*names):
+    """지정한 인자(여행지 이름)를 표준 여행지 ID로 바꿔 호출하는 TravelAssistant 메서드 데코레이터입니다.
+
+    이름이나 별칭이 정확히 일치할 때만 바꾸고 그 밖의 입력은 그대로 넘깁니다.
+    인자가 목록이면 항목마다 바꾸고, None은 그대로 둡니다.
+    """
+    def decorator(func):
+        signature = inspect.signature(func)
+
+        def resolve_arguments(self, args, kwargs):
+            bound = signature.bind(self, *args, **kwargs)
+            for name in names:
+                value = bound.arguments.get(name)
+                if isinstance(value, str):
+                    bound.arguments[name] = self.resolve_destination(value)
+                elif isinstance(value, (list, tuple)):
+                    bound.arguments[name] = [self.resolve_destination(item) for item in value]
+            return bound.args, bound.kwargs
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(self, *args, **kwargs):
+                args, kwargs = resolve_arguments(self, args, kwargs)
+                return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            args, kwargs = resolve_arguments(self, args, kwargs)
+            return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+if __name__ == "__main__":
+    # 간단한 정확도/성능 테스트 코드
+    import time
+
+    from catalog import get_catalog_loader
+
+    catalog = get_catalog_loader().get()
+    started = time.perf_counter()
+    resolver = DestinationResolver(catalog.destinations)
+    print(f"색인 생성: 이름/별칭 {len(resolver)}개, {(time.perf_counter() - started) * 1000:.2f}ms")
+
+    queries = ["Tokyo", "도쿄도", "tokoy", "LA", "로스앤젤레스", "로스엔젤러스", "new york", "뉴육",
+               "파리 여행", "바르셀로나ㅏ", "Zurich", "HONG KONG", "싱가폴", "아무데나"]
+    for query in queries:
+        print(f"  {query!r:>16} → {resolver.resolve(query)}  {resolver.candidates(query, 3)}")
+
+    # 비슷하기만 한 다른 도시로 바꾸지 않아야 합니다
+    for query in ["광주", "니스", "Nice", "홍대", "tokoy"]:
+        assert resolver.resolve(query) is None, query
+    assert resolver.resolve("도쿄도") == resolver.resolve(" TOKYO ") == "도쿄"
+    assert resolver.candidates("tokoy", 1)[0][0] == "도쿄"
+
+    rounds = 2000
+    started = time.perf_counter()
+    for _ in range(rounds):
+        for query in queries:
+            resolver.candidates(query)
+    elapsed = (time.perf_counter() - started) / (rounds * len(queries)) * 1000
+    print(f"조회 평균: {elapsed:.4f}ms")
@@ -0,0 +1,167 @@
+import threading
+
+import numpy as np
+
+from pricing import CURRENCY_DECIMALS
+
+# 직접 환율이 없는 통화쌍은 이 통화들을 거쳐 계산합니다
+PIVOT_CURRENCIES = ("USD", "EUR")
+
+
+class FxMatrix:
+    """모든 통화쌍의 환율을 담은 읽기 전용 행렬입니다.
+
+    matrix[i, j]는 통화 i 1단위가 통화 j로 얼마인지입니다. 직접 환율이 없으면 역수를,
+    그래도 없으면 USD/EUR를 거친 교차 환율을 채웁니다. 만든 뒤에는 바꾸지 않으므로
+    여러 스레드가 잠금 없이 함께 읽을 수 있습니다.
+    """
+
+    __slots__ = ("currencies", "index", "matrix", "version")
+
+    def __init__(self, currencies, matrix, version=0):
+        self.currencies = tuple(currencies)
+        self.index = {currency: position for position, currency in enumerate(self.currencies)}
+        matrix.flags.writeable = False
+        self.matrix = matrix
+        self.version = version
+
+    @classmethod
+    def from_rates(cls, rates, currencies=(), version=0):
+        """{기준 통화: {대상 통화: 환율}} 형태의 환율로 전체 행렬을 만듭니다."""
+        codes = set(currencies)
+        for base, targets in rates.items():
+            codes.add(base)
+            codes.update(targets)
+        codes = sorted(codes)
+        index = {currency: position for position, currency in enumerate(codes)}
+
+        matrix = np.full((len(codes), len(codes)), np.nan)
+        np.fill_diagonal(matrix, 1.0)
+        for base, targets in rates.items():
+            for target, rate in targets.items():
+                matrix[index[base], index[target]] = rate
+        # 반대 방향 환율이 없으면 역수로 채웁니다
+        missing = np.isnan(matrix)
+        matrix[missing] = 1.0 / matrix.T[missing]
+
+        for pivot in PIVOT_CURRENCIES:
+            position = index.get(pivot)
+            if position is None:
+                continue
+            # a→b = a→pivot × pivot→b 를 모든 쌍에 대해 한 번에 계산합니다
+            via = np.outer(matrix[:, position], matrix[position, :])
+            missing = np.isnan(matrix)
+            matrix[missing] = via[missing]
+        return cls(codes, matrix, version)
+
+    def __contains__(self, currency):
+        return currency in self.index
+
+    def rate(self, source, target):
+        """source 1단위의 target 환율입니다. 계산할 수 없으면 None입니다."""
+        try:
+            value = self.matrix[self.index[source], self.index[target]]
+        except KeyError:
+            return None
+        return None if np.isnan(value) else float(value)
+
+    def rates_from(self, source, targets):
+        """source 기준으로 여러 통화의 환율을 반환합니다. 계산할 수 없는 통화는 제외합니다."""
+        rates = {}
+        for target in targets:
+            if target == source:
+                continue
+            value = self.rate(source, target)
+            if value is not None:
+                rates[target] = value
+        return rates
+
+    def convert(self, amounts, sources, target):
+        """금액 배열을 통화별로 한 번에 target 통화로 바꿉니다.
+
+        sources는 통화 코드 하나 또는 금액마다의 통화 코드 목록입니다.
+        """
+        amounts = np.asarray(amounts, dtype=float)
+        column = self.matrix[:, self.index[target]]
+        if isinstance(sources, str):
+            return amounts * column[self.index[sources]]
+        source_ids = np.fromiter((self.index[source] for source in sources), dtype=np.intp, count=len(sources))
+        return amounts * column[source_ids]
+
+    def convert_prices(self, prices, target):
+        """PriceColumn 전체를 target 통화의 보조 단위 정수 배열 (하한, 상한)으로 바꿉니다.
+
+        상한이 없는 가격대의 상한은 -1로 유지합니다.
+        """
+        column = self.matrix[:, self.index[target]]
+        target_scale = 10 ** CURRENCY_DECIMALS.get(target, 2)
+        # 통화 번호별 배율(보조 단위 → target 보조 단위)을 먼저 구해 행마다 골라 씁니다
+        factors = np.array([
+            column[self.index[currency]] * target_scale / 10 ** CURRENCY_DECIMALS.get(currency, 2)
+            for currency in prices.currencies
+        ])
+        per_row = factors[np.frombuffer(prices.currency_ids, dtype=np.uint8)] if len(prices) else np.empty(0)
+        mins = np.frombuffer(prices.mins, dtype=np.int64)
+        maxs = np.frombuffer(prices.maxs, dtype=np.int64)
+        converted_mins = np.rint(mins * per_row).astype(np.int64)
+        converted_maxs = np.where(maxs == prices.OPEN, prices.OPEN, np.rint(maxs * per_row)).astype(np.int64)
+        return converted_mins, converted_maxs
+
+
+class FxEngine:
+    """현재 환율 행렬을 보관합니다. 새 환율은 행렬을 새로 만든 뒤 한 번에 교체합니다."""
+
+    def __init__(self, rates=None, currencies=()):
+        self._lock = threading.Lock()
+        self._current = FxMatrix.from_rates(rates or {}, currencies)
+
+    @property
+    def current(self):
+        """지금 사용 중인 행렬입니다. 한 번 받은 행렬은 교체 후에도 그대로 유효합니다."""
+        return self._current
+
+    def refresh(self, rates, currencies=()):
+        """새 환율로 행렬을 만들어 교체하고 새 행렬을 반환합니다."""
+        with self._lock:
+            # 만드는 동안에는 이전 행렬이 계속 사용되고, 참조 교체는 원자적으로 이루어집니다
+            matrix = FxMatrix.from_rates(rates, currencies, self._current.version + 1)
+            self._current = matrix
+        return matrix
+
+    def rate(self, source, target):
+        return self._current.rate(source, target)
+
+    def convert(self, amounts, sources, target):
+        return self._current.convert(amounts, sources, target)
+
+
+if __name__ == "__main__":
+    # 간단한 성능 테스트 코드
+    import time
+
+    from catalog import get_catalog_loader
+    from pricing import PriceColumn, Price
+
+    catalog = get_catalog_loader().get()
+    currencies = {info["currency"] for info in catalog.destinations.values()}
+    started = time.perf_counter()
+    engine = FxEngine(catalog.exchange_rates, currencies)
+    print(f"행렬 생성: 통화 {len(engine.current.currencies)}개, {(time.perf_counter() - started) * 1000:.2f}ms")
+    print(f"THB→KRW {engine.rate('THB', 'KRW'):.2f}, VND→JPY {engine.rate('VND', 'JPY'):.5f}")
+
+    count = 1_000_000
+    codes = list(engine.current.currencies)
+    rng = np.random.default_rng(0)
+    amounts = rng.uniform(1, 1000, count)
+    sources = [codes[i] for i in rng.integers(0, len(codes), count)]
+    started = time.perf_counter()
+    engine.convert(amounts, sources, "KRW")
+    print(f"금액 {count:,}개 원화 환산: {(time.perf_counter() - started) * 1000:.1f}ms")
+
+    prices = PriceColumn(
+        Price(int(low), int(low) * 2, codes[int(i)])
+        for low, i in zip(rng.integers(100, 100000, 200_000), rng.integers(0, len(codes), 200_000))
+    )
+    started = time.perf_counter()
+    engine.current.convert_prices(prices, "KRW")
+    print(f"가격대 {len(prices):,}개 원화 환산: {(time.perf_counter() - started) * 1000:.1f}ms")
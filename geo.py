@@ -0,0 +1,250 @@
+import heapq
+import json
+import math
+import os
+import threading
+from array import array
+
+from catalog import CatalogError
+from destination_resolver import normalize
+
+DEFAULT_GEO_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "geo.json")
+VENUE_FIELDS = ("kind", "destination", "name", "lat", "lon")
+VENUE_KINDS = ("restaurant", "accommodation", "attraction", "tour", "activity")
+EARTH_RADIUS_KM = 6371.0
+# 격자 한 칸의 크기 (위도 기준 약 2.2km)
+DEFAULT_CELL_DEG = 0.02
+DEFAULT_RADIUS_KM = 2.0
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    """두 좌표 사이의 대원 거리(km)입니다."""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(lon2 - lon1)
+    a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+class GeoIndex:
+    """위도/경도 격자 버킷으로 나눈 공간 색인입니다.
+
+    좌표를 cell_deg 크기의 칸에 나눠 담고, 반경 검색은 반경을 덮는 칸만, k-최근접 검색은
+    가까운 칸부터 한 겹씩 넓혀 가며 거리를 계산합니다.
+    """
+
+    def __init__(self, records, cell_deg=DEFAULT_CELL_DEG):
+        self.cell_deg = cell_deg
+        self.records = list(records)
+        self.lats = array("d", (record["lat"] for record in self.records))
+        self.lons = array("d", (record["lon"] for record in self.records))
+        self.cells = {}
+        for position in range(len(self.records)):
+            self.cells.setdefault(self._cell(self.lats[position], self.lons[position]), array("l")).append(position)
+
+    def __len__(self):
+        return len(self.records)
+
+    def _cell(self, lat, lon):
+        return math.floor(lat / self.cell_deg), math.floor(lon / self.cell_deg)
+
+    def _spans(self, lat, distance_km):
+        """좌표에서 distance_km 안쪽을 모두 덮는 (위도 칸 수, 경도 칸 수)입니다."""
+        lat_span = math.ceil(distance_km / (111.32 * self.cell_deg))
+        # 경도 1도의 길이는 극에 가까울수록 짧아지므로 범위 안에서 가장 높은 위도를 기준으로 계산합니다
+        highest = min(abs(lat) + lat_span * self.cell_deg, 89.0)
+        km_per_cell = 111.32 * self.cell_deg * math.cos(math.radians(highest))
+        return lat_span, math.ceil(distance_km / km_per_cell)
+
+    def _rectangle(self, center, spans, inner=None):
+        """center 주변 spans 범위의 칸 번호입니다. inner 범위 안쪽 칸은 건너뜁니다."""
+        row, column = center
+        lat_span, lon_span = spans
+        if (2 * lat_span + 1) * (2 * lon_span + 1) > len(self.cells):
+            # 범위가 항목이 있는 칸 수보다 넓으면 빈 칸까지 훑지 않고 항목이 있는 칸만 확인합니다
+            for cell in self.cells:
+                d_row, d_column = abs(cell[0] - row), abs(cell[1] - column)
+                if d_row > lat_span or d_column > lon_span:
+                    continue
+                if inner is not None and d_row <= inner[0] and d_column <= inner[1]:
+                    continue
+                yield cell
+            return
+        for d_row in range(-lat_span, lat_span + 1):
+            for d_column in range(-lon_span, lon_span + 1):
+                if inner is not None and abs(d_row) <= inner[0] and abs(d_column) <= inner[1]:
+                    continue
+                yield row + d_row, column + d_column
+
+    def _distances(self, cells, lat, lon):
+        lats, lons, buckets = self.lats, self.lons, self.cells
+        for cell in cells:
+            for position in buckets.get(cell, ()):
+                yield haversine_km(lat, lon, lats[position], lons[position]), position
+
+    def within(self, lat, lon, radius_km, limit=None):
+        """반경 radius_km 안의 항목을 [(거리 km, 항목)] 형태로 가까운 순으로 반환합니다."""
+        cells = self._rectangle(self._cell(lat, lon), self._spans(lat, radius_km))
+        found = [(distance, position) for distance, position in self._distances(cells, lat, lon)
+                 if distance <= radius_km]
+        found = heapq.nsmallest(limit, found) if limit is not None else sorted(found)
+        return [(round(distance, 3), self.records[position]) for distance, position in found]
+
+    def nearest(self, lat, lon, k=5, max_km=None):
+        """가장 가까운 k개 항목을 [(거리 km, 항목)] 형태로 가까운 순으로 반환합니다."""
+        if not self.records or k <= 0:
+            return []
+        center = self._cell(lat, lon)
+        cell_km = 111.32 * self.cell_deg
+        best = []  # 지금까지 찾은 가장 가까운 k개 (거리 부호를 바꾼 최대 힙)
+        inner = None
+        step = 0
+        while True:
+            # 한 칸씩 넓힌 사각형에서 이전 사각형 바깥 부분만 새로 계산합니다
+            reach = step * cell_km
+            spans = self._spans(lat, reach)
+            for distance, position in self._distances(self._rectangle(center, spans, inner), lat, lon):
+                if max_km is not None and distance > max_km:
+                    continue
+                if len(best) < k:
+                    heapq.heappush(best, (-distance, position))
+                elif distance < -best[0][0]:
+                    heapq.heapreplace(best, (-distance, position))
+            # 사각형 바깥은 적어도 reach만큼 떨어져 있으므로 그보다 먼 항목만 남았으면 멈춥니다
+            if len(best) == k and -best[0][0] <= reach:
+                break
+            if (max_km is not None and reach >= max_km) or reach > math.pi * EARTH_RADIUS_KM:
+                break
+            inner = spans
+            # 찾은 항목이 모자라면 가장 먼 후보 거리(없으면 한 칸)만큼 한 번에 넓힙니다
+            step = max(step + 1, math.ceil(-best[0][0] / cell_km) if len(best) == k else step * 2)
+        return [(round(-distance, 3), self.records[position]) for distance, position in sorted(best, reverse=True)]
+
+
+class GeoDataset:
+    """오프라인 좌표 데이터입니다. 도시 중심 좌표와 종류별 장소 공간 색인을 담습니다."""
+
+    def __init__(self, cities, venues, cell_deg=DEFAULT_CELL_DEG):
+        self.cities = cities
+        self.venues = list(venues)
+        grouped = {}
+        self.by_name = {}
+        for venue in venues:
+            grouped.setdefault(venue["kind"], []).append(venue)
+            self.by_name[(venue["destination"], normalize(venue["name"]))] = venue
+            if "id" in venue:
+                self.by_name[(venue["destination"], normalize(venue["id"]))] = venue
+        self.indexes = {kind: GeoIndex(records, cell_deg) for kind, records in grouped.items()}
+
+    def __len__(self):
+        return sum(len(index) for index in self.indexes.values())
+
+    def venue(self, destination, name):
+        """여행지의 장소를 이름(또는 ID)으로 찾습니다. 없으면 None입니다."""
+        return self.by_name.get((destination, normalize(name)))
+
+    def locate(self, place, destination=None):
+        """(위도, 경도), "위도,경도" 문자열, 장소 이름, 도시 이름을 좌표로 바꿉니다. 찾지 못하면 None입니다."""
+        if isinstance(place, (tuple, list)) and len(place) == 2:
+            return float(place[0]), float(place[1])
+        if isinstance(place, dict) and "lat" in place and "lon" in place:
+            return float(place["lat"]), float(place["lon"])
+        text = str(place).strip()
+        parts = text.split(",")
+        if len(parts) == 2:
+            try:
+                return float(parts[0]), float(parts[1])
+            except ValueError:
+                pass
+        if destination is not None:
+            venue = self.venue(destination, text)
+            if venue is not None:
+                return venue["lat"], venue["lon"]
+        city = self.cities.get(text)
+        if city is not None:
+            return city["lat"], city["lon"]
+        return None
+
+    def within(self, kind, lat, lon, radius_km=DEFAULT_RADIUS_KM, limit=None):
+        index = self.indexes.get(kind)
+        return index.within(lat, lon, radius_km, limit) if index is not None else []
+
+    def nearest(self, kind, lat, lon, k=5, max_km=None):
+        index = self.indexes.get(kind)
+        return index.nearest(lat, lon, k, max_km) if index is not None else []
+
+
+def _parse_venue(raw, position):
+    missing = [field for field in VENUE_FIELDS if field not in raw]
+    if missing:
+        raise CatalogError(f"venues[{position}]: {', '.join(missing)} 항목이 없습니다.")
+    if raw["kind"] not in VENUE_KINDS:
+        raise CatalogError(f"venues[{position}]: 알 수 없는 장소 종류입니다: {raw['kind']}")
+    lat, lon = raw["lat"], raw["lon"]
+    if not isinstance(lat, (int, float)) or not isinstance(lon, (int, float)) or not (-90 <= lat <= 90 and -180 <= lon <= 180):
+        raise CatalogError(f"venues[{position}] {raw['name']}: 좌표가 올바르지 않습니다.")
+    return raw
+
+
+def load_geo(path, cell_deg=DEFAULT_CELL_DEG):
+    """좌표 파일을 읽고 검사한 뒤 공간 색인을 만듭니다."""
+    with open(path, encoding="utf-8") as f:
+        raw = json.load(f)
+    if not isinstance(raw, dict) or not isinstance(raw.get("cities"), dict) or not isinstance(raw.get("venues"), list):
+        raise CatalogError("cities 항목(객체)과 venues 항목(목록)이 필요합니다.")
+    for city, info in raw["cities"].items():
+        if not isinstance(info, dict) or "lat" not in info or "lon" not in info:
+            raise CatalogError(f"cities.{city}: lat과 lon이 필요합니다.")
+    venues = [_parse_venue(venue, position) for position, venue in enumerate(raw["venues"])]
+    return GeoDataset(raw["cities"], venues, cell_deg)
+
+
+_dataset = None
+_dataset_lock = threading.Lock()
+
+
+def get_geo_dataset():
+    """프로세스 전역 좌표 데이터를 반환합니다."""
+    global _dataset
+    if _dataset is None:
+        with _dataset_lock:
+            if _dataset is None:
+                _dataset = load_geo(os.getenv("GEO_PATH", DEFAULT_GEO_PATH))
+    return _dataset
+
+
+if __name__ == "__main__":
+    # 간단한 정확도/성능 테스트 코드
+    import random
+    import time
+
+    dataset = get_geo_dataset()
+    lat, lon = dataset.locate("서울 그랜드 호텔", "서울")
+    print(f"서울 그랜드 호텔 ({lat}, {lon}) 주변 관광지:")
+    for distance, venue in dataset.nearest("attraction", lat, lon, 3):
+        print(f"  {venue['name']} {distance}km")
+
+    random.seed(0)
+    count = 200_000
+    points = [
+        {"name": f"장소 {i}", "lat": random.uniform(33.0, 38.5), "lon": random.uniform(126.0, 129.6)}
+        for i in range(count)
+    ]
+    started = time.perf_counter()
+    index = GeoIndex(points)
+    print(f"색인 생성: {count:,}개, {(time.perf_counter() - started) * 1000:.0f}ms")
+
+    queries = [(random.uniform(33.0, 38.5), random.uniform(126.0, 129.6)) for _ in range(500)]
+    for query_lat, query_lon in queries[:20]:
+        expected = sorted(haversine_km(query_lat, query_lon, p["lat"], p["lon"]) for p in points)[:10]
+        found = [distance for distance, _ in index.nearest(query_lat, query_lon, 10)]
+        assert all(abs(a - b) < 1e-3 for a, b in zip(found, expected)), "k-최근접 결과가 전수 계산과 다릅니다"
+
+    started = time.perf_counter()
+    for query_lat, query_lon in queries:
+        index.within(query_lat, query_lon, 2.0)
+    print(f"반경 2km 검색: 평균 {(time.perf_counter() - started) / len(queries) * 1000:.3f}ms")
+    started = time.perf_counter()
+    for query_lat, query_lon in queries:
+        index.nearest(query_lat, query_lon, 10)
+    print(f"최근접 10개 검색: 평균 {(time.perf_counter() - started) / len(queries) * 1000:.3f}ms")
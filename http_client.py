@@ -0,0 +1,142 @@
+import os
+import random
+import threading
+import time
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# 재시도할 응답 코드
+RETRY_STATUS_CODES = frozenset([429, 500, 502, 503, 504])
+
+
+class HostStats:
+    """호스트별 지연 시간과 오류 횟수를 집계합니다."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.errors = 0
+        self.retries = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+        self.last_error = None
+
+    def record(self, latency, error=None):
+        with self._lock:
+            self.requests += 1
+            self.total_latency += latency
+            if latency > self.max_latency:
+                self.max_latency = latency
+            if error is not None:
+                self.errors += 1
+                self.last_error = error
+
+    def record_retry(self):
+        with self._lock:
+            self.retries += 1
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "errors": self.errors,
+                "retries": self.retries,
+                "avg_latency_ms": round(self.total_latency / self.requests * 1000, 1) if self.requests else 0.0,
+                "max_latency_ms": round(self.max_latency * 1000, 1),
+                "last_error": self.last_error
+            }
+
+
+class HttpClient:
+    """모든 외부 호출이 함께 사용하는 HTTP 클라이언트입니다.
+
+    호스트마다 keep-alive 세션과 동시 요청 제한을 두고,
+    타임아웃과 지수 백오프(지터 포함) 재시도를 적용합니다.
+    """
+
+    def __init__(self, connect_timeout=None, read_timeout=None, max_retries=None,
+                 backoff_base=None, backoff_max=None, pool_size=None, host_concurrency=None):
+        # 인자로 주지 않은 값은 환경 변수 설정을 사용합니다
+        self.timeout = (
+            connect_timeout if connect_timeout is not None else float(os.getenv("HTTP_CONNECT_TIMEOUT", "3.05")),
+            read_timeout if read_timeout is not None else float(os.getenv("HTTP_READ_TIMEOUT", "10"))
+        )
+        self.max_retries = max_retries if max_retries is not None else int(os.getenv("HTTP_MAX_RETRIES", "2"))
+        self.backoff_base = backoff_base if backoff_base is not None else float(os.getenv("HTTP_BACKOFF_BASE", "0.3"))
+        self.backoff_max = backoff_max if backoff_max is not None else float(os.getenv("HTTP_BACKOFF_MAX", "4"))
+        self.pool_size = pool_size if pool_size is not None else int(os.getenv("HTTP_POOL_SIZE", "10"))
+        self.host_concurrency = (
+            host_concurrency if host_concurrency is not None else int(os.getenv("HTTP_HOST_CONCURRENCY", "8"))
+        )
+        self._lock = threading.Lock()
+        self._sessions = {}
+        self._semaphores = {}
+        self._stats = {}
+
+    def _host_state(self, host):
+        """호스트별 세션, 세마포어, 통계를 가져옵니다. 없으면 생성합니다."""
+        session = self._sessions.get(host)
+        if session is not None:
+            return session, self._semaphores[host], self._stats[host]
+        with self._lock:
+            if host not in self._sessions:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                self._semaphores[host] = threading.BoundedSemaphore(self.host_concurrency)
+                self._stats.setdefault(host, HostStats())
+                self._sessions[host] = session
+            return self._sessions[host], self._semaphores[host], self._stats[host]
+
+    def _backoff(self, attempt):
+        """full jitter 방식의 대기 시간을 계산합니다."""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    def request(self, method, url, timeout=None, max_retries=None, **kwargs):
+        """요청을 보내고 응답을 반환합니다. 재시도 후에도 실패하면 예외를 발생시킵니다."""
+        host = urlsplit(url).netloc
+        session, semaphore, stats = self._host_state(host)
+        timeout = timeout or self.timeout
+        retries = self.max_retries if max_retries is None else max_retries
+
+        for attempt in range(retries + 1):
+            started = time.perf_counter()
+            try:
+                with semaphore:
+                    response = session.request(method, url, timeout=timeout, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                stats.record(time.perf_counter() - started, error=type(e).__name__)
+                if attempt >= retries:
+                    raise
+            else:
+                if response.status_code in RETRY_STATUS_CODES and attempt < retries:
+                    stats.record(time.perf_counter() - started, error=f"HTTP {response.status_code}")
+                    response.close()
+                else:
+                    error = f"HTTP {response.status_code}" if response.status_code >= 400 else None
+                    stats.record(time.perf_counter() - started, error=error)
+                    return response
+            stats.record_retry()
+            time.sleep(self._backoff(attempt))
+
+    def get(self, url, **kwargs):
+        """GET 요청을 보냅니다."""
+        return self.request("GET", url, **kwargs)
+
+    def get_stats(self):
+        """호스트별 지연 시간과 오류 통계를 반환합니다."""
+        with self._lock:
+            hosts = list(self._stats.items())
+        return {host: stats.snapshot() for host, stats in hosts}
+
+    def close(self):
+        """모든 세션의 연결을 닫습니다."""
+        with self._lock:
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+            self._semaphores.clear()
+        for session in sessions:
+            session.close()
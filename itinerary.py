@@ -0,0 +1,362 @@
+import math
+import re
+from datetime import timedelta
+
+from geo import haversine_km
+
+WEEKDAYS = "월화수목금토일"
+# 하루 일정의 시작/끝과 시간대 구분 (자정부터의 분)
+DAY_START = 9 * 60
+DAY_END = 22 * 60
+SLOTS = (("morning", 12 * 60), ("afternoon", 18 * 60), ("evening", 24 * 60))
+DEFAULT_STOPS_PER_DAY = 4
+DEFAULT_VISIT_MINUTES = 90
+# 도심 이동 평균 속도와 이동마다 더하는 대기/환승 시간
+TRAVEL_SPEED_KMH = 20.0
+TRAVEL_OVERHEAD_MINUTES = 10
+KMEANS_ROUNDS = 10
+
+_TIME_RANGE = re.compile(r"(\d{1,2}):(\d{2})\s*[-~–]\s*(\d{1,2}):(\d{2})")
+_DAY_RANGE = re.compile(rf"([{WEEKDAYS}])(?:요일)?\s*[-~–]\s*([{WEEKDAYS}])(?:요일)?")
+_DAY = re.compile(rf"([{WEEKDAYS}])(?:요일)?")
+
+
+def _days_in(text):
+    """문장에 나온 요일 번호(월=0) 집합입니다. 요일이 없으면 빈 집합입니다."""
+    days = set()
+    if "매일" in text:
+        return set(range(7))
+    if "평일" in text:
+        days.update(range(5))
+    if "주말" in text:
+        days.update((5, 6))
+    for first, last in _DAY_RANGE.findall(text):
+        start, end = WEEKDAYS.index(first), WEEKDAYS.index(last)
+        days.update(day % 7 for day in range(start, end + 1 if end >= start else end + 8))
+    # "평일", "주말"의 "일"을 일요일로 읽지 않도록 먼저 지웁니다
+    text = _DAY_RANGE.sub("", text).replace("평일", "").replace("주말", "")
+    days.update(WEEKDAYS.index(day) for day in _DAY.findall(text))
+    return days
+
+
+def parse_opening_hours(value):
+    """영업시간을 요일별 [(여는 시각, 닫는 시각)] 7개 목록으로 바꿉니다. 해석할 수 없으면 None입니다.
+
+    "매일 11:00-21:00", "09:00-18:00 (월요일 휴무)", ["월요일: 휴무", "화요일: 09:00 – 18:00"]
+    같은 형식을 받습니다. 자정을 넘겨 닫는 시각은 1440분 이후로 표시합니다.
+    """
+    if not value:
+        return None
+    lines = [value] if isinstance(value, str) else list(value)
+    general = []
+    specific = {}
+    closed = set()
+    for line in lines:
+        for part in re.split(r"[,;/()\n]", str(line)):
+            part = part.strip()
+            if not part:
+                continue
+            days = _days_in(part)
+            if "휴무" in part or "휴관" in part or "closed" in part.lower():
+                closed.update(days)
+                continue
+            if "24시간" in part:
+                windows = [(0, 24 * 60)]
+            else:
+                windows = []
+                for open_h, open_m, close_h, close_m in _TIME_RANGE.findall(part):
+                    opens = int(open_h) * 60 + int(open_m)
+                    closes = int(close_h) * 60 + int(close_m)
+                    windows.append((opens, closes if closes > opens else closes + 24 * 60))
+            if not windows:
+                continue
+            if days and days != set(range(7)):
+                for day in days:
+                    specific.setdefault(day, []).extend(windows)
+            else:
+                general.extend(windows)
+    if not general and not specific and not closed:
+        return None
+    default = general or ([(0, 24 * 60)] if not specific else [])
+    return tuple(
+        tuple(sorted(specific.get(day, default))) if day not in closed else ()
+        for day in range(7)
+    )
+
+
+class ItineraryScheduler:
+    """관광지 후보로 일별 방문 순서와 시각을 정합니다.
+
+    인기 순으로 (일수 × 하루 방문 수)만큼 고른 뒤 용량을 맞춘 k-평균으로 날짜별 지역을 나누고,
+    하루 동선은 최근접 이웃으로 만든 다음 2-opt로 줄입니다. 영업시간에 맞지 않는 곳은 빼고,
+    남은 후보를 영업시간 안에 들어가는 가장 이동이 짧은 자리에 끼워 넣습니다.
+    """
+
+    def __init__(self, start=None, stops_per_day=DEFAULT_STOPS_PER_DAY, speed_kmh=TRAVEL_SPEED_KMH,
+                 day_start=DAY_START, day_end=DAY_END):
+        # start는 매일 출발하는 위치(숙소나 도심)의 (위도, 경도)입니다
+        self.start = start
+        self.stops_per_day = stops_per_day
+        self.speed_kmh = speed_kmh
+        self.day_start = day_start
+        self.day_end = day_end
+
+    def _travel(self, a, b):
+        """장소 번호 a에서 b까지 이동 시간(분)입니다. None은 출발 위치입니다."""
+        if a is None:
+            if self._start_distances is None:
+                return 0
+            km = self._start_distances[b]
+        else:
+            km = self._distances[a][b]
+        return 0 if km == 0 else round(km / self.speed_kmh * 60) + TRAVEL_OVERHEAD_MINUTES
+
+    def _length(self, route):
+        return sum(self._travel(a, b) for a, b in zip([None] + route, route))
+
+    def _simulate(self, route, weekday):
+        """경로대로 방문할 때의 [(이동 분, 시작 시각, 끝 시각)]입니다. 영업시간이나 하루 일정을 넘기면 None입니다."""
+        clock = self.day_start
+        previous = None
+        timeline = []
+        for stop in route:
+            travel = self._travel(previous, stop)
+            arrive = clock + travel
+            visit = self._visits[stop]
+            windows = self._hours[stop][weekday] if self._hours[stop] is not None else ((0, 24 * 60),)
+            begin = None
+            for opens, closes in windows:
+                candidate = max(arrive, opens)
+                if candidate + visit <= closes:
+                    begin = candidate
+                    break
+            if begin is None or begin + visit > self.day_end:
+                return None
+            timeline.append((travel, begin, begin + visit))
+            clock = begin + visit
+            previous = stop
+        return timeline
+
+    def _nearest_neighbour(self, stops):
+        route = []
+        remaining = set(stops)
+        current = None
+        while remaining:
+            current = min(remaining, key=lambda stop: (self._travel(current, stop), stop))
+            route.append(current)
+            remaining.discard(current)
+        return route
+
+    def _two_opt(self, route):
+        """구간을 뒤집어 이동 시간이 줄어드는 동안 반복합니다. (출발 위치에서 시작하는 열린 경로)"""
+        improved = True
+        while improved:
+            improved = False
+            for i in range(len(route) - 1):
+                before = route[i - 1] if i > 0 else None
+                for j in range(i + 1, len(route)):
+                    after = route[j + 1] if j + 1 < len(route) else None
+                    current = self._travel(before, route[i]) + (self._travel(route[j], after) if after is not None else 0)
+                    swapped = self._travel(before, route[j]) + (self._travel(route[i], after) if after is not None else 0)
+                    # 뒤집힌 구간 내부의 이동 시간은 대칭이므로 양 끝만 비교합니다
+                    if swapped < current:
+                        route[i:j + 1] = reversed(route[i:j + 1])
+                        improved = True
+        return route
+
+    def _cluster(self, stops, groups):
+        """용량(하루 방문 수)을 맞춘 k-평균으로 장소를 groups개 지역으로 나눕니다."""
+        # 장소보다 날짜가 많으면 장소 수만큼만 나누고 남는 날짜는 비워 둡니다
+        used = min(groups, len(stops))
+        empty = [[] for _ in range(groups - used)]
+        if not stops:
+            return empty
+        mean_lat = math.radians(sum(self._lats[stop] for stop in stops) / len(stops))
+        points = {stop: (self._lons[stop] * math.cos(mean_lat) * 111.32, self._lats[stop] * 110.57) for stop in stops}
+        # 초기 중심: 가장 인기 있는 곳부터 시작해 기존 중심에서 가장 먼 곳을 차례로 고릅니다
+        centers = [points[stops[0]]]
+        while len(centers) < used:
+            farthest = max(stops, key=lambda stop: min(math.dist(points[stop], center) for center in centers))
+            centers.append(points[farthest])
+        capacity = math.ceil(len(stops) / used)
+        assignment = None
+        for _ in range(KMEANS_ROUNDS):
+            pairs = sorted(
+                (math.dist(points[stop], center), stop, group)
+                for stop in stops for group, center in enumerate(centers)
+            )
+            clusters = [[] for _ in range(used)]
+            placed = {}
+            for _, stop, group in pairs:
+                if stop not in placed and len(clusters[group]) < capacity:
+                    placed[stop] = group
+                    clusters[group].append(stop)
+            if placed == assignment:
+                break
+            assignment = placed
+            centers = [
+                (sum(points[stop][0] for stop in cluster) / len(cluster),
+                 sum(points[stop][1] for stop in cluster) / len(cluster)) if cluster else centers[group]
+                for group, cluster in enumerate(clusters)
+            ]
+        return clusters + empty
+
+    def _assign_days(self, clusters, weekdays):
+        """영업하는 곳이 가장 많은 날짜에 지역을 하나씩 배정합니다."""
+        def open_count(cluster, weekday):
+            return sum(1 for stop in cluster if self._hours[stop] is None or self._hours[stop][weekday])
+
+        by_day = [None] * len(weekdays)
+        order = sorted(range(len(clusters)), key=lambda group: -len(clusters[group]))
+        for group in order:
+            day = max(
+                (day for day in range(len(weekdays)) if by_day[day] is None),
+                key=lambda day: (open_count(clusters[group], weekdays[day]), -day)
+            )
+            by_day[day] = clusters[group]
+        return by_day
+
+    def _plan_day(self, stops, weekday, pending):
+        """하루 동선을 만들고, 영업시간 안에 들어가지 않는 곳은 pending으로 보냅니다."""
+        route = self._two_opt(self._nearest_neighbour(stops))
+        while route:
+            # 이동 시간은 같으므로 정방향/역방향 중 영업시간 대기가 적어 일찍 끝나는 쪽을 고릅니다
+            finished = []
+            for candidate in (route, route[::-1]):
+                timeline = self._simulate(candidate, weekday)
+                if timeline is not None:
+                    finished.append((timeline[-1][2], candidate))
+            if finished:
+                return min(finished)[1]
+            # 일정을 넘기게 만드는 첫 장소를 뺍니다
+            for cut in range(1, len(route) + 1):
+                if self._simulate(route[:cut], weekday) is None:
+                    pending.append(route.pop(cut - 1))
+                    break
+        return route
+
+    def _insert(self, routes, weekdays, stop):
+        """영업시간에 맞는 자리 중 이동 시간이 가장 적게 늘어나는 곳에 끼워 넣습니다."""
+        best = None
+        for day, route in enumerate(routes):
+            if len(route) >= self.stops_per_day:
+                continue
+            base = self._length(route)
+            for position in range(len(route) + 1):
+                candidate = route[:position] + [stop] + route[position:]
+                added = self._length(candidate) - base
+                if (best is None or added < best[0]) and self._simulate(candidate, weekdays[day]) is not None:
+                    best = (added, day, candidate)
+        if best is None:
+            return False
+        routes[best[1]][:] = best[2]
+        return True
+
+    def schedule(self, pois, dates, priority=None):
+        """pois(위도 lat, 경도 lon이 있는 dict 목록)로 dates 날짜별 일정을 만듭니다.
+
+        각 장소의 opening_hours와 visit_minutes(없으면 90분)를 반영하고, priority(없으면
+        popularity 또는 rating)가 높은 곳을 먼저 고릅니다. 반환값의 각 방문에는 arrival,
+        departure, slot(morning/afternoon/evening), travel_minutes가 붙습니다.
+        """
+        if priority is None:
+            priority = lambda poi: poi.get("popularity", poi.get("rating", 0))  # noqa: E731
+        ranked = sorted(range(len(pois)), key=lambda position: (-priority(pois[position]), position))
+        pois = [pois[position] for position in ranked]
+        self._lats = [poi["lat"] for poi in pois]
+        self._lons = [poi["lon"] for poi in pois]
+        self._visits = [poi.get("visit_minutes", DEFAULT_VISIT_MINUTES) for poi in pois]
+        self._hours = [parse_opening_hours(poi.get("opening_hours")) for poi in pois]
+        self._distances = [
+            [haversine_km(lat, lon, other_lat, other_lon) for other_lat, other_lon in zip(self._lats, self._lons)]
+            for lat, lon in zip(self._lats, self._lons)
+        ]
+        self._start_distances = None if self.start is None else [
+            haversine_km(self.start[0], self.start[1], lat, lon) for lat, lon in zip(self._lats, self._lons)
+        ]
+
+        weekdays = [day.weekday() for day in dates]
+        selected = list(range(min(len(pois), len(dates) * self.stops_per_day)))
+        clusters = self._assign_days(self._cluster(selected, len(dates)), weekdays)
+
+        pending = []
+        routes = []
+        for cluster, weekday in zip(clusters, weekdays):
+            # 그날 쉬는 곳은 다른 날짜에 다시 넣어 봅니다
+            open_stops = [stop for stop in cluster if self._hours[stop] is None or self._hours[stop][weekday]]
+            pending.extend(stop for stop in cluster if stop not in open_stops)
+            routes.append(self._plan_day(open_stops, weekday, pending))
+
+        # 빠진 곳과 나머지 후보를 인기 순으로 빈자리에 채웁니다
+        unscheduled = []
+        for stop in sorted(pending) + list(range(len(selected), len(pois))):
+            if not self._insert(routes, weekdays, stop) and stop < len(selected):
+                unscheduled.append(stop)
+
+        days = []
+        total = 0
+        for trip_day, weekday, route in zip(dates, weekdays, routes):
+            visits = []
+            for stop, (travel, begin, end) in zip(route, self._simulate(route, weekday)):
+                slot = next(name for name, slot_end in SLOTS if begin < slot_end)
+                visits.append(dict(
+                    pois[stop],
+                    arrival=f"{begin // 60:02d}:{begin % 60:02d}",
+                    departure=f"{end // 60 % 24:02d}:{end % 60:02d}",
+                    slot=slot,
+                    travel_minutes=travel
+                ))
+            travel_minutes = sum(visit["travel_minutes"] for visit in visits)
+            total += travel_minutes
+            days.append({"date": trip_day, "visits": visits, "travel_minutes": travel_minutes})
+        return {
+            "days": days,
+            "unscheduled": [pois[stop] for stop in unscheduled],
+            "total_travel_minutes": total
+        }
+
+
+def trip_dates(first_day, duration):
+    return [first_day + timedelta(days=offset) for offset in range(duration)]
+
+
+if __name__ == "__main__":
+    # 간단한 정확도/성능 테스트 코드
+    import random
+    import time
+    from datetime import date
+
+    random.seed(0)
+    hours = ["매일 09:00-18:00", "10:00-22:00 (월요일 휴무)", "09:00-17:00, 화요일 휴관", "24시간", None,
+             ["월요일: 휴무", "화-일: 11:00 – 20:00"]]
+    pois = [
+        {
+            "name": f"관광지 {i}",
+            "lat": 37.5665 + random.gauss(0, 0.05),
+            "lon": 126.9780 + random.gauss(0, 0.06),
+            "popularity": random.random(),
+            "opening_hours": random.choice(hours),
+            "visit_minutes": random.choice([60, 90, 120])
+        }
+        for i in range(220)
+    ]
+    scheduler = ItineraryScheduler(start=(37.5665, 126.9780))
+    dates = trip_dates(date(2025, 5, 1), 14)
+    started = time.perf_counter()
+    plan = scheduler.schedule(pois, dates)
+    elapsed = (time.perf_counter() - started) * 1000
+    visits = sum(len(day["visits"]) for day in plan["days"])
+    print(f"후보 {len(pois)}곳, {len(dates)}일: {elapsed:.0f}ms, 방문 {visits}곳, "
+          f"총 이동 {plan['total_travel_minutes']}분, 일정에 못 넣은 곳 {len(plan['unscheduled'])}곳")
+    for day in plan["days"][:2]:
+        print(f"  {day['date']} (이동 {day['travel_minutes']}분)")
+        for visit in day["visits"]:
+            print(f"    {visit['arrival']}-{visit['departure']} [{visit['slot']}] {visit['name']}"
+                  f" (이동 {visit['travel_minutes']}분, {visit['opening_hours']})")
+
+    # 장소보다 날짜가 많은 일정도 만들 수 있어야 합니다
+    for count, days in ((5, 7), (3, 5), (1, 3), (0, 2)):
+        plan = scheduler.schedule(pois[:count], trip_dates(date(2025, 5, 1), days))
+        assert len(plan["days"]) == days
+        assert sum(len(day["visits"]) for day in plan["days"]) + len(plan["unscheduled"]) == count
+    print("장소보다 날짜가 많은 일정: 통과")
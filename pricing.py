@@ -0,0 +1,166 @@
+import re
+from array import array
+from collections import namedtuple
+
+# 통화별 보조 단위 자릿수 (KRW 1원, USD 1센트 ...)
+CURRENCY_DECIMALS = {
+    "KRW": 0, "JPY": 0, "VND": 0, "TWD": 0,
+    "USD": 2, "EUR": 2, "GBP": 2, "CNY": 2, "CHF": 2, "THB": 2,
+    "SGD": 2, "HKD": 2, "MOP": 2, "MYR": 2, "AED": 2, "TRY": 2
+}
+
+# "10,000-30,000원", "5-10만원"
+_RANGE_PATTERN = re.compile(r"([\d,.]+)\s*(만)?\s*원?\s*[-~]\s*([\d,.]+)\s*(만)?\s*원")
+# "50,000원 이상", "10,000원 이하", "100,000원", "5만원 이하"
+_SINGLE_PATTERN = re.compile(r"([\d,.]+)\s*(만)?\s*원\s*(이상|이하)?")
+
+
+def ranges_overlap(min_minor, max_minor, low, high):
+    """[min_minor, max_minor] 가격대가 [low, high] 구간과 겹치는지 확인합니다. 상한이 None이면 없고 low가 0이면 하한이 없습니다.
+
+    한쪽이 단일 가격이면 양 끝을 포함하므로 경계 가격(예: 50,000원)은 맞닿은 두 구간에 모두 해당합니다.
+    둘 다 폭이 있는 구간이면 경계 한 점만 맞닿은 것은 겹치지 않는 것으로 봅니다.
+    ("10,000-30,000원" 맛집은 "10,000원 이하"나 "30,000-50,000원" 예산에 들어가지 않습니다)
+    """
+    if min_minor == max_minor or (high is not None and low == high):
+        return (high is None or min_minor <= high) and (not low or max_minor is None or max_minor >= low)
+    return (high is None or min_minor < high) and (not low or max_minor is None or max_minor > low)
+
+
+class Price(namedtuple("Price", ["min_minor", "max_minor", "currency"])):
+    """가격대입니다. 금액은 보조 단위 정수이며 상한이 없으면 max_minor는 None입니다."""
+
+    __slots__ = ()
+
+    def overlaps(self, low, high):
+        """[low, high] 구간과 겹치는지 확인합니다. high가 None이면 상한이 없습니다. (경계는 ranges_overlap 참고)"""
+        return ranges_overlap(self.min_minor, self.max_minor, low, high)
+
+    def label(self):
+        """사람이 읽을 수 있는 문자열로 변환합니다."""
+        scale = 10 ** CURRENCY_DECIMALS.get(self.currency, 2)
+        unit = "원" if self.currency == "KRW" else f" {self.currency}"
+        low = f"{self.min_minor / scale:,.0f}"
+        if self.max_minor is None:
+            return f"{low}{unit} 이상"
+        high = f"{self.max_minor / scale:,.0f}"
+        if self.min_minor == 0:
+            return f"{high}{unit} 이하"
+        if self.min_minor == self.max_minor:
+            return f"{low}{unit}"
+        return f"{low}-{high}{unit}"
+
+
+def _to_won(number, unit):
+    value = float(number.replace(",", ""))
+    return int(round(value * 10000)) if unit == "만" else int(round(value))
+
+
+def parse_price(text):
+    """원화 가격 문자열을 Price로 변환합니다. 해석할 수 없으면 None을 반환합니다."""
+    if isinstance(text, Price):
+        return text
+    if not text:
+        return None
+    match = _RANGE_PATTERN.search(text)
+    if match:
+        low, low_unit, high, high_unit = match.groups()
+        # "5-10만원"처럼 단위가 뒤에만 붙은 경우 앞 숫자에도 같은 단위를 적용합니다
+        return Price(_to_won(low, low_unit or high_unit), _to_won(high, high_unit), "KRW")
+    match = _SINGLE_PATTERN.search(text)
+    if not match:
+        return None
+    number, unit, direction = match.groups()
+    value = _to_won(number, unit)
+    if direction == "이상":
+        return Price(value, None, "KRW")
+    if direction == "이하":
+        return Price(0, value, "KRW")
+    return Price(value, value, "KRW")
+
+
+class PriceColumn:
+    """가격대 목록을 배열에 나눠 담은 열입니다. 범위 검색을 빠르게 처리합니다."""
+
+    # 상한이 없는 가격대는 -1로 저장합니다
+    OPEN = -1
+
+    def __init__(self, prices=()):
+        self.mins = array("q")
+        self.maxs = array("q")
+        self.currency_ids = array("B")
+        self.currencies = []
+        self._currency_index = {}
+        for price in prices:
+            self.append(price)
+
+    def append(self, price):
+        currency_id = self._currency_index.get(price.currency)
+        if currency_id is None:
+            currency_id = self._currency_index[price.currency] = len(self.currencies)
+            self.currencies.append(price.currency)
+        self.mins.append(price.min_minor)
+        self.maxs.append(self.OPEN if price.max_minor is None else price.max_minor)
+        self.currency_ids.append(currency_id)
+
+    def __len__(self):
+        return len(self.mins)
+
+    def __getitem__(self, row):
+        high = self.maxs[row]
+        return Price(self.mins[row], None if high == self.OPEN else high, self.currencies[self.currency_ids[row]])
+
+    def overlaps(self, row, low, high, currency="KRW"):
+        """row의 가격대가 [low, high] 구간과 겹치는지 확인합니다. (경계는 ranges_overlap 참고)"""
+        if self.currencies[self.currency_ids[row]] != currency:
+            return False
+        row_high = self.maxs[row]
+        return ranges_overlap(self.mins[row], None if row_high == self.OPEN else row_high, low, high)
+
+    def filter(self, low, high, currency="KRW", rows=None):
+        """[low, high] 구간과 겹치는 행 번호 목록을 반환합니다."""
+        candidates = range(len(self.mins)) if rows is None else rows
+        return [row for row in candidates if self.overlaps(row, low, high, currency)]
+
+
+# 화면의 예산 선택 항목
+RESTAURANT_BUDGETS = {
+    label: parse_price(label)
+    for label in ["10,000원 이하", "10,000-30,000원", "30,000-50,000원", "50,000원 이상"]
+}
+ACCOMMODATION_BUDGETS = {
+    label: parse_price(label)
+    for label in ["5만원 이하", "5-10만원", "10-20만원", "20만원 이상"]
+}
+
+
+if __name__ == "__main__":
+    # 간단한 정확도 테스트 코드
+    def buckets(text):
+        price = parse_price(text)
+        column = PriceColumn([price])
+        matched = [label for label, budget in ACCOMMODATION_BUDGETS.items()
+                   if price.overlaps(budget.min_minor, budget.max_minor)]
+        assert matched == [label for label, budget in ACCOMMODATION_BUDGETS.items()
+                           if column.overlaps(0, budget.min_minor, budget.max_minor)]
+        return matched
+
+    # 예산 구간 경계의 가격도 어느 구간에든 들어가야 합니다
+    assert buckets("50,000원") == ["5만원 이하", "5-10만원"]
+    assert buckets("100,000원") == ["5-10만원", "10-20만원"]
+    assert buckets("200,000원") == ["10-20만원", "20만원 이상"]
+    assert buckets("49,000원") == ["5만원 이하"]
+    assert buckets("80,000-120,000원") == ["5-10만원", "10-20만원"]
+    assert not parse_price("50,001원").overlaps(0, 50000)
+
+    # 가격대가 있는 맛집은 경계만 맞닿은 옆 구간에 들어가지 않고 자기 구간에만 해당합니다
+    def restaurant_buckets(text):
+        price = parse_price(text)
+        return [label for label, budget in RESTAURANT_BUDGETS.items()
+                if price.overlaps(budget.min_minor, budget.max_minor)]
+
+    for label in RESTAURANT_BUDGETS:
+        assert restaurant_buckets(label) == [label], (label, restaurant_buckets(label))
+    assert restaurant_buckets("20,000-40,000원") == ["10,000-30,000원", "30,000-50,000원"]
+    assert restaurant_buckets("30,000원") == ["10,000-30,000원", "30,000-50,000원"]
+    print("가격 구간 경계 테스트: 통과")
@@ -0,0 +1,86 @@
+import math
+from datetime import date, datetime
+
+DEFAULT_HALF_LIFE_DAYS = 180
+STARS = (1, 2, 3, 4, 5)
+
+
+def day_number(value):
+    """리뷰 작성일을 감쇠 계산용 일 단위 숫자로 변환합니다."""
+    if isinstance(value, datetime):
+        return value.toordinal()
+    if isinstance(value, date):
+        return value.toordinal()
+    return date.fromisoformat(str(value)[:10]).toordinal()
+
+
+def star_of(rating):
+    """평점을 1~5 사이의 별 개수로 맞춥니다."""
+    return min(5, max(1, int(round(rating))))
+
+
+class RatingAggregate:
+    """여행지 하나의 평점 집계입니다.
+
+    개수, 합계, 별점별 분포와 시간 감쇠 평균을 리뷰가 추가될 때마다 갱신하므로
+    조회는 리뷰 수와 관계없이 O(1)입니다. 감쇠 합계와 가중치는 같은 비율로 줄어들기 때문에
+    마지막 갱신 시점 기준 값만 저장해도 언제든 감쇠 평균을 바로 구할 수 있습니다.
+    """
+
+    __slots__ = ("count", "total", "histogram", "decayed_total", "decayed_weight", "decayed_at", "half_life")
+
+    def __init__(self, count=0, total=0, histogram=None, decayed_total=0.0, decayed_weight=0.0,
+                 decayed_at=None, half_life=DEFAULT_HALF_LIFE_DAYS):
+        self.count = count
+        self.total = total
+        self.histogram = list(histogram) if histogram else [0] * len(STARS)
+        self.decayed_total = decayed_total
+        self.decayed_weight = decayed_weight
+        self.decayed_at = decayed_at
+        self.half_life = half_life
+
+    def _decay(self, days):
+        return math.exp(-math.log(2) * days / self.half_life)
+
+    def add(self, rating, day):
+        """리뷰 하나를 반영합니다. day는 day_number()로 만든 작성일입니다."""
+        self.count += 1
+        self.total += rating
+        self.histogram[star_of(rating) - 1] += 1
+        if self.decayed_at is None:
+            self.decayed_at = day
+        if day >= self.decayed_at:
+            factor = self._decay(day - self.decayed_at)
+            self.decayed_total = self.decayed_total * factor + rating
+            self.decayed_weight = self.decayed_weight * factor + 1
+            self.decayed_at = day
+        else:
+            # 과거 날짜의 리뷰는 기존 기준 시점까지 감쇠시켜 더합니다
+            weight = self._decay(self.decayed_at - day)
+            self.decayed_total += rating * weight
+            self.decayed_weight += weight
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else 0
+
+    @property
+    def decayed_mean(self):
+        return self.decayed_total / self.decayed_weight if self.decayed_weight else 0
+
+    def summary(self):
+        """화면과 API에서 사용하는 집계 요약을 반환합니다."""
+        return {
+            "count": self.count,
+            "average": self.mean,
+            "decayed_average": self.decayed_mean,
+            "histogram": dict(zip(STARS, self.histogram))
+        }
+
+    def matches(self, other):
+        """원본 리뷰로 다시 계산한 집계와 개수/합계/분포가 같은지 확인합니다."""
+        return (
+            self.count == other.count
+            and math.isclose(self.total, other.total)
+            and self.histogram == other.histogram
+        )
@@ -0,0 +1,237 @@
+import os
+import threading
+import time
+from collections import namedtuple
+from datetime import datetime
+
+from storage import MemoryStorage
+
+# 외부 API 무료 호출 한도 (setup.py 안내와 동일)
+WEATHER_QUOTA = (60, 60)  # OpenWeatherMap: 분당 60회
+EXCHANGE_QUOTA = (1500, 30 * 24 * 60 * 60)  # ExchangeRate-API: 월 1,500회
+
+DEFAULT_WEATHER_INTERVAL = 10 * 60
+DEFAULT_EXCHANGE_INTERVAL = 60 * 60
+TICK_SECONDS = 5
+
+
+class QuotaExceededError(Exception):
+    """외부 API 호출 한도를 모두 사용했을 때 발생합니다."""
+
+
+class QuotaBudget:
+    """최근 period초 동안의 호출 수를 limit 이하로 제한합니다.
+
+    호출 기록은 저장소에 남기므로 SQLite 저장소를 함께 쓰는 워커 프로세스들이 한도를 나눠 쓰고,
+    재시작하거나 어시스턴트를 다시 만들어도 한도가 초기화되지 않습니다.
+    """
+
+    def __init__(self, name, limit, period, storage=None):
+        self.name = name
+        self.limit = limit
+        self.period = period
+        # 저장소를 주지 않으면 이 프로세스 안에서만 호출 수를 셉니다
+        self.storage = storage if storage is not None else MemoryStorage()
+        self._lock = threading.Lock()
+        self.rejected = 0
+
+    def try_acquire(self):
+        """호출 한 번을 예약합니다. 한도를 넘으면 False를 반환합니다."""
+        if self.storage.acquire_quota(self.name, self.limit, self.period):
+            return True
+        with self._lock:
+            self.rejected += 1
+        return False
+
+    def acquire(self):
+        """호출 한 번을 예약합니다. 한도를 넘으면 QuotaExceededError를 발생시킵니다."""
+        if not self.try_acquire():
+            raise QuotaExceededError(f"{self.name} API 호출 한도({self.limit}회)를 모두 사용했습니다.")
+
+    def remaining(self):
+        return max(self.limit - self.storage.quota_used(self.name, self.period), 0)
+
+    def stats(self):
+        return {"limit": self.limit, "period": self.period, "remaining": self.remaining(), "rejected": self.rejected}
+
+
+class StaleResult(dict):
+    """API 호출이 실패해 마지막 스냅샷으로 대신 돌려준 결과입니다. 캐시에 저장하지 않습니다."""
+
+    __slots__ = ()
+
+
+class Snapshot(namedtuple("Snapshot", ["value", "fetched_at", "ttl", "source"])):
+    """마지막으로 성공한 조회 결과와 조회 시각입니다."""
+
+    __slots__ = ()
+
+    @property
+    def age(self):
+        return time.time() - self.fetched_at
+
+    @property
+    def stale(self):
+        return self.age > self.ttl
+
+    def meta(self):
+        """결과에 붙여 보여 줄 갱신 시각과 오래됨 여부입니다."""
+        return {
+            "updated_at": datetime.fromtimestamp(self.fetched_at).strftime("%Y-%m-%d %H:%M:%S"),
+            "age_seconds": round(self.age),
+            "stale": self.stale,
+            "source": self.source
+        }
+
+
+class SnapshotStore:
+    """stale-while-revalidate 방식의 최신 결과 보관소입니다.
+
+    조회하면 오래된 결과라도 즉시 돌려주고, 오래된 경우에는 백그라운드에서 한 번만 다시 가져옵니다.
+    다시 가져오기가 실패하면 마지막으로 성공한 결과를 계속 사용합니다.
+    """
+
+    def __init__(self, executor):
+        self._executor = executor
+        self._lock = threading.Lock()
+        self._snapshots = {}
+        self._revalidating = set()
+        self._stats = {"fresh": 0, "stale": 0, "misses": 0, "revalidations": 0, "failures": 0}
+
+    def get(self, key):
+        with self._lock:
+            return self._snapshots.get(key)
+
+    def put(self, key, value, ttl, source="live"):
+        snapshot = Snapshot(value, time.time(), ttl, source)
+        with self._lock:
+            self._snapshots[key] = snapshot
+        return snapshot
+
+    def read(self, key, loader, ttl):
+        """스냅샷을 반환합니다. 없으면 loader를 바로 호출하고, 오래되었으면 백그라운드에서 갱신합니다."""
+        snapshot = self.get(key)
+        if snapshot is None:
+            with self._lock:
+                self._stats["misses"] += 1
+            return self.put(key, loader(), ttl)
+        if snapshot.stale:
+            with self._lock:
+                self._stats["stale"] += 1
+                start = key not in self._revalidating
+                if start:
+                    self._revalidating.add(key)
+            if start:
+                self._executor.submit(self._revalidate, key, loader, ttl)
+        else:
+            with self._lock:
+                self._stats["fresh"] += 1
+        return snapshot
+
+    def _revalidate(self, key, loader, ttl):
+        try:
+            self.put(key, loader(), ttl)
+            outcome = "revalidations"
+        except Exception as e:
+            print(f"Error refreshing {key}: {str(e)}")
+            outcome = "failures"
+        with self._lock:
+            self._revalidating.discard(key)
+            self._stats[outcome] += 1
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats["entries"] = len(self._snapshots)
+        return stats
+
+
+class BackgroundRefresher:
+    """자주 찾는 여행지의 날씨와 환율을 주기적으로 미리 가져오는 스레드입니다.
+
+    호출 한도의 절반까지만 미리 가져오기에 사용하고 나머지는 사용자 요청에 남겨 둡니다.
+    """
+
+    def __init__(self, assistant, destinations=None, weather_interval=None, exchange_interval=None):
+        self.assistant = assistant
+        destinations = destinations or os.getenv("REFRESH_DESTINATIONS", "")
+        if isinstance(destinations, str):
+            destinations = [name.strip() for name in destinations.split(",") if name.strip()]
+        self._destinations = list(destinations)
+        self.weather_interval = weather_interval or float(
+            os.getenv("WEATHER_REFRESH_INTERVAL", str(DEFAULT_WEATHER_INTERVAL))
+        )
+        exchange_interval = exchange_interval or float(
+            os.getenv("EXCHANGE_REFRESH_INTERVAL", str(DEFAULT_EXCHANGE_INTERVAL))
+        )
+        # 월 한도를 한 달 동안 고르게 나눈 간격보다 자주 호출하지 않습니다
+        limit, period = EXCHANGE_QUOTA
+        self.exchange_interval = max(exchange_interval, period / limit)
+        self._next_due = {}
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def destinations(self):
+        # 지정하지 않으면 카탈로그의 모든 여행지를 대상으로 합니다
+        return self._destinations or list(self.assistant.catalog.destinations)
+
+    def start(self):
+        """백그라운드 스레드를 시작합니다. 이미 실행 중이면 아무것도 하지 않습니다."""
+        if self._thread is not None and self._thread.is_alive():
+            return self
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="travel-refresher", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout)
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.run_once()
+            except Exception as e:
+                print(f"Error in background refresh: {str(e)}")
+            self._stop.wait(TICK_SECONDS)
+
+    def _due(self, key, now):
+        return self._next_due.get(key, 0) <= now
+
+    def _has_headroom(self, budget):
+        return budget.remaining() > budget.limit // 2
+
+    def run_once(self):
+        """지금 갱신할 차례인 항목을 가져오고 갱신한 항목 수를 반환합니다."""
+        assistant = self.assistant
+        now = time.monotonic()
+        refreshed = 0
+
+        if assistant.exchange_api_key and self._due("exchange", now):
+            # 실패해도 다음 주기까지 다시 호출하지 않도록 예정 시각을 먼저 정합니다
+            self._next_due["exchange"] = now + self.exchange_interval
+            if self._has_headroom(assistant.quotas["exchange"]):
+                try:
+                    assistant.refresh_exchange_rates()
+                    refreshed += 1
+                except Exception as e:
+                    print(f"Error refreshing exchange rates: {str(e)}")
+
+        if assistant.weather_api_key:
+            for location in self.destinations:
+                key = ("weather", location)
+                if not self._due(key, now):
+                    continue
+                if not self._has_headroom(assistant.quotas["weather"]):
+                    break
+                try:
+                    assistant.refresh_weather(location)
+                    refreshed += 1
+                except Exception as e:
+                    print(f"Error refreshing weather for {location}: {str(e)}")
+                self._next_due[key] = now + self.weather_interval
+        return refreshed
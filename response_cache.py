@@ -0,0 +1,343 @@
+import functools
+import inspect
+import json
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from datetime import date, datetime
+
+# 데이터 종류별 캐시 유지 시간 (초)
+DEFAULT_TTLS = {
+    "weather": 10 * 60,
+    "exchange": 60 * 60,
+    "events": 30 * 60
+}
+DEFAULT_TTL = 5 * 60
+DEFAULT_MAX_MB = 32
+
+
+def _normalize(value):
+    """캐시 키에 사용할 수 있도록 인자를 정규화합니다."""
+    if value is None or isinstance(value, (bool, int, float)):
+        return value
+    if isinstance(value, str):
+        return " ".join(value.split()).casefold()
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v) for v in value]
+    if isinstance(value, dict):
+        return {str(k): _normalize(v) for k, v in sorted(value.items())}
+    return str(value)
+
+
+def make_key(namespace, args):
+    """네임스페이스와 인자로 캐시 키를 만듭니다."""
+    return namespace + "|" + json.dumps(_normalize(args), ensure_ascii=False, sort_keys=True)
+
+
+class MemoryBackend:
+    """프로세스 내부 LRU 캐시 저장소입니다.
+
+    SQLite 저장소처럼 값을 직렬화해 두고 조회할 때마다 새 객체로 돌려주므로,
+    호출한 쪽이 결과를 고쳐도 캐시된 값은 바뀌지 않습니다.
+    """
+
+    def __init__(self, max_bytes=DEFAULT_MAX_MB * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """(찾았는지 여부, 값)을 반환합니다."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False, None
+            expires_at, size, data = entry
+            if expires_at <= time.time():
+                del self._entries[key]
+                self.total_bytes -= size
+                return False, None
+            self._entries.move_to_end(key)
+        return True, pickle.loads(data)
+
+    def set(self, key, value, ttl):
+        """값을 저장하고 제거된 항목 수를 반환합니다."""
+        data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        size = len(data)
+        evicted = 0
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.total_bytes -= old[1]
+            self._entries[key] = (time.time() + ttl, size, data)
+            self.total_bytes += size
+            while self.total_bytes > self.max_bytes and len(self._entries) > 1:
+                _, (_, old_size, _) = self._entries.popitem(last=False)
+                self.total_bytes -= old_size
+                evicted += 1
+        return evicted
+
+    def delete(self, key):
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self.total_bytes -= entry[1]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.total_bytes = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def close(self):
+        pass
+
+
+class SQLiteBackend:
+    """여러 워커 프로세스가 함께 쓰는 SQLite 파일 캐시 저장소입니다."""
+
+    def __init__(self, path, max_bytes=DEFAULT_MAX_MB * 1024 * 1024):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._local = threading.local()
+        self._connections = []
+        self._connections_lock = threading.Lock()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        conn = self._connection()
+        with conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache_entries ("
+                "key TEXT PRIMARY KEY, value BLOB NOT NULL, size INTEGER NOT NULL, "
+                "expires_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_cache_accessed ON cache_entries (accessed_at)")
+
+    def _connection(self):
+        """스레드마다 하나의 연결을 사용합니다."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            with self._connections_lock:
+                self._connections.append(conn)
+        return conn
+
+    def get(self, key):
+        conn = self._connection()
+        row = conn.execute(
+            "SELECT value, expires_at FROM cache_entries WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return False, None
+        now = time.time()
+        with conn:
+            if row[1] <= now:
+                conn.execute("DELETE FROM cache_entries WHERE key = ?", (key,))
+                return False, None
+            conn.execute("UPDATE cache_entries SET accessed_at = ? WHERE key = ?", (now, key))
+        return True, pickle.loads(row[0])
+
+    def set(self, key, value, ttl):
+        data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        now = time.time()
+        conn = self._connection()
+        evicted = 0
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO cache_entries (key, value, size, expires_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, sqlite3.Binary(data), len(data), now + ttl, now)
+            )
+            conn.execute("DELETE FROM cache_entries WHERE expires_at <= ?", (now,))
+            total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM cache_entries").fetchone()[0]
+            if total > self.max_bytes:
+                # 오래 사용하지 않은 항목부터 용량 제한 아래로 내려갈 때까지 제거합니다
+                rows = conn.execute(
+                    "SELECT key, size FROM cache_entries WHERE key != ? ORDER BY accessed_at", (key,)
+                ).fetchall()
+                victims = []
+                for victim, size in rows:
+                    if total <= self.max_bytes:
+                        break
+                    victims.append((victim,))
+                    total -= size
+                conn.executemany("DELETE FROM cache_entries WHERE key = ?", victims)
+                evicted = len(victims)
+        return evicted
+
+    def delete(self, key):
+        conn = self._connection()
+        with conn:
+            conn.execute("DELETE FROM cache_entries WHERE key = ?", (key,))
+
+    def clear(self):
+        conn = self._connection()
+        with conn:
+            conn.execute("DELETE FROM cache_entries")
+
+    def __len__(self):
+        return self._connection().execute("SELECT COUNT(*) FROM cache_entries").fetchone()[0]
+
+    def close(self):
+        with self._connections_lock:
+            connections = list(self._connections)
+            self._connections.clear()
+        for conn in connections:
+            conn.close()
+        self._local = threading.local()
+
+
+class _Flight:
+    """진행 중인 원본 조회 하나를 나타냅니다."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class ResponseCache:
+    """TTL과 LRU를 적용한 외부 응답 캐시입니다.
+
+    같은 키에 대한 동시 캐시 미스는 하나의 원본 조회로 합쳐집니다.
+    """
+
+    def __init__(self, backend=None, ttls=None):
+        self.backend = backend if backend is not None else MemoryBackend()
+        self.ttls = dict(DEFAULT_TTLS)
+        if ttls:
+            self.ttls.update(ttls)
+        self._lock = threading.Lock()
+        self._inflight = {}
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0, "coalesced": 0}
+
+    @classmethod
+    def from_env(cls):
+        """환경 변수 설정에 맞는 저장소로 캐시를 생성합니다."""
+        max_bytes = int(float(os.getenv("RESPONSE_CACHE_MAX_MB", str(DEFAULT_MAX_MB))) * 1024 * 1024)
+        if os.getenv("RESPONSE_CACHE_BACKEND", "memory").lower() == "sqlite":
+            path = os.getenv(
+                "RESPONSE_CACHE_PATH",
+                os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "responses.db")
+            )
+            return cls(SQLiteBackend(path, max_bytes))
+        return cls(MemoryBackend(max_bytes))
+
+    def _count(self, name, amount=1):
+        with self._lock:
+            self._stats[name] += amount
+
+    def ttl_for(self, namespace):
+        return self.ttls.get(namespace, DEFAULT_TTL)
+
+    def get(self, namespace, args):
+        """캐시된 값을 (찾았는지 여부, 값)으로 반환합니다."""
+        found, value = self.backend.get(make_key(namespace, args))
+        self._count("hits" if found else "misses")
+        return found, value
+
+    def set(self, namespace, args, value, ttl=None):
+        """값을 캐시에 저장합니다."""
+        evicted = self.backend.set(make_key(namespace, args), value, ttl or self.ttl_for(namespace))
+        if evicted:
+            self._count("evictions", evicted)
+
+    def get_or_load(self, namespace, args, loader, cacheable=None):
+        """캐시에 없으면 loader를 한 번만 호출해 값을 채웁니다."""
+        key = make_key(namespace, args)
+        found, value = self.backend.get(key)
+        if found:
+            self._count("hits")
+            return value
+
+        with self._lock:
+            flight = self._inflight.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._inflight[key] = _Flight()
+                self._stats["misses"] += 1
+            else:
+                self._stats["coalesced"] += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+
+        try:
+            value = loader()
+            if cacheable is None or cacheable(value):
+                evicted = self.backend.set(key, value, self.ttl_for(namespace))
+                if evicted:
+                    self._count("evictions", evicted)
+            flight.value = value
+            return value
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._inflight[key]
+            flight.done.set()
+
+    def invalidate(self, namespace, args):
+        self.backend.delete(make_key(namespace, args))
+
+    def clear(self):
+        self.backend.clear()
+
+    def stats(self):
+        """적중/미스/제거 통계를 반환합니다."""
+        with self._lock:
+            stats = dict(self._stats)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = round(stats["hits"] / lookups, 3) if lookups else 0.0
+        stats["entries"] = len(self.backend)
+        return stats
+
+    def close(self):
+        self.backend.close()
+
+
+def _is_cacheable(value):
+    # 오류 메시지(문자열)는 캐시하지 않습니다
+    return not isinstance(value, str)
+
+
+def cached(namespace, cacheable=_is_cacheable, key=None):
+    """TravelAssistant 메서드의 결과를 self.cache에 캐시하는 데코레이터입니다.
+
+    key를 주면 (self, 인자...)로 호출해 그 반환값을 캐시 키 인자로 씁니다.
+    같은 값을 여러 형태(예: 날짜 문자열과 datetime)로 받을 때 한 키로 맞추는 데 사용합니다.
+    """
+    def decorator(func):
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            bound = signature.bind(self, *args, **kwargs)
+            bound.apply_defaults()
+            if key is not None:
+                key_args = key(*bound.arguments.values())
+            else:
+                key_args = list(bound.arguments.values())[1:]
+            return self.cache.get_or_load(
+                namespace,
+                key_args,
+                lambda: func(self, *args, **kwargs),
+                cacheable=cacheable
+            )
+        return wrapper
+    return decorator
@@ -0,0 +1,115 @@
+from array import array
+from bisect import bisect_left
+from heapq import merge
+
+from pricing import Price, PriceColumn, parse_price
+
+class RestaurantIndex:
+    """맛집 검색용 역색인입니다.
+
+    평점이 높은 순서로 맛집 번호를 매기므로 도시/요리/대표 메뉴별 목록이
+    모두 평점 내림차순으로 정렬되어 있습니다. 검색은 가장 짧은 목록을 기준으로
+    나머지 목록을 이진 탐색해 교집합을 구합니다.
+    """
+
+    def __init__(self, restaurants_by_city):
+        self.source = restaurants_by_city
+        rows = [
+            (city, restaurant)
+            for city, restaurants in restaurants_by_city.items()
+            for restaurant in restaurants
+        ]
+        rows.sort(key=lambda row: (-row[1]["rating"], row[1]["name"]))
+
+        self.records = []
+        self.ratings = array("d")
+        self.prices = PriceColumn()
+        self.by_city = {}
+        self.by_cuisine = {}
+        self.by_specialty = {}
+        for restaurant_id, (city, restaurant) in enumerate(rows):
+            self.records.append(restaurant)
+            self.ratings.append(restaurant["rating"])
+            self.prices.append(parse_price(restaurant["price_range"]) or Price(0, None, "KRW"))
+            self.by_city.setdefault(city, array("l")).append(restaurant_id)
+            self.by_cuisine.setdefault(restaurant["cuisine"], array("l")).append(restaurant_id)
+            for specialty in restaurant["specialties"]:
+                postings = self.by_specialty.setdefault(specialty, array("l"))
+                if not postings or postings[-1] != restaurant_id:
+                    postings.append(restaurant_id)
+
+    def __len__(self):
+        return len(self.records)
+
+    def _cuisine_postings(self, cuisine):
+        """요리 종류를 부분 일치로 찾아 해당 목록들을 합칩니다."""
+        matches = [postings for key, postings in self.by_cuisine.items() if cuisine in key]
+        if not matches:
+            return array("l")
+        if len(matches) == 1:
+            return matches[0]
+        return array("l", merge(*matches))
+
+    def search(self, city=None, cuisine=None, specialty=None, min_price=None, max_price=None,
+               min_rating=None, offset=0, limit=None, currency="KRW"):
+        """조건에 맞는 맛집을 평점 순으로 반환합니다.
+
+        가격 조건(보조 단위)은 맛집의 가격대가 [min_price, max_price] 구간과 겹치는지로 판단합니다.
+        가격대끼리 경계 한 점만 맞닿은 것은 겹치지 않는 것으로 봅니다.
+        """
+        postings = []
+        if city is not None:
+            postings.append(self.by_city.get(city, array("l")))
+        if cuisine is not None:
+            postings.append(self._cuisine_postings(cuisine))
+        if specialty is not None:
+            postings.append(self.by_specialty.get(specialty, array("l")))
+        postings.sort(key=len)
+
+        driver = postings[0] if postings else range(len(self.records))
+        others = postings[1:]
+
+        results = []
+        skipped = 0
+        for restaurant_id in driver:
+            if min_rating is not None and self.ratings[restaurant_id] < min_rating:
+                # 평점 내림차순이므로 이후 항목은 모두 조건을 만족하지 않습니다
+                break
+            if not all(self._contains(other, restaurant_id) for other in others):
+                continue
+            if (min_price or max_price is not None) and not self.prices.overlaps(
+                restaurant_id, min_price, max_price, currency
+            ):
+                continue
+            if skipped < offset:
+                skipped += 1
+                continue
+            results.append(self.records[restaurant_id])
+            if limit is not None and len(results) >= limit:
+                break
+        return results
+
+    @staticmethod
+    def _contains(postings, restaurant_id):
+        position = bisect_left(postings, restaurant_id)
+        return position < len(postings) and postings[position] == restaurant_id
+
+
+if __name__ == "__main__":
+    # 간단한 예산 구간 검색 테스트 코드
+    from catalog import get_catalog_loader
+    from pricing import RESTAURANT_BUDGETS
+
+    index = RestaurantIndex(get_catalog_loader().get().restaurants)
+    expected = {
+        "10,000원 이하": [],
+        "10,000-30,000원": ["삼청동 수제비"],
+        "30,000-50,000원": ["을지로 양념갈비"],
+        "50,000원 이상": []
+    }
+    for label, budget in RESTAURANT_BUDGETS.items():
+        names = [restaurant["name"] for restaurant in index.search(
+            city="서울", min_price=budget.min_minor, max_price=budget.max_minor, currency=budget.currency
+        )]
+        assert names == expected[label], (label, names)
+        print(f"서울 {label}: {names}")
@@ -0,0 +1,689 @@
+import base64
+import json
+import os
+from bisect import bisect_left
+import sqlite3
+import threading
+import time
+from collections import deque
+
+from ratings import DEFAULT_HALF_LIFE_DAYS, RatingAggregate, day_number
+
+DEFAULT_STORAGE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "travel.db")
+
+# 스레드별 연결마다 미리 컴파일해 두는 SQL 문 개수
+STATEMENT_CACHE_SIZE = 64
+
+# 리뷰 정렬 방식: 최신순, 평점 높은 순
+REVIEW_ORDERS = ("newest", "rating")
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS reviews ("
+    "id INTEGER PRIMARY KEY, destination TEXT NOT NULL, user_id TEXT NOT NULL, "
+    "rating INTEGER NOT NULL, comment TEXT NOT NULL, date TEXT NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS idx_reviews_destination_date ON reviews (destination, date)",
+    "CREATE INDEX IF NOT EXISTS idx_reviews_destination_rating ON reviews (destination, rating, date)",
+    "CREATE TABLE IF NOT EXISTS rating_stats ("
+    "destination TEXT PRIMARY KEY, count INTEGER NOT NULL, total REAL NOT NULL, "
+    "star1 INTEGER NOT NULL, star2 INTEGER NOT NULL, star3 INTEGER NOT NULL, "
+    "star4 INTEGER NOT NULL, star5 INTEGER NOT NULL, "
+    "decayed_total REAL NOT NULL, decayed_weight REAL NOT NULL, decayed_at INTEGER)",
+    "CREATE TABLE IF NOT EXISTS travel_tips ("
+    "id INTEGER PRIMARY KEY, destination TEXT NOT NULL, user_id TEXT NOT NULL, "
+    "tip TEXT NOT NULL, category TEXT NOT NULL, date TEXT NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS idx_tips_destination_category ON travel_tips (destination, category)",
+    "CREATE INDEX IF NOT EXISTS idx_tips_destination ON travel_tips (destination)",
+    "CREATE TABLE IF NOT EXISTS bookings ("
+    "seq INTEGER PRIMARY KEY, id TEXT NOT NULL, destination TEXT NOT NULL, date TEXT NOT NULL, "
+    "service_type TEXT NOT NULL, details TEXT NOT NULL, status TEXT NOT NULL, created_at TEXT NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS idx_bookings_destination_date ON bookings (destination, date)",
+    "CREATE TABLE IF NOT EXISTS inventory ("
+    "destination TEXT NOT NULL, date TEXT NOT NULL, option_name TEXT NOT NULL, remaining INTEGER NOT NULL, "
+    "PRIMARY KEY (destination, date, option_name))",
+    "CREATE TABLE IF NOT EXISTS api_calls (api TEXT NOT NULL, called_at REAL NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS idx_api_calls_api_time ON api_calls (api, called_at)"
+)
+
+# 나중에 추가된 예약 열 (기존 파일에는 ALTER TABLE로 추가합니다)
+_BOOKING_MIGRATIONS = {
+    "option_name": "ALTER TABLE bookings ADD COLUMN option_name TEXT",
+    "idempotency_key": "ALTER TABLE bookings ADD COLUMN idempotency_key TEXT",
+    "check_out": "ALTER TABLE bookings ADD COLUMN check_out TEXT",
+    "units": "ALTER TABLE bookings ADD COLUMN units INTEGER"
+}
+_BOOKING_IDEMPOTENCY_INDEX = (
+    "CREATE UNIQUE INDEX IF NOT EXISTS idx_bookings_idempotency ON bookings (idempotency_key) "
+    "WHERE idempotency_key IS NOT NULL"
+)
+
+_INSERT_REVIEW = (
+    "INSERT INTO reviews (destination, user_id, rating, comment, date) VALUES (?, ?, ?, ?, ?)"
+)
+# 페이지 조회는 마지막으로 본 항목의 정렬 키 다음부터 읽습니다 (키셋 페이지네이션)
+_REVIEW_COLUMNS = "id, user_id, rating, comment, date"
+_SELECT_REVIEW_PAGES = {
+    ("newest", False): (
+        f"SELECT {_REVIEW_COLUMNS} FROM reviews WHERE destination = ? "
+        "ORDER BY date DESC, id DESC LIMIT ?"
+    ),
+    ("newest", True): (
+        f"SELECT {_REVIEW_COLUMNS} FROM reviews WHERE destination = ? AND (date, id) < (?, ?) "
+        "ORDER BY date DESC, id DESC LIMIT ?"
+    ),
+    ("rating", False): (
+        f"SELECT {_REVIEW_COLUMNS} FROM reviews WHERE destination = ? "
+        "ORDER BY rating DESC, date DESC, id DESC LIMIT ?"
+    ),
+    ("rating", True): (
+        f"SELECT {_REVIEW_COLUMNS} FROM reviews WHERE destination = ? AND (rating, date, id) < (?, ?, ?) "
+        "ORDER BY rating DESC, date DESC, id DESC LIMIT ?"
+    )
+}
+_SELECT_RATING_STATS = (
+    "SELECT count, total, star1, star2, star3, star4, star5, decayed_total, decayed_weight, decayed_at "
+    "FROM rating_stats WHERE destination = ?"
+)
+_UPSERT_RATING_STATS = (
+    "INSERT OR REPLACE INTO rating_stats (destination, count, total, star1, star2, star3, star4, star5, "
+    "decayed_total, decayed_weight, decayed_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+)
+_SELECT_ALL_RATING_STATS = (
+    "SELECT destination, count, total, star1, star2, star3, star4, star5, decayed_total, decayed_weight, "
+    "decayed_at FROM rating_stats"
+)
+_SELECT_RATINGS = "SELECT destination, rating, date FROM reviews ORDER BY destination, date, id"
+_SELECT_DESTINATION_RATINGS = "SELECT destination, rating, date FROM reviews WHERE destination = ? ORDER BY date, id"
+_INSERT_TIP = (
+    "INSERT INTO travel_tips (destination, user_id, tip, category, date) VALUES (?, ?, ?, ?, ?)"
+)
+_TIP_COLUMNS = "id, user_id, tip, category, date"
+_SELECT_TIP_PAGES = {
+    (False, False): (
+        f"SELECT {_TIP_COLUMNS} FROM travel_tips WHERE destination = ? ORDER BY id DESC LIMIT ?"
+    ),
+    (False, True): (
+        f"SELECT {_TIP_COLUMNS} FROM travel_tips WHERE destination = ? AND id < ? ORDER BY id DESC LIMIT ?"
+    ),
+    (True, False): (
+        f"SELECT {_TIP_COLUMNS} FROM travel_tips WHERE destination = ? AND category = ? "
+        "ORDER BY id DESC LIMIT ?"
+    ),
+    (True, True): (
+        f"SELECT {_TIP_COLUMNS} FROM travel_tips WHERE destination = ? AND category = ? AND id < ? "
+        "ORDER BY id DESC LIMIT ?"
+    )
+}
+_INSERT_BOOKING = (
+    "INSERT INTO bookings (id, destination, date, service_type, details, status, created_at, "
+    "option_name, check_out, units, idempotency_key) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+)
+_BOOKING_COLUMNS = (
+    "id, destination, date, service_type, details, status, created_at, option_name, check_out, units"
+)
+_SELECT_BOOKING_BY_KEY = f"SELECT {_BOOKING_COLUMNS} FROM bookings WHERE idempotency_key = ?"
+_SEED_INVENTORY = (
+    "INSERT OR IGNORE INTO inventory (destination, date, option_name, remaining) VALUES (?, ?, ?, ?)"
+)
+_DECREMENT_INVENTORY = (
+    "UPDATE inventory SET remaining = remaining - ? "
+    "WHERE destination = ? AND date = ? AND option_name = ? AND remaining >= ?"
+)
+_SELECT_INVENTORY = (
+    "SELECT option_name, remaining FROM inventory WHERE destination = ? AND date = ?"
+)
+_SELECT_EXHAUSTED = (
+    "SELECT DISTINCT option_name FROM inventory "
+    "WHERE destination = ? AND date IN ({dates}) AND remaining <= 0"
+)
+_DELETE_EXPIRED_CALLS = "DELETE FROM api_calls WHERE api = ? AND called_at <= ?"
+_COUNT_CALLS = "SELECT COUNT(*) FROM api_calls WHERE api = ? AND called_at > ?"
+_INSERT_CALL = "INSERT INTO api_calls (api, called_at) VALUES (?, ?)"
+_SELECT_BOOKINGS = f"SELECT {_BOOKING_COLUMNS} FROM bookings WHERE destination = ? ORDER BY seq"
+_SELECT_ALL_BOOKINGS = f"SELECT {_BOOKING_COLUMNS} FROM bookings ORDER BY seq"
+
+
+def _review_row(destination, review):
+    return (destination, review["user_id"], review["rating"], review["comment"], review["date"])
+
+
+def encode_cursor(key):
+    """정렬 키를 화면에 넘길 수 있는 불투명한 커서 문자열로 바꿉니다."""
+    raw = json.dumps(list(key), ensure_ascii=False, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor):
+    """커서 문자열을 정렬 키로 되돌립니다. 잘못된 커서면 ValueError를 발생시킵니다."""
+    try:
+        key = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+    except (ValueError, UnicodeError) as e:
+        raise ValueError(f"잘못된 커서입니다: {cursor}") from e
+    if not isinstance(key, list):
+        raise ValueError(f"잘못된 커서입니다: {cursor}")
+    return tuple(key)
+
+
+def _page_size(limit):
+    return max(1, min(MAX_PAGE_SIZE, limit or DEFAULT_PAGE_SIZE))
+
+
+def _review_key(order, review_id, review):
+    if order == "rating":
+        return (review["rating"], review["date"], review_id)
+    return (review["date"], review_id)
+
+
+def _check_order(order):
+    if order not in REVIEW_ORDERS:
+        raise ValueError(f"지원하지 않는 정렬 방식입니다: {order}")
+
+
+def _half_life_from_env():
+    return float(os.getenv("RATING_HALF_LIFE_DAYS", str(DEFAULT_HALF_LIFE_DAYS)))
+
+
+def _aggregate_ratings(rows, half_life):
+    """(여행지, 평점, 작성일) 행으로 여행지별 평점 집계를 새로 계산합니다."""
+    aggregates = {}
+    for destination, rating, review_date in rows:
+        aggregate = aggregates.get(destination)
+        if aggregate is None:
+            aggregate = aggregates[destination] = RatingAggregate(half_life=half_life)
+        aggregate.add(rating, day_number(review_date))
+    return aggregates
+
+
+def _compare_aggregates(stored, actual):
+    """저장된 집계와 원본 기준 집계가 다른 여행지를 반환합니다."""
+    mismatches = {}
+    for destination in set(stored) | set(actual):
+        expected = actual.get(destination) or RatingAggregate()
+        found = stored.get(destination) or RatingAggregate()
+        if not found.matches(expected):
+            mismatches[destination] = {"stored": found.summary(), "actual": expected.summary()}
+    return mismatches
+
+
+def _tip_row(destination, tip):
+    return (destination, tip["user_id"], tip["tip"], tip["category"], tip["date"])
+
+
+def _booking_row(booking, idempotency_key=None):
+    return (
+        booking["id"], booking["destination"], str(booking["date"]), booking["service_type"],
+        json.dumps(booking["details"], ensure_ascii=False), booking["status"], booking["created_at"],
+        booking.get("option"), booking.get("check_out"), booking.get("units", 1), idempotency_key
+    )
+
+
+def _booking_from_row(row):
+    booking_id, destination, date, service_type, details, status, created_at, option, check_out, units = row
+    return {
+        "id": booking_id,
+        "destination": destination,
+        "date": date,
+        "service_type": service_type,
+        "details": json.loads(details),
+        "status": status,
+        "created_at": created_at,
+        "option": option,
+        "check_out": check_out,
+        # units 열이 생기기 전의 예약은 한 개씩 차감했습니다
+        "units": units if units is not None else 1
+    }
+
+
+class _LockStripes:
+    """키를 해시해 고정된 개수의 잠금 중 하나를 고릅니다. 키마다 잠금을 만들지 않아도 됩니다."""
+
+    def __init__(self, count=64):
+        self._locks = [threading.Lock() for _ in range(count)]
+
+    def __call__(self, key):
+        return self._locks[hash(key) % len(self._locks)]
+
+
+class _SortedPosting:
+    """정렬 키 순서로 유지되는 목록입니다. 커서 이전 항목을 큰 키부터 잘라 읽습니다."""
+
+    __slots__ = ("keys", "items")
+
+    def __init__(self):
+        self.keys = []
+        self.items = []
+
+    def add(self, key, item):
+        position = bisect_left(self.keys, key)
+        self.keys.insert(position, key)
+        self.items.insert(position, item)
+
+    def page(self, cursor_key, limit):
+        """cursor_key보다 작은 항목을 내림차순으로 limit개 반환합니다."""
+        end = len(self.keys) if cursor_key is None else bisect_left(self.keys, cursor_key)
+        start = max(0, end - limit)
+        items = self.items[start:end][::-1]
+        next_key = self.keys[start] if start > 0 else None
+        return items, next_key
+
+
+class MemoryStorage:
+    """프로세스 메모리에 리뷰, 팁, 예약을 보관하는 저장소입니다. 재시작하면 사라집니다."""
+
+    def __init__(self, half_life=None):
+        self.half_life = half_life or _half_life_from_env()
+        self._lock = threading.Lock()
+        self._reviews = {}
+        self._review_pages = {}
+        self._ratings = {}
+        self._next_id = 1
+        self._tips = {}
+        self._tips_by_category = {}
+        self._bookings = {}
+        self._bookings_by_key = {}
+        # 재고는 여행지별 잠금으로 보호해 다른 여행지 예약과 서로 기다리지 않게 합니다
+        self._inventory = {}
+        self._destination_lock = _LockStripes()
+        self._api_calls = {}
+
+    def add_reviews(self, destination, reviews):
+        with self._lock:
+            aggregate = self._ratings.get(destination)
+            if aggregate is None:
+                aggregate = self._ratings[destination] = RatingAggregate(half_life=self.half_life)
+            pages = self._review_pages.setdefault(destination, {order: _SortedPosting() for order in REVIEW_ORDERS})
+            for review in reviews:
+                review = dict(review)
+                review_id = self._next_id
+                self._next_id += 1
+                self._reviews.setdefault(destination, []).append(review)
+                for order, posting in pages.items():
+                    posting.add(_review_key(order, review_id, review), review)
+                aggregate.add(review["rating"], day_number(review["date"]))
+
+    def page_reviews(self, destination, order="newest", cursor=None, limit=None):
+        _check_order(order)
+        cursor_key = decode_cursor(cursor) if cursor else None
+        with self._lock:
+            pages = self._review_pages.get(destination)
+            if pages is None:
+                return [], None
+            items, next_key = pages[order].page(cursor_key, _page_size(limit))
+        return [dict(item) for item in items], encode_cursor(next_key) if next_key else None
+
+    def _rating_rows(self, destination=None):
+        destinations = [destination] if destination else list(self._reviews)
+        rows = [
+            (dest, review["rating"], review["date"])
+            for dest in destinations
+            for review in self._reviews.get(dest, [])
+        ]
+        rows.sort(key=lambda row: (row[0], row[2]))
+        return rows
+
+    def rating_summary(self, destination):
+        with self._lock:
+            aggregate = self._ratings.get(destination)
+            return aggregate.summary() if aggregate else RatingAggregate().summary()
+
+    def average_rating(self, destination):
+        with self._lock:
+            aggregate = self._ratings.get(destination)
+            return aggregate.mean if aggregate else 0
+
+    def rebuild_rating_stats(self, destination=None):
+        with self._lock:
+            aggregates = _aggregate_ratings(self._rating_rows(destination), self.half_life)
+            if destination:
+                self._ratings.pop(destination, None)
+            else:
+                self._ratings.clear()
+            self._ratings.update(aggregates)
+        return len(aggregates)
+
+    def check_rating_stats(self):
+        with self._lock:
+            actual = _aggregate_ratings(self._rating_rows(), self.half_life)
+            return _compare_aggregates(self._ratings, actual)
+
+    def add_tips(self, destination, tips):
+        with self._lock:
+            for tip in tips:
+                tip = dict(tip)
+                tip_id = self._next_id
+                self._next_id += 1
+                self._tips.setdefault(destination, _SortedPosting()).add((tip_id,), tip)
+                # 카테고리별 목록을 따로 두어 필터 조회가 전체 목록을 훑지 않게 합니다
+                self._tips_by_category.setdefault((destination, tip["category"]), _SortedPosting()).add((tip_id,), tip)
+
+    def page_tips(self, destination, category=None, cursor=None, limit=None):
+        cursor_key = decode_cursor(cursor) if cursor else None
+        with self._lock:
+            posting = self._tips_by_category.get((destination, category)) if category else self._tips.get(destination)
+            if posting is None:
+                return [], None
+            items, next_key = posting.page(cursor_key, _page_size(limit))
+        return [dict(item) for item in items], encode_cursor(next_key) if next_key else None
+
+    def add_bookings(self, bookings):
+        with self._lock:
+            for booking in bookings:
+                self._bookings.setdefault(booking["destination"], []).append(dict(booking))
+
+    def remaining_inventory(self, destination, date, capacities):
+        with self._destination_lock(destination):
+            counts = self._inventory.get((destination, str(date)), {})
+            return {option: counts.get(option, capacity) for option, capacity in capacities.items()}
+
+    def find_booking(self, idempotency_key):
+        with self._lock:
+            booking = self._bookings_by_key.get(idempotency_key)
+        return dict(booking) if booking is not None else None
+
+    def exhausted_options(self, destination, dates):
+        exhausted = set()
+        with self._destination_lock(destination):
+            for day in dates:
+                counts = self._inventory.get((destination, str(day)), {})
+                exhausted.update(option for option, remaining in counts.items() if remaining <= 0)
+        return exhausted
+
+    def reserve_booking(self, booking, capacity, idempotency_key=None, dates=None):
+        destination = booking["destination"]
+        option = booking["option"]
+        units = booking.get("units", 1)
+        with self._destination_lock(destination):
+            nights = [
+                self._inventory.setdefault((destination, str(day)), {})
+                for day in (dates or [booking["date"]])
+            ]
+            if idempotency_key:
+                with self._lock:
+                    existing = self._bookings_by_key.get(idempotency_key)
+                if existing is not None:
+                    return dict(existing), False
+            # 하룻밤이라도 남은 재고가 없으면 아무 날짜도 차감하지 않습니다
+            remaining = [counts.get(option, capacity) for counts in nights]
+            if min(remaining) < units:
+                return None, False
+            for counts, count in zip(nights, remaining):
+                counts[option] = count - units
+            with self._lock:
+                existing = self._bookings_by_key.get(idempotency_key) if idempotency_key else None
+                if existing is None:
+                    booking = dict(booking)
+                    self._bookings.setdefault(destination, []).append(booking)
+                    if idempotency_key:
+                        self._bookings_by_key[idempotency_key] = booking
+            if existing is not None:
+                # 같은 키로 다른 여행지 예약이 먼저 끝난 경우 차감한 재고를 되돌립니다
+                for counts, count in zip(nights, remaining):
+                    counts[option] = count
+                return dict(existing), False
+        return dict(booking), True
+
+    def _recent_calls(self, api, period, now):
+        calls = self._api_calls.setdefault(api, deque())
+        while calls and calls[0] <= now - period:
+            calls.popleft()
+        return calls
+
+    def acquire_quota(self, api, limit, period):
+        with self._lock:
+            now = time.time()
+            calls = self._recent_calls(api, period, now)
+            if len(calls) >= limit:
+                return False
+            calls.append(now)
+            return True
+
+    def quota_used(self, api, period):
+        with self._lock:
+            return len(self._recent_calls(api, period, time.time()))
+
+    def get_bookings(self, destination=None):
+        with self._lock:
+            if destination:
+                return list(self._bookings.get(destination, []))
+            return {dest: list(items) for dest, items in self._bookings.items()}
+
+    def close(self):
+        pass
+
+
+class SQLiteStorage:
+    """WAL 모드 SQLite 파일에 리뷰, 팁, 예약을 보관하는 저장소입니다.
+
+    스레드마다 연결을 하나씩 두고 재사용하며, SQL 문은 연결별 문장 캐시에서
+    미리 컴파일된 상태로 재사용됩니다. 여러 워커 프로세스가 같은 파일을 함께 쓸 수 있습니다.
+    """
+
+    def __init__(self, path, half_life=None):
+        self.path = path
+        self.half_life = half_life or _half_life_from_env()
+        self._local = threading.local()
+        self._connections = []
+        self._connections_lock = threading.Lock()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        conn = self._connection()
+        with conn:
+            for statement in _SCHEMA:
+                conn.execute(statement)
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(bookings)")}
+            for column, statement in _BOOKING_MIGRATIONS.items():
+                if column not in columns:
+                    conn.execute(statement)
+            conn.execute(_BOOKING_IDEMPOTENCY_INDEX)
+        # 집계 테이블이 생기기 전에 쌓인 리뷰는 한 번만 다시 집계합니다
+        has_reviews = conn.execute("SELECT 1 FROM reviews LIMIT 1").fetchone()
+        has_stats = conn.execute("SELECT 1 FROM rating_stats LIMIT 1").fetchone()
+        if has_reviews and not has_stats:
+            self.rebuild_rating_stats()
+
+    def _connection(self):
+        """스레드마다 하나의 연결을 사용합니다."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(
+                self.path, timeout=5, check_same_thread=False, cached_statements=STATEMENT_CACHE_SIZE
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            with self._connections_lock:
+                self._connections.append(conn)
+        return conn
+
+    def _insert_many(self, statement, rows):
+        conn = self._connection()
+        with conn:
+            conn.executemany(statement, rows)
+
+    def add_reviews(self, destination, reviews):
+        rows = [_review_row(destination, review) for review in reviews]
+        conn = self._connection()
+        with conn:
+            # 다른 프로세스와 집계를 동시에 갱신하지 않도록 쓰기 잠금을 먼저 잡습니다
+            conn.execute("BEGIN IMMEDIATE")
+            conn.executemany(_INSERT_REVIEW, rows)
+            aggregate = self._load_aggregate(conn, destination)
+            for review in reviews:
+                aggregate.add(review["rating"], day_number(review["date"]))
+            conn.execute(_UPSERT_RATING_STATS, self._aggregate_row(destination, aggregate))
+
+    def page_reviews(self, destination, order="newest", cursor=None, limit=None):
+        """리뷰 한 페이지와 다음 페이지 커서를 반환합니다. 마지막 페이지면 커서는 None입니다."""
+        _check_order(order)
+        cursor_key = decode_cursor(cursor) if cursor else ()
+        size = _page_size(limit)
+        statement = _SELECT_REVIEW_PAGES[(order, bool(cursor_key))]
+        # 다음 페이지가 있는지 알기 위해 한 건 더 읽습니다
+        rows = self._connection().execute(statement, (destination, *cursor_key, size + 1)).fetchall()
+        reviews = []
+        next_key = None
+        for review_id, user_id, rating, comment, date in rows[:size]:
+            review = {"user_id": user_id, "rating": rating, "comment": comment, "date": date}
+            reviews.append(review)
+            next_key = _review_key(order, review_id, review)
+        return reviews, encode_cursor(next_key) if len(rows) > size else None
+
+    def _aggregate_from_row(self, row):
+        count, total, star1, star2, star3, star4, star5, decayed_total, decayed_weight, decayed_at = row
+        return RatingAggregate(
+            count, total, [star1, star2, star3, star4, star5],
+            decayed_total, decayed_weight, decayed_at, self.half_life
+        )
+
+    @staticmethod
+    def _aggregate_row(destination, aggregate):
+        return (
+            destination, aggregate.count, aggregate.total, *aggregate.histogram,
+            aggregate.decayed_total, aggregate.decayed_weight, aggregate.decayed_at
+        )
+
+    def _load_aggregate(self, conn, destination):
+        row = conn.execute(_SELECT_RATING_STATS, (destination,)).fetchone()
+        if row is None:
+            return RatingAggregate(half_life=self.half_life)
+        return self._aggregate_from_row(row)
+
+    def rating_summary(self, destination):
+        return self._load_aggregate(self._connection(), destination).summary()
+
+    def average_rating(self, destination):
+        return self._load_aggregate(self._connection(), destination).mean
+
+    def rebuild_rating_stats(self, destination=None):
+        """원본 리뷰로 평점 집계를 다시 계산합니다. 다시 계산한 여행지 수를 반환합니다."""
+        conn = self._connection()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            if destination:
+                rows = conn.execute(_SELECT_DESTINATION_RATINGS, (destination,)).fetchall()
+                conn.execute("DELETE FROM rating_stats WHERE destination = ?", (destination,))
+            else:
+                rows = conn.execute(_SELECT_RATINGS).fetchall()
+                conn.execute("DELETE FROM rating_stats")
+            aggregates = _aggregate_ratings(rows, self.half_life)
+            conn.executemany(
+                _UPSERT_RATING_STATS,
+                [self._aggregate_row(dest, aggregate) for dest, aggregate in aggregates.items()]
+            )
+        return len(aggregates)
+
+    def check_rating_stats(self):
+        """저장된 집계와 원본 리뷰가 어긋난 여행지를 반환합니다."""
+        conn = self._connection()
+        stored = {row[0]: self._aggregate_from_row(row[1:]) for row in conn.execute(_SELECT_ALL_RATING_STATS)}
+        actual = _aggregate_ratings(conn.execute(_SELECT_RATINGS), self.half_life)
+        return _compare_aggregates(stored, actual)
+
+    def add_tips(self, destination, tips):
+        self._insert_many(_INSERT_TIP, [_tip_row(destination, tip) for tip in tips])
+
+    def page_tips(self, destination, category=None, cursor=None, limit=None):
+        """여행 팁 한 페이지(최신순)와 다음 페이지 커서를 반환합니다."""
+        cursor_key = decode_cursor(cursor) if cursor else ()
+        size = _page_size(limit)
+        statement = _SELECT_TIP_PAGES[(bool(category), bool(cursor_key))]
+        params = (destination, category) if category else (destination,)
+        rows = self._connection().execute(statement, (*params, *cursor_key, size + 1)).fetchall()
+        tips = [
+            {"user_id": user_id, "tip": tip, "category": tip_category, "date": date}
+            for _, user_id, tip, tip_category, date in rows[:size]
+        ]
+        next_cursor = encode_cursor((rows[size - 1][0],)) if len(rows) > size else None
+        return tips, next_cursor
+
+    def add_bookings(self, bookings):
+        self._insert_many(_INSERT_BOOKING, [_booking_row(booking) for booking in bookings])
+
+    def remaining_inventory(self, destination, date, capacities):
+        """옵션별 남은 수량을 반환합니다. 아직 예약이 없는 옵션은 capacities 값 그대로입니다."""
+        rows = dict(self._connection().execute(_SELECT_INVENTORY, (destination, str(date))).fetchall())
+        return {option: rows.get(option, capacity) for option, capacity in capacities.items()}
+
+    def find_booking(self, idempotency_key):
+        """idempotency_key로 만든 예약을 찾습니다. 없으면 None입니다."""
+        row = self._connection().execute(_SELECT_BOOKING_BY_KEY, (idempotency_key,)).fetchone()
+        return _booking_from_row(row) if row is not None else None
+
+    def exhausted_options(self, destination, dates):
+        """주어진 날짜 중 하루라도 재고가 모두 팔린 옵션 이름 집합을 반환합니다."""
+        dates = [str(day) for day in dates]
+        statement = _SELECT_EXHAUSTED.format(dates=", ".join("?" * len(dates)))
+        return {row[0] for row in self._connection().execute(statement, (destination, *dates))}
+
+    def reserve_booking(self, booking, capacity, idempotency_key=None, dates=None):
+        """dates(없으면 예약 날짜 하루)의 재고를 예약의 units(없으면 1)개씩 차감하고 예약을 저장합니다.
+
+        (예약, 새로 만들었는지 여부)를 반환합니다. 같은 idempotency_key의 예약이 이미 있으면
+        재고를 건드리지 않고 기존 예약을 돌려주며, 하룻밤이라도 남은 재고가 units개보다 적으면
+        아무 날짜도 차감하지 않고 (None, False)입니다.
+        """
+        dates = [str(day) for day in (dates or [booking["date"]])]
+        conn = self._connection()
+        with conn:
+            # 쓰기 잠금을 먼저 잡아 확인/차감/저장이 다른 프로세스와 섞이지 않게 합니다
+            conn.execute("BEGIN IMMEDIATE")
+            if idempotency_key:
+                row = conn.execute(_SELECT_BOOKING_BY_KEY, (idempotency_key,)).fetchone()
+                if row is not None:
+                    return _booking_from_row(row), False
+            units = booking.get("units", 1)
+            for date in dates:
+                slot = (booking["destination"], date, booking["option"])
+                conn.execute(_SEED_INVENTORY, (*slot, capacity))
+                if conn.execute(_DECREMENT_INVENTORY, (units, *slot, units)).rowcount == 0:
+                    # 앞서 차감한 날짜까지 모두 되돌립니다
+                    conn.rollback()
+                    return None, False
+            conn.execute(_INSERT_BOOKING, _booking_row(booking, idempotency_key))
+        return dict(booking), True
+
+    def acquire_quota(self, api, limit, period):
+        """최근 period초 동안 api 호출이 limit회 미만이면 한 번을 기록하고 True를 반환합니다.
+
+        같은 파일을 쓰는 모든 워커 프로세스가 한도를 함께 쓰고, 재시작해도 기록이 남습니다.
+        """
+        conn = self._connection()
+        with conn:
+            # 확인과 기록 사이에 다른 프로세스가 끼어들지 않도록 쓰기 잠금을 먼저 잡습니다
+            conn.execute("BEGIN IMMEDIATE")
+            now = time.time()
+            conn.execute(_DELETE_EXPIRED_CALLS, (api, now - period))
+            if conn.execute(_COUNT_CALLS, (api, now - period)).fetchone()[0] >= limit:
+                return False
+            conn.execute(_INSERT_CALL, (api, now))
+        return True
+
+    def quota_used(self, api, period):
+        """최근 period초 동안 기록된 api 호출 수입니다."""
+        return self._connection().execute(_COUNT_CALLS, (api, time.time() - period)).fetchone()[0]
+
+    def get_bookings(self, destination=None):
+        conn = self._connection()
+        if destination:
+            return [_booking_from_row(row) for row in conn.execute(_SELECT_BOOKINGS, (destination,))]
+        grouped = {}
+        for row in conn.execute(_SELECT_ALL_BOOKINGS):
+            booking = _booking_from_row(row)
+            grouped.setdefault(booking["destination"], []).append(booking)
+        return grouped
+
+    def close(self):
+        with self._connections_lock:
+            connections = list(self._connections)
+            self._connections.clear()
+        for conn in connections:
+            conn.close()
+        self._local = threading.local()
+
+
+def open_storage():
+    """환경 변수 설정에 맞는 저장소를 생성합니다."""
+    if os.getenv("STORAGE_BACKEND", "sqlite").lower() == "memory":
+        return MemoryStorage()
+    return SQLiteStorage(os.getenv("STORAGE_PATH", DEFAULT_STORAGE_PATH))
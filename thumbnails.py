@@ -0,0 +1,264 @@
+import hashlib
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from io import BytesIO
+
+from PIL import Image
+
+DEFAULT_SIZE = (400, 300)
+DEFAULT_QUALITY = 85
+DEFAULT_MAX_MB = 256
+DEFAULT_DOWNLOAD_WORKERS = 4
+
+
+def render_thumbnail(data, size=DEFAULT_SIZE, quality=DEFAULT_QUALITY):
+    """원본 이미지 바이트로 JPEG 썸네일 바이트를 만듭니다."""
+    img = Image.open(BytesIO(data))
+    # JPEG는 디코딩 단계에서 축소해 큰 원본을 전부 풀지 않습니다
+    img.draft("RGB", size)
+    img.thumbnail(size, Image.LANCZOS)
+    if img.mode not in ("RGB", "L"):
+        img = img.convert("RGB")
+    buffered = BytesIO()
+    img.save(buffered, format="JPEG", quality=quality)
+    return buffered.getvalue()
+
+
+class ThumbnailService:
+    """사진 썸네일을 만들고 URL과 크기/품질 기준으로 디스크에 캐시합니다."""
+
+    def __init__(self, http_client, cache_dir=None, max_bytes=None,
+                 size=DEFAULT_SIZE, quality=DEFAULT_QUALITY):
+        self.http = http_client
+        self.cache_dir = cache_dir or os.getenv(
+            "THUMBNAIL_CACHE_DIR",
+            os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "thumbnails")
+        )
+        if max_bytes is None:
+            max_bytes = int(float(os.getenv("THUMBNAIL_CACHE_MAX_MB", str(DEFAULT_MAX_MB))) * 1024 * 1024)
+        self.max_bytes = max_bytes
+        self.size = tuple(size)
+        self.quality = quality
+        self._lock = threading.Lock()
+        self._files = {}
+        self.total_bytes = 0
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0, "timeouts": 0}
+        self._process_pool = None
+        self.process_workers = int(os.getenv("THUMBNAIL_WORKERS", str(min(4, os.cpu_count() or 1))))
+        # 썸네일 다운로드 전용 스레드 풀 (오래 걸리는 다운로드가 다른 I/O 작업의 스레드를 차지하지 않도록 분리)
+        self._download_pool = None
+        self.download_workers = int(os.getenv("THUMBNAIL_DOWNLOAD_WORKERS", str(DEFAULT_DOWNLOAD_WORKERS)))
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self._scan()
+
+    def _scan(self):
+        """기존 캐시 파일의 크기를 읽어 용량을 집계합니다."""
+        for root, _, names in os.walk(self.cache_dir):
+            for name in names:
+                if name.endswith(".jpg"):
+                    path = os.path.join(root, name)
+                    size = os.path.getsize(path)
+                    self._files[path] = size
+                    self.total_bytes += size
+
+    @staticmethod
+    def cache_key(url, size, quality):
+        """URL과 썸네일 설정으로 캐시 키를 만듭니다."""
+        raw = f"{url}|{size[0]}x{size[1]}|q{quality}"
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, key[:2], key + ".jpg")
+
+    def _count(self, name, amount=1):
+        with self._lock:
+            self._stats[name] += amount
+
+    def _get_process_pool(self):
+        """디코딩/리사이즈용 프로세스 풀을 필요할 때 생성합니다."""
+        with self._lock:
+            if self._process_pool is None:
+                # 멀티스레드 프로세스에서 fork하지 않도록 spawn을 사용합니다
+                self._process_pool = ProcessPoolExecutor(
+                    max_workers=self.process_workers,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._process_pool
+
+    def _get_download_pool(self):
+        """썸네일 다운로드용 스레드 풀을 필요할 때 생성합니다."""
+        with self._lock:
+            if self._download_pool is None:
+                self._download_pool = ThreadPoolExecutor(
+                    max_workers=self.download_workers,
+                    thread_name_prefix="thumbnail-download"
+                )
+            return self._download_pool
+
+    def get(self, url, size=None, quality=None, use_process_pool=False):
+        """썸네일 JPEG 바이트를 반환합니다. 캐시에 있으면 디코딩 없이 그대로 반환합니다."""
+        size = tuple(size or self.size)
+        quality = quality or self.quality
+        path = self._path(self.cache_key(url, size, quality))
+        data = self._read(path)
+        if data is not None:
+            self._count("hits")
+            return data
+
+        self._count("misses")
+        response = self.http.get(url)
+        response.raise_for_status()
+        if use_process_pool:
+            data = self._get_process_pool().submit(render_thumbnail, response.content, size, quality).result()
+        else:
+            data = render_thumbnail(response.content, size, quality)
+        self._write(path, data)
+        return data
+
+    def _get_started(self, url, size, quality, index, started, abandoned):
+        """다운로드를 시작한 시각을 started[index]에 기록하고 썸네일을 만듭니다."""
+        # 기다리는 동안 호출한 쪽이 포기했다면 다운로드하지 않습니다
+        if abandoned.is_set():
+            return None
+        started[index] = time.monotonic()
+        return self.get(url, size, quality, True)
+
+    def get_many(self, urls, timeout=None, size=None, quality=None):
+        """여러 썸네일을 동시에 만듭니다.
+
+        다운로드는 썸네일 전용 스레드 풀에서, 디코딩/리사이즈/인코딩은 프로세스 풀에서 실행합니다.
+        전용 풀은 download_workers개로 제한되어 있어 큰 갤러리도 다른 I/O 작업을 막지 않습니다.
+        결과는 입력 순서대로 반환하며 실패하거나 제한 시간을 넘긴 항목은 None입니다.
+        제한 시간은 이미지마다 그 이미지의 다운로드가 시작된 때부터 잽니다. 이미 실행 중인 작업은
+        멈출 수 없으므로 기다리지 않고 버리며, 끝나면 캐시에만 남습니다.
+        """
+        started = {}
+        abandoned = threading.Event()
+        executor = self._get_download_pool()
+        futures = [
+            executor.submit(self._get_started, url, size, quality, index, started, abandoned)
+            for index, url in enumerate(urls)
+        ]
+        results = [None] * len(futures)
+        pending = dict(enumerate(futures))
+        seen_started = set()
+        last_progress = time.monotonic()
+        while pending:
+            now = time.monotonic()
+            newly_started = (set(started) & set(pending)) - seen_started
+            if newly_started:
+                seen_started |= newly_started
+                last_progress = now
+
+            waits = []
+            for index in list(pending):
+                if index in started and timeout is not None and not pending[index].done():
+                    left = started[index] + timeout - now
+                    if left <= 0:
+                        # 실행 중인 작업은 cancel()로 멈추지 않으므로 결과를 기다리지 않고 넘어갑니다
+                        del pending[index]
+                        self._count("timeouts")
+                        continue
+                    waits.append(left)
+            if not pending:
+                break
+
+            if timeout is not None and not waits:
+                # 이 배치의 작업이 모두 대기열에 있고 timeout 동안 아무 진전이 없으면 나머지를 포기합니다
+                left = last_progress + timeout - now
+                if left <= 0:
+                    abandoned.set()
+                    for future in pending.values():
+                        future.cancel()
+                    self._count("timeouts", len(pending))
+                    break
+                waits.append(left)
+
+            done, _ = wait(pending.values(), timeout=min(waits) if waits else None, return_when=FIRST_COMPLETED)
+            for index, future in list(pending.items()):
+                if future not in done:
+                    continue
+                del pending[index]
+                last_progress = time.monotonic()
+                try:
+                    results[index] = future.result()
+                except Exception as e:
+                    print(f"Error creating thumbnail: {str(e)}")
+        return results
+
+    def _read(self, path):
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            return None
+        # 최근 사용 시각을 갱신해 제거 순서에 반영합니다
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return data
+
+    def _write(self, path, data):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+        with self._lock:
+            self.total_bytes += len(data) - self._files.get(path, 0)
+            self._files[path] = len(data)
+            over_limit = self.total_bytes > self.max_bytes
+        if over_limit:
+            self._evict()
+
+    def _evict(self):
+        """오래 사용하지 않은 파일부터 용량 제한의 90% 아래로 내려갈 때까지 삭제합니다."""
+        with self._lock:
+            paths = list(self._files)
+        entries = []
+        for path in paths:
+            try:
+                entries.append((os.path.getmtime(path), path))
+            except OSError:
+                entries.append((0, path))
+        entries.sort()
+
+        target = self.max_bytes * 0.9
+        evicted = 0
+        for _, path in entries:
+            with self._lock:
+                if self.total_bytes <= target:
+                    break
+                size = self._files.pop(path, None)
+                if size is None:
+                    continue
+                self.total_bytes -= size
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            evicted += 1
+        if evicted:
+            self._count("evictions", evicted)
+
+    def close(self):
+        """다운로드 스레드 풀과 프로세스 풀을 종료합니다."""
+        with self._lock:
+            pools = (self._download_pool, self._process_pool)
+            self._download_pool = None
+            self._process_pool = None
+        for pool in pools:
+            if pool is not None:
+                pool.shutdown(wait=False)
+
+    def stats(self):
+        """적중/미스/제거 통계와 사용 용량을 반환합니다."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["entries"] = len(self._files)
+            stats["total_bytes"] = self.total_bytes
+        return stats
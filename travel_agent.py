@@ -1,17 +1,39 @@
 import os
 from dotenv import load_dotenv
-import requests
 from datetime import datetime, timedelta
 import json
 import base64
-from io import BytesIO
-from PIL import Image
+import asyncio
+import functools
+from itertools import islice
+from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FutureTimeoutError
+from http_client import HttpClient
+from response_cache import ResponseCache, cached
+from thumbnails import ThumbnailService
+from catalog import get_catalog_loader
+from restaurant_index import RestaurantIndex
+from attraction_index import AttractionIndex
+from destination_resolver import DestinationResolver, resolves_destination
+from autocomplete import Autocomplete
+from geo import DEFAULT_RADIUS_KM, get_geo_dataset
+from itinerary import ItineraryScheduler, trip_dates
+from fx import FxEngine
+from pricing import parse_price
+from storage import open_storage
+from availability import nights
+from booking import BookingService, SoldOutError, rooms_for
+from refresher import BackgroundRefresher, QuotaBudget, SnapshotStore, StaleResult, WEATHER_QUOTA, EXCHANGE_QUOTA
 
 # 환경 변수 로드
 load_dotenv()
 
+# 환율 정보에 함께 보여 줄 통화
+DISPLAY_CURRENCIES = ("KRW", "USD", "EUR", "JPY", "CNY")
+# 백그라운드 갱신 시 미리 가져오는 날씨 기간 (오늘부터 5일 예보 범위)
+WEATHER_PREFETCH_DAYS = 5
+
 class TravelAssistant:
-    def __init__(self):
+    def __init__(self, http_client=None, cache=None, storage=None):
         # API 키 설정
         self.weather_api_key = os.getenv("WEATHER_API_KEY")
         self.unsplash_api_key = os.getenv("UNSPLASH_API_KEY")
@@ -20,11 +42,91 @@ class TravelAssistant:
         self.exchange_api_key = os.getenv("EXCHANGE_API_KEY")
         self.naver_client_id = os.getenv("NAVER_CLIENT_ID")
         self.naver_client_secret = os.getenv("NAVER_CLIENT_SECRET")
-        # 리뷰 데이터 저장소 (실제로는 데이터베이스를 사용하는 것이 좋습니다)
-        self.reviews = {}
-        self.travel_tips = {}
-        self.bookings = {}
+        # 모든 외부 호출이 공유하는 HTTP 클라이언트
+        self.http = http_client or HttpClient()
+        # 날씨/환율/이벤트 응답 캐시
+        self.cache = cache or ResponseCache.from_env()
+        # 정적 참조 데이터 카탈로그 (한 번만 읽고 파일이 바뀌면 다시 읽음)
+        self.catalog_loader = get_catalog_loader()
+        self._restaurant_index = None
+        self._attraction_index = None
+        self._destination_resolver = None
+        self._autocomplete = None
+        # 모든 통화쌍 환율 행렬 (카탈로그 환율이 바뀌면 새로 만들어 교체)
+        self.fx = FxEngine()
+        self._fx_source = None
+        # 사진 썸네일 디스크 캐시
+        self.thumbnails = ThumbnailService(self.http)
+        # 독립적인 조회를 동시에 실행하는 I/O 스레드 풀
+        self.overview_timeout = float(os.getenv("OVERVIEW_TIMEOUT", "8"))
+        self._executor = ThreadPoolExecutor(
+            max_workers=int(os.getenv("IO_WORKERS", "8")),
+            thread_name_prefix="travel-io"
+        )
+        # 리뷰, 여행 팁, 예약 저장소
+        self.storage = storage or open_storage()
+        # 재고 차감과 중복 요청 처리를 포함한 예약 처리
+        self.booking_service = BookingService(self.storage)
+        # 외부 API 호출 한도(저장소에 기록해 워커 프로세스끼리 공유)와 마지막으로 성공한 날씨/환율 결과
+        self.quotas = {
+            "weather": QuotaBudget("OpenWeatherMap", *WEATHER_QUOTA, storage=self.storage),
+            "exchange": QuotaBudget("ExchangeRate-API", *EXCHANGE_QUOTA, storage=self.storage)
+        }
+        self.snapshots = SnapshotStore(self._executor)
+        # 자주 찾는 여행지의 날씨와 환율을 미리 가져오는 백그라운드 스레드 (warm_up에서 시작)
+        self.refresher = BackgroundRefresher(self)
+    
+    def use_storage(self, storage):
+        """저장소를 교체하고 이전 저장소를 반환합니다."""
+        previous = self.storage
+        self.storage = storage
+        self.booking_service.storage = storage
+        for budget in self.quotas.values():
+            budget.storage = storage
+        return previous
+    
+    def warm_up(self):
+        """첫 요청 전에 카탈로그, 여행지 색인, 좌표 색인을 준비하고, API 키가 있으면 백그라운드 갱신을 시작합니다."""
+        self.catalog_loader.get()
+        self.get_destination_resolver()
+        self.get_autocomplete()
+        self.get_attraction_index()
+        get_geo_dataset()
+        enabled = os.getenv("REFRESH_ENABLED", "1").lower() not in ("0", "false", "no")
+        if enabled and (self.weather_api_key or self.exchange_api_key):
+            self.refresher.start()
+    
+    def close(self):
+        """사용 중인 리소스를 정리합니다."""
+        self.refresher.stop(timeout=1)
+        self._executor.shutdown(wait=False)
+        self.thumbnails.close()
+        self.http.close()
+        self.cache.close()
+        self.storage.close()
+    
+    @property
+    def catalog(self):
+        """현재 정적 참조 데이터 카탈로그입니다."""
+        return self.catalog_loader.get()
+    
+    def get_http_stats(self):
+        """외부 호스트별 지연 시간과 오류 통계를 반환합니다."""
+        return self.http.get_stats()
+    
+    def get_cache_stats(self):
+        """응답 캐시와 썸네일 캐시의 통계를 반환합니다."""
+        return {
+            "responses": self.cache.stats(),
+            "thumbnails": self.thumbnails.stats(),
+            "snapshots": self.snapshots.stats()
+        }
     
+    def get_quota_stats(self):
+        """외부 API별 호출 한도와 남은 호출 수를 반환합니다."""
+        return {name: budget.stats() for name, budget in self.quotas.items()}
+    
+    @resolves_destination("destinations")
     def compare_destinations(self, destinations, criteria):
         """여행지를 비교합니다."""
         try:
@@ -59,174 +161,337 @@ class TravelAssistant:
         except Exception as e:
             return f"여행지 비교 중 오류가 발생했습니다: {str(e)}"
     
-    def check_availability(self, destination, date, service_type):
-        """실시간 예약 가능 여부를 확인합니다."""
+    @resolves_destination("destination")
+    def check_availability(self, destination, date, service_type, budget=None, check_out=None,
+                           sort="price", limit=5, guests=None):
+        """실시간 예약 가능 여부와 옵션별 남은 수량을 확인합니다.
+        
+        check_out을 주면 date부터 체크아웃 전날까지 매일 예약 가능한 상품만 반환합니다.
+        budget(문자열 또는 Price)으로 가격대를 거르고, sort("price" 또는 "rating") 순으로 limit개를 반환합니다.
+        guests를 주면 그 인원에 필요한 객실(rooms_for)이 매일 남은 상품만 반환합니다.
+        """
         try:
-            # 실제 구현에서는 API를 통해 데이터를 가져와야 합니다
-            # 여기서는 예시 데이터를 반환합니다
-            return {
-                "available": True,
-                "options": [
-                    {
-                        "name": "호텔 A",
-                        "price": "100,000원",
-                        "rating": 4.5
-                    },
-                    {
-                        "name": "호텔 B",
-                        "price": "150,000원",
-                        "rating": 4.8
-                    }
-                ]
-            }
+            return self.booking_service.availability(
+                destination, date, service_type,
+                budget=budget,
+                check_out=check_out,
+                sort=sort,
+                limit=limit,
+                units=rooms_for(guests) if guests else 1
+            )
         except Exception as e:
             return f"예약 가능 여부 확인 중 오류가 발생했습니다: {str(e)}"
     
-    def make_booking(self, destination, date, service_type, details):
-        """예약을 진행합니다."""
+    @resolves_destination("destination")
+    def make_booking(self, destination, date, service_type, details, option=None, idempotency_key=None,
+                     check_out=None, guests=None):
+        """예약을 진행합니다.
+        
+        check_out을 주면 date부터 체크아웃 전날까지 매일 재고를 차감합니다. (없으면 1박)
+        guests를 주면 검색과 같이 그 인원에 필요한 객실 수(rooms_for)만큼 차감합니다.
+        같은 idempotency_key로 다시 요청하면(예: 버튼 중복 클릭) 새로 예약하지 않고 처음 예약을 반환합니다.
+        """
         try:
-            booking_id = f"BK{datetime.now().strftime('%Y%m%d%H%M%S')}"
-            booking = {
-                "id": booking_id,
-                "destination": destination,
-                "date": date,
-                "service_type": service_type,
-                "details": details,
-                "status": "예약 완료",
-                "created_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            }
-            
-            if destination not in self.bookings:
-                self.bookings[destination] = []
-            self.bookings[destination].append(booking)
-            
+            booking, _ = self.booking_service.book(
+                destination, date, service_type, details,
+                option=option,
+                idempotency_key=idempotency_key,
+                check_out=check_out,
+                units=rooms_for(guests) if guests else 1
+            )
             return booking
+        except SoldOutError as e:
+            return f"예약할 수 없습니다: {str(e)}"
         except Exception as e:
             return f"예약 중 오류가 발생했습니다: {str(e)}"
     
+    @resolves_destination("destination")
     def get_booking_history(self, destination=None):
         """예약 내역을 조회합니다."""
         try:
-            if destination:
-                return self.bookings.get(destination, [])
-            return self.bookings
+            return self.storage.get_bookings(destination)
         except Exception as e:
             return f"예약 내역 조회 중 오류가 발생했습니다: {str(e)}"
     
+    @resolves_destination("destination")
     def add_review(self, destination, rating, comment, user_id):
         """여행지 리뷰를 추가합니다."""
-        if destination not in self.reviews:
-            self.reviews[destination] = []
-        
         review = {
             "user_id": user_id,
             "rating": rating,
             "comment": comment,
             "date": datetime.now().strftime("%Y-%m-%d")
         }
-        self.reviews[destination].append(review)
+        self.storage.add_reviews(destination, [review])
         return review
     
-    def get_reviews(self, destination):
-        """여행지의 리뷰를 가져옵니다."""
-        if destination not in self.reviews:
-            return []
-        return self.reviews[destination]
+    @resolves_destination("destination")
+    def get_reviews_page(self, destination, order="newest", cursor=None, limit=None):
+        """리뷰를 한 페이지씩 가져옵니다. order는 "newest"(최신순) 또는 "rating"(평점순)입니다.
+        
+        next_cursor를 다음 호출의 cursor로 넘기면 이어서 조회하며, 마지막 페이지면 None입니다.
+        """
+        items, next_cursor = self.storage.page_reviews(destination, order, cursor, limit)
+        return {"items": items, "next_cursor": next_cursor}
+    
+    @resolves_destination("destination")
+    def iter_reviews(self, destination, order="newest", page_size=None):
+        """리뷰를 필요한 만큼만 페이지 단위로 읽어 오는 제너레이터입니다."""
+        cursor = None
+        while True:
+            items, cursor = self.storage.page_reviews(destination, order, cursor, page_size)
+            yield from items
+            if cursor is None:
+                return
     
+    @resolves_destination("destination")
+    def get_reviews(self, destination, order="newest", limit=None):
+        """여행지의 리뷰를 가져옵니다. limit을 주면 앞에서부터 그 개수만 읽습니다."""
+        return list(islice(self.iter_reviews(destination, order, limit), limit))
+    
+    @resolves_destination("destination")
     def get_average_rating(self, destination):
-        """여행지의 평균 평점을 계산합니다."""
-        if destination not in self.reviews or not self.reviews[destination]:
-            return 0
-        ratings = [review["rating"] for review in self.reviews[destination]]
-        return sum(ratings) / len(ratings)
+        """여행지의 평균 평점을 반환합니다. 미리 집계해 둔 값을 사용합니다."""
+        return self.storage.average_rating(destination)
+    
+    @resolves_destination("destination")
+    def get_rating_summary(self, destination):
+        """여행지의 리뷰 수, 평균, 최근 리뷰에 가중치를 둔 평균, 별점 분포를 반환합니다."""
+        return self.storage.rating_summary(destination)
     
+    @resolves_destination("destination")
+    def rebuild_rating_stats(self, destination=None):
+        """저장된 리뷰로 평점 집계를 다시 계산합니다."""
+        return self.storage.rebuild_rating_stats(destination)
+    
+    def check_rating_stats(self):
+        """평점 집계와 원본 리뷰가 어긋난 여행지를 반환합니다."""
+        return self.storage.check_rating_stats()
+    
+    @resolves_destination("destination")
     def add_travel_tip(self, destination, tip, category, user_id):
         """여행 팁을 추가합니다."""
-        if destination not in self.travel_tips:
-            self.travel_tips[destination] = []
-        
         travel_tip = {
             "user_id": user_id,
             "tip": tip,
             "category": category,
             "date": datetime.now().strftime("%Y-%m-%d")
         }
-        self.travel_tips[destination].append(travel_tip)
+        self.storage.add_tips(destination, [travel_tip])
         return travel_tip
     
-    def get_travel_tips(self, destination, category=None):
-        """여행지의 팁을 가져옵니다."""
-        if destination not in self.travel_tips:
-            return []
-        
-        tips = self.travel_tips[destination]
-        if category:
-            tips = [tip for tip in tips if tip["category"] == category]
-        return tips
+    @resolves_destination("destination")
+    def get_travel_tips_page(self, destination, category=None, cursor=None, limit=None):
+        """여행 팁을 최신순으로 한 페이지씩 가져옵니다. 카테고리 조회는 카테고리별 색인을 사용합니다."""
+        items, next_cursor = self.storage.page_tips(destination, category, cursor, limit)
+        return {"items": items, "next_cursor": next_cursor}
     
-    def get_weather(self, location, date):
-        try:
-            # 예시 날씨 데이터 반환
-            return {
+    @resolves_destination("destination")
+    def iter_travel_tips(self, destination, category=None, page_size=None):
+        """여행 팁을 필요한 만큼만 페이지 단위로 읽어 오는 제너레이터입니다."""
+        cursor = None
+        while True:
+            items, cursor = self.storage.page_tips(destination, category, cursor, page_size)
+            yield from items
+            if cursor is None:
+                return
+    
+    @resolves_destination("destination")
+    def get_travel_tips(self, destination, category=None, limit=None):
+        """여행지의 팁을 가져옵니다. limit을 주면 앞에서부터 그 개수만 읽습니다."""
+        return list(islice(self.iter_travel_tips(destination, category, limit), limit))
+    
+    @staticmethod
+    def _to_date(value):
+        """문자열/날짜/일시 값을 date로 변환합니다. None이면 오늘 날짜를 사용합니다."""
+        if value is None:
+            return datetime.now().date()
+        if isinstance(value, datetime):
+            return value.date()
+        if isinstance(value, str):
+            return datetime.strptime(value, "%Y-%m-%d").date()
+        return value
+    
+    def _sample_weather(self):
+        """예시 날씨 데이터를 반환합니다."""
+        return {
+            "현재 날씨": {
+                "온도": "23°C",
+                "체감온도": "22°C",
+                "날씨": "맑음",
+                "습도": "65%",
+                "바람": "5km/h",
+                "강수량": "0mm"
+            },
+            "일일 예보": {
+                "최고기온": "26°C",
+                "최저기온": "18°C",
+                "평균기온": "22°C",
+                "강수확률": "10%",
+                "총강수량": "0mm",
+                "자외선지수": "3"
+            }
+        }
+    
+    def _fetch_weather_window(self, location, start_date, end_date):
+        """기간 전체의 날씨를 한 번의 요청으로 가져와 날짜별로 나눕니다."""
+        return self._fetch_weather_days(
+            location, [start_date + timedelta(days=n) for n in range((end_date - start_date).days + 1)]
+        )
+    
+    def _fetch_weather_days(self, location, dates):
+        """주어진 날짜들의 날씨만 한 번의 요청으로 가져와 {"YYYY-MM-DD": 날씨} 형태로 나눕니다."""
+        days = [day.strftime("%Y-%m-%d") for day in dates]
+        if not self.weather_api_key:
+            return {day: self._sample_weather() for day in days}
+        
+        # OpenWeatherMap 5일 예보 (3시간 간격) 한 번으로 전체 기간을 조회합니다
+        self.quotas["weather"].acquire()
+        response = self.http.get(
+            "https://api.openweathermap.org/data/2.5/forecast",
+            params={
+                "q": location,
+                "appid": self.weather_api_key,
+                "units": "metric",
+                "lang": "kr"
+            }
+        )
+        response.raise_for_status()
+        slots = {}
+        for item in response.json().get("list", []):
+            slots.setdefault(item["dt_txt"][:10], []).append(item)
+        
+        weather_by_day = {}
+        for day in days:
+            items = slots.get(day)
+            if not items:
+                # 예보 범위(5일)를 벗어난 날짜는 예시 데이터로 채웁니다
+                weather_by_day[day] = self._sample_weather()
+                continue
+            first = items[0]
+            temps = [item["main"]["temp"] for item in items]
+            rain = sum(item.get("rain", {}).get("3h", 0) for item in items)
+            weather_by_day[day] = {
                 "현재 날씨": {
-                    "온도": "23°C",
-                    "체감온도": "22°C",
-                    "날씨": "맑음",
-                    "습도": "65%",
-                    "바람": "5km/h",
-                    "강수량": "0mm"
+                    "온도": f"{round(first['main']['temp'])}°C",
+                    "체감온도": f"{round(first['main']['feels_like'])}°C",
+                    "날씨": first["weather"][0]["description"] if first.get("weather") else "정보 없음",
+                    "습도": f"{first['main']['humidity']}%",
+                    "바람": f"{round(first.get('wind', {}).get('speed', 0) * 3.6)}km/h",
+                    "강수량": f"{first.get('rain', {}).get('3h', 0):g}mm"
                 },
                 "일일 예보": {
-                    "최고기온": "26°C",
-                    "최저기온": "18°C",
-                    "평균기온": "22°C",
-                    "강수확률": "10%",
-                    "총강수량": "0mm",
-                    "자외선지수": "3"
+                    "최고기온": f"{round(max(item['main']['temp_max'] for item in items))}°C",
+                    "최저기온": f"{round(min(item['main']['temp_min'] for item in items))}°C",
+                    "평균기온": f"{round(sum(temps) / len(temps))}°C",
+                    "강수확률": f"{round(max(item.get('pop', 0) for item in items) * 100)}%",
+                    "총강수량": f"{rain:g}mm",
+                    "자외선지수": "정보 없음"
                 }
             }
+        return weather_by_day
+    
+    @resolves_destination("location")
+    @cached(
+        "weather",
+        cacheable=lambda value: not isinstance(value, (str, StaleResult)),
+        # get_weather_range/refresh_weather와 같은 [여행지, "YYYY-MM-DD"] 키를 사용합니다 (None은 오늘)
+        key=lambda self, location, date: [location, self._to_date(date).strftime("%Y-%m-%d")]
+    )
+    def get_weather(self, location, date):
+        day = self._to_date(date)
+        key = day.strftime("%Y-%m-%d")
+        try:
+            return self._fetch_weather_window(location, day, day)[key]
+        except Exception as e:
+            # 호출 한도 초과나 장애 시에는 마지막으로 가져온 결과를 대신 사용합니다
+            # (캐시하지 않으므로 API가 회복되면 다음 조회에서 바로 새 결과를 가져옵니다)
+            snapshot = self.snapshots.get(("weather", location, key))
+            if snapshot is not None:
+                return StaleResult(snapshot.value)
+            return f"날씨 정보를 가져오는 중 오류가 발생했습니다: {str(e)}"
+    
+    @resolves_destination("location")
+    def refresh_weather(self, location):
+        """오늘부터 예보 범위 전체의 날씨를 한 번에 가져와 캐시와 스냅샷을 갱신합니다."""
+        start = datetime.now().date()
+        fetched = self._fetch_weather_window(location, start, start + timedelta(days=WEATHER_PREFETCH_DAYS - 1))
+        ttl = self.cache.ttl_for("weather")
+        for key, weather in fetched.items():
+            self.cache.set("weather", [location, key], weather)
+            self.snapshots.put(("weather", location, key), weather, ttl)
+        return fetched
+    
+    @resolves_destination("location")
+    def get_weather_snapshot(self, location, date=None):
+        """마지막으로 가져온 날씨를 즉시 반환합니다. 오래된 결과면 백그라운드에서 다시 가져옵니다.
+        
+        반환값에는 갱신 시각과 오래됨 여부(updated_at, age_seconds, stale, source)가 함께 들어 있습니다.
+        """
+        try:
+            day = self._to_date(date)
+            key = day.strftime("%Y-%m-%d")
+            snapshot = self.snapshots.read(
+                ("weather", location, key),
+                lambda: self._fetch_weather_window(location, day, day)[key],
+                self.cache.ttl_for("weather")
+            )
+            return {"weather": snapshot.value, **snapshot.meta()}
+        except Exception as e:
+            return f"날씨 정보를 가져오는 중 오류가 발생했습니다: {str(e)}"
+    
+    @resolves_destination("location")
+    def get_weather_range(self, location, start_date, end_date):
+        """기간 내 일별 날씨를 {"YYYY-MM-DD": 날씨} 형태로 한 번에 가져옵니다.
+        
+        캐시에 없는 날짜만 가져오고, 가져오지 못하면 날짜마다 마지막으로 가져온 결과(StaleResult)를,
+        그것도 없으면 None을 사용합니다. 모든 날짜가 None이면 오류 메시지를 반환합니다.
+        """
+        try:
+            start = self._to_date(start_date)
+            end = self._to_date(end_date)
+            days = [start + timedelta(days=n) for n in range((end - start).days + 1)]
+            
+            # get_weather와 같은 캐시 키를 사용하므로 이미 조회한 날짜는 재사용됩니다
+            weather_by_day = {}
+            missing = []
+            for day in days:
+                key = day.strftime("%Y-%m-%d")
+                found, weather = self.cache.get("weather", [location, key])
+                if found:
+                    weather_by_day[key] = weather
+                else:
+                    missing.append(day)
+            
+            if missing:
+                try:
+                    fetched = self._fetch_weather_days(location, missing)
+                except Exception as e:
+                    # 호출 한도 초과나 장애 시에는 get_weather처럼 날짜별 마지막 결과를 캐시하지 않고 사용합니다
+                    for day in missing:
+                        key = day.strftime("%Y-%m-%d")
+                        snapshot = self.snapshots.get(("weather", location, key))
+                        weather_by_day[key] = StaleResult(snapshot.value) if snapshot is not None else None
+                    if not any(weather_by_day.values()):
+                        return f"날씨 정보를 가져오는 중 오류가 발생했습니다: {str(e)}"
+                else:
+                    for day in missing:
+                        key = day.strftime("%Y-%m-%d")
+                        self.cache.set("weather", [location, key], fetched[key])
+                        weather_by_day[key] = fetched[key]
+            
+            return {day.strftime("%Y-%m-%d"): weather_by_day[day.strftime("%Y-%m-%d")] for day in days}
         except Exception as e:
             return f"날씨 정보를 가져오는 중 오류가 발생했습니다: {str(e)}"
     
+    @resolves_destination("location")
     def get_travel_photos(self, location):
         """
         Returns representative photos for specific travel destinations.
         """
-        destination_photos = {
-            "서울": [
-                {
-                    "url": "https://images.unsplash.com/photo-1538485399081-7c8272e31ecb?w=800",
-                    "description": "남산서울타워와 도시 야경"
-                }
-            ],
-            "도쿄": [
-                {
-                    "url": "https://images.unsplash.com/photo-1540959733332-eab4deabeeaf?w=800",
-                    "description": "도쿄타워와 도시 야경"
-                }
-            ],
-            "파리": [
-                {
-                    "url": "https://images.unsplash.com/photo-1502602898657-3e91760cbb34?w=800",
-                    "description": "에펠탑의 웅장한 모습"
-                }
-            ],
-            "런던": [
-                {
-                    "url": "https://images.unsplash.com/photo-1513635269975-59663e0ac1ad?w=800",
-                    "description": "빅벤과 웨스트민스터 궁전"
-                }
-            ],
-            "뉴욕": [
-                {
-                    "url": "https://images.unsplash.com/photo-1496442226666-8d4d0e62e6e9?w=800",
-                    "description": "맨해튼 스카이라인"
-                }
-            ]
-        }
-
-        if location in destination_photos:
-            return destination_photos[location]
+        photos = self.catalog.photos.get(location)
+        if photos:
+            return photos
         else:
             # Return default image for locations without predefined photos
             return [{
@@ -234,43 +499,92 @@ class TravelAssistant:
                 "description": f"{location}의 도시 전경"
             }]
     
-    def get_photo_base64(self, photo_url):
-        """사진 URL을 base64로 변환합니다."""
+    @resolves_destination("location")
+    def iter_destination_overview(self, location, date=None, timeout=None):
+        """날씨, 환율, 사진 조회를 동시에 실행하고 끝나는 순서대로 (섹션, 결과)를 반환합니다.
+        
+        제한 시간 안에 끝나지 않은 섹션은 결과 없이(None) 반환합니다.
+        """
+        date_str = self._to_date(date).strftime("%Y-%m-%d")
+        futures = {
+            self._executor.submit(self.get_weather, location, date_str): "weather",
+            self._executor.submit(self.get_exchange_info, location): "exchange",
+            self._executor.submit(self.get_travel_photos, location): "photos"
+        }
         try:
-            response = requests.get(photo_url)
-            img = Image.open(BytesIO(response.content))
-            
-            # 이미지 크기를 50% 수준으로 조정
-            max_size = (400, 300)  # 기존 800x600에서 400x300으로 변경
-            img.thumbnail(max_size, Image.LANCZOS)
-            
-            # base64로 변환
-            buffered = BytesIO()
-            img.save(buffered, format="JPEG", quality=85)  # quality 파라미터 추가로 파일 크기 최적화
-            img_str = base64.b64encode(buffered.getvalue()).decode()
-            
-            return img_str
-            
+            for future in as_completed(futures, timeout=timeout or self.overview_timeout):
+                try:
+                    yield futures[future], future.result()
+                except Exception as e:
+                    yield futures[future], f"정보를 가져오는 중 오류가 발생했습니다: {str(e)}"
+        except FutureTimeoutError:
+            for future, section in futures.items():
+                if not future.done():
+                    future.cancel()
+                    yield section, None
+    
+    @resolves_destination("location")
+    def get_destination_overview(self, location, date=None, timeout=None):
+        """여행지의 날씨, 환율, 사진 정보를 동시에 조회합니다. 늦은 섹션은 pending에 담깁니다."""
+        overview = {"location": location, "weather": None, "exchange": None, "photos": None, "pending": []}
+        for section, result in self.iter_destination_overview(location, date, timeout):
+            if result is None:
+                overview["pending"].append(section)
+            else:
+                overview[section] = result
+        return overview
+    
+    def get_photo_bytes(self, photo_url):
+        """사진 썸네일을 JPEG 바이트로 반환합니다. st.image에 그대로 전달할 수 있습니다."""
+        try:
+            # 400x300, JPEG 품질 85 썸네일 (디스크 캐시에 있으면 바로 반환)
+            return self.thumbnails.get(photo_url)
         except Exception as e:
-            print(f"Error converting photo to base64: {str(e)}")
+            print(f"Error loading photo: {str(e)}")
+            return None
+    
+    def get_photos_bytes(self, photo_urls, timeout=None):
+        """여러 사진 썸네일을 동시에 JPEG 바이트로 변환합니다. 결과는 입력 순서를 따르며 실패한 사진은 None입니다."""
+        timeout = timeout or float(os.getenv("PHOTO_TIMEOUT", "10"))
+        return self.thumbnails.get_many(photo_urls, timeout)
+    
+    def get_photo_base64(self, photo_url):
+        """사진 URL을 base64로 변환합니다. (data URI가 꼭 필요한 경우에만 사용하세요)"""
+        img_bytes = self.get_photo_bytes(photo_url)
+        if img_bytes is None:
             return None
+        return base64.b64encode(img_bytes).decode()
+    
+    def get_photos_base64(self, photo_urls, timeout=None):
+        """여러 사진을 동시에 base64로 변환합니다. (data URI가 꼭 필요한 경우에만 사용하세요)"""
+        return [
+            base64.b64encode(img_bytes).decode() if img_bytes is not None else None
+            for img_bytes in self.get_photos_bytes(photo_urls, timeout)
+        ]
     
+    @resolves_destination("destination")
     def create_travel_calendar(self, destination, start_date, duration, activities):
         """여행 일정 캘린더를 생성합니다."""
         calendar = []
         current_date = start_date
+        # 전체 기간의 날씨를 한 번에 가져옵니다
+        weather_by_day = self.get_weather_range(
+            destination, start_date, start_date + timedelta(days=max(duration - 1, 0))
+        )
         
         for day in range(duration):
             daily_activities = activities[day] if day < len(activities) else []
+            date_str = current_date.strftime("%Y-%m-%d")
             calendar.append({
-                "date": current_date.strftime("%Y-%m-%d"),
+                "date": date_str,
                 "activities": daily_activities,
-                "weather": self.get_weather(destination, current_date.strftime("%Y-%m-%d"))
+                "weather": weather_by_day.get(date_str) if isinstance(weather_by_day, dict) else weather_by_day
             })
             current_date += timedelta(days=1)
         
         return calendar
     
+    @resolves_destination("destination")
     def calculate_travel_expenses(self, destination, duration, preferences):
         """여행 경비를 계산합니다."""
         query = f"""
@@ -292,135 +606,131 @@ class TravelAssistant:
         # 여기서는 예시 추천을 반환합니다
         return "예시 추천 결과입니다."
     
+    @resolves_destination("destination")
     def plan_trip(self, destination, duration, preferences):
         """여행 계획을 세웁니다."""
-        # 날씨 정보 추가
-        weather_info = self.get_weather(destination, datetime.now().strftime("%Y-%m-%d"))
+        # 여행 기간 전체의 날씨 정보 추가
+        today = datetime.now().date()
+        weather_info = self.get_weather_range(destination, today, today + timedelta(days=max(duration - 1, 0)))
         
         query = f"""
         {destination}에서 {duration}일 동안 여행 계획을 세워주세요.
         선호사항: {preferences}
-        현재 날씨: {weather_info}
+        일별 날씨: {weather_info}
         """
         return self.get_recommendations(query)
     
-    def find_restaurants(self, location, cuisine=None, budget=None):
-        """맛집을 추천합니다."""
+    def get_destination_resolver(self):
+        """여행지 이름/별칭 색인을 반환합니다. 카탈로그가 바뀌면 다시 만듭니다."""
+        destinations = self.catalog.destinations
+        resolver = self._destination_resolver
+        if resolver is None or resolver.source is not destinations:
+            resolver = self._destination_resolver = DestinationResolver(destinations)
+        return resolver
+    
+    def resolve_destination(self, text):
+        """입력한 여행지 이름/별칭을 표준 여행지 ID로 바꿉니다. 정확히 일치하는 여행지가 없으면 입력을 그대로 반환합니다."""
+        text = text.strip()
+        return self.get_destination_resolver().resolve(text) or text
+    
+    def find_destinations(self, text, limit=5):
+        """입력과 비슷한 여행지를 [(여행지 ID, 점수)] 형태로 점수 순으로 반환합니다."""
+        return self.get_destination_resolver().candidates(text, limit)
+    
+    def get_autocomplete(self):
+        """여행지 자동 완성 색인을 반환합니다. 카탈로그가 바뀌면 다시 만듭니다.
+        
+        좌표 데이터를 읽을 수 있으면 그 도시/장소 이름도 함께 색인합니다.
+        """
+        destinations = self.catalog.destinations
+        try:
+            geo = get_geo_dataset()
+        except (OSError, ValueError) as e:
+            print(f"Error loading geo dataset for autocomplete: {str(e)}")
+            geo = None
+        index = self._autocomplete
+        if index is None or index.source is not destinations or index.geo is not geo:
+            index = self._autocomplete = Autocomplete.from_destinations(destinations, geo)
+        return index
+    
+    def autocomplete_destinations(self, prefix, limit=10):
+        """입력 중인 여행지/장소 이름(또는 초성)으로 시작하는 항목을 인기순으로 반환합니다.
+        
+        각 항목의 destination은 고르면 이동할 여행지입니다.
+        """
+        return self.get_autocomplete().complete(prefix, limit)
+    
+    def get_restaurant_index(self):
+        """맛집 색인을 반환합니다. 카탈로그가 바뀌면 다시 만듭니다."""
+        restaurants = self.catalog.restaurants
+        index = self._restaurant_index
+        if index is None or index.source is not restaurants:
+            index = self._restaurant_index = RestaurantIndex(restaurants)
+        return index
+    
+    def get_attraction_index(self):
+        """관광지 색인을 반환합니다. 카탈로그가 바뀌면 다시 만듭니다."""
+        attractions = self.catalog.attractions
+        index = self._attraction_index
+        if index is None or index.source is not attractions:
+            index = self._attraction_index = AttractionIndex(attractions)
+        return index
+    
+    def _fetch_exchange_rates(self):
+        """ExchangeRate-API에서 USD 기준 최신 환율을 {"USD": {통화: 환율}} 형태로 가져옵니다."""
+        self.quotas["exchange"].acquire()
+        response = self.http.get(f"https://v6.exchangerate-api.com/v6/{self.exchange_api_key}/latest/USD")
+        response.raise_for_status()
+        data = response.json()
+        if data.get("result") != "success":
+            raise ValueError(data.get("error-type", "환율 API 응답이 올바르지 않습니다."))
+        return {"USD": data["conversion_rates"]}
+    
+    def refresh_exchange_rates(self):
+        """최신 환율을 가져와 스냅샷을 갱신합니다. 환율 행렬은 다음 조회 때 교체됩니다."""
+        return self.snapshots.put(("exchange",), self._fetch_exchange_rates(), self.cache.ttl_for("exchange"))
+    
+    def _exchange_snapshot(self):
+        """최신 환율 스냅샷입니다. API 키가 없거나 한 번도 가져오지 못했으면 None입니다."""
+        if not self.exchange_api_key:
+            return None
+        try:
+            return self.snapshots.read(("exchange",), self._fetch_exchange_rates, self.cache.ttl_for("exchange"))
+        except Exception as e:
+            print(f"Error fetching exchange rates: {str(e)}")
+            return None
+    
+    def get_fx_matrix(self):
+        """현재 환율 행렬을 반환합니다. 카탈로그 환율이나 최신 환율이 바뀌면 다시 만들어 교체합니다."""
+        catalog = self.catalog
+        snapshot = self._exchange_snapshot()
+        live = snapshot.value if snapshot is not None else None
+        source = self._fx_source
+        if source is None or source[0] is not catalog.exchange_rates or source[1] is not live:
+            rates = dict(catalog.exchange_rates)
+            if live:
+                # 최신 환율로 계산할 수 있는 통화는 카탈로그 환율 대신 최신 환율을 사용합니다
+                rates = {base: row for base, row in rates.items() if base not in live["USD"]}
+                rates.update(live)
+            currencies = {info["currency"] for info in catalog.destinations.values()}
+            self.fx.refresh(rates, currencies)
+            self._fx_source = (catalog.exchange_rates, live)
+        return self.fx.current
+    
+    def convert_currency(self, amounts, source, target):
+        """금액(하나 또는 목록)을 target 통화로 환산합니다. source는 통화 코드 하나 또는 금액별 통화 코드 목록입니다."""
+        converted = self.get_fx_matrix().convert(amounts, source, target)
+        return converted.tolist() if converted.ndim else float(converted)
+    
+    @resolves_destination("location")
+    def find_restaurants(self, location, cuisine=None, budget=None, specialty=None,
+                         min_rating=None, offset=0, limit=None, near=None, radius_km=None):
+        """맛집을 평점 순으로 추천합니다. offset/limit으로 페이지를 나눌 수 있습니다.
+        
+        near(장소 이름, "위도,경도" 또는 (위도, 경도))를 주면 반경 radius_km 안의 맛집만
+        가까운 순으로 반환하고, 각 맛집에 distance_km를 붙입니다.
+        """
         try:
-            # 도시별 맛집 데이터
-            restaurant_data = {
-                "서울": [
-                    {
-                        "name": "삼청동 수제비",
-                        "cuisine": "한식",
-                        "description": "전통 한식의 맛을 즐길 수 있는 곳",
-                        "price_range": "10,000-30,000원",
-                        "rating": 4.5,
-                        "address": "서울 종로구 삼청동",
-                        "opening_hours": "매일 11:00-21:00",
-                        "specialties": ["수제비", "칼국수", "김치찌개"]
-                    },
-                    {
-                        "name": "을지로 양념갈비",
-                        "cuisine": "한식",
-                        "description": "숨은 맛집으로 유명한 갈비집",
-                        "price_range": "30,000-50,000원",
-                        "rating": 4.7,
-                        "address": "서울 중구 을지로",
-                        "opening_hours": "매일 11:30-22:00",
-                        "specialties": ["양념갈비", "된장찌개", "냉면"]
-                    }
-                ],
-                "도쿄": [
-                    {
-                        "name": "스시 긴자",
-                        "cuisine": "일식",
-                        "description": "최고급 스시를 맛볼 수 있는 곳",
-                        "price_range": "50,000원 이상",
-                        "rating": 4.8,
-                        "address": "도쿄도 긴자",
-                        "opening_hours": "매일 11:30-14:00, 17:00-22:00",
-                        "specialties": ["오마카세", "스시", "사시미"]
-                    },
-                    {
-                        "name": "라멘 이치란",
-                        "cuisine": "일식",
-                        "description": "유명한 돈코츠 라멘 체인점",
-                        "price_range": "10,000-30,000원",
-                        "rating": 4.5,
-                        "address": "도쿄도 시부야",
-                        "opening_hours": "24시간 영업",
-                        "specialties": ["돈코츠라멘", "계란", "챠슈"]
-                    }
-                ],
-                "파리": [
-                    {
-                        "name": "Le Chateaubriand",
-                        "cuisine": "프랑스식",
-                        "description": "현대적인 프렌치 다이닝",
-                        "price_range": "50,000원 이상",
-                        "rating": 4.6,
-                        "address": "파리 11구",
-                        "opening_hours": "화-토 19:30-23:00",
-                        "specialties": ["코스요리", "와인", "디저트"]
-                    },
-                    {
-                        "name": "L'Ami Louis",
-                        "cuisine": "프랑스식",
-                        "description": "클래식한 프랑스 비스트로",
-                        "price_range": "30,000-50,000원",
-                        "rating": 4.4,
-                        "address": "파리 3구",
-                        "opening_hours": "매일 12:00-14:30, 19:00-23:00",
-                        "specialties": ["로스트 치킨", "감자 요리", "와인"]
-                    }
-                ],
-                "뉴욕": [
-                    {
-                        "name": "Katz's Delicatessen",
-                        "cuisine": "미국식",
-                        "description": "뉴욕의 상징적인 델리",
-                        "price_range": "10,000-30,000원",
-                        "rating": 4.5,
-                        "address": "뉴욕 로어 이스트 사이드",
-                        "opening_hours": "매일 08:00-22:30",
-                        "specialties": ["파스트라미 샌드위치", "루벤 샌드위치", "매티 버거"]
-                    },
-                    {
-                        "name": "Peter Luger Steak House",
-                        "cuisine": "스테이크",
-                        "description": "브루클린의 전설적인 스테이크하우스",
-                        "price_range": "50,000원 이상",
-                        "rating": 4.7,
-                        "address": "브루클린 윌리엄스버그",
-                        "opening_hours": "매일 11:45-21:45",
-                        "specialties": ["포터하우스 스테이크", "베이컨", "감자"]
-                    }
-                ],
-                "런던": [
-                    {
-                        "name": "Dishoom",
-                        "cuisine": "인도식",
-                        "description": "현대적인 뭄바이식 레스토랑",
-                        "price_range": "30,000-50,000원",
-                        "rating": 4.6,
-                        "address": "런던 코벤트 가든",
-                        "opening_hours": "매일 08:00-23:00",
-                        "specialties": ["베이컨 난", "블랙 달", "비리야니"]
-                    },
-                    {
-                        "name": "The Clove Club",
-                        "cuisine": "현대식 영국",
-                        "description": "미쉐린 스타 레스토랑",
-                        "price_range": "50,000원 이상",
-                        "rating": 4.8,
-                        "address": "런던 쇼디치",
-                        "opening_hours": "화-토 18:00-22:30",
-                        "specialties": ["시즌 코스", "와인 페어링", "디저트"]
-                    }
-                ]
-            }
-
             # 기본 맛집 데이터
             default_restaurants = [
                 {
@@ -435,43 +745,136 @@ class TravelAssistant:
                 }
             ]
 
-            # 해당 도시의 맛집 정보 가져오기
-            restaurants = restaurant_data.get(location, default_restaurants)
+            index = self.get_restaurant_index()
+            if location not in index.by_city:
+                return default_restaurants
 
-            # 요리 종류로 필터링
-            if cuisine and cuisine != "기타":
-                restaurants = [r for r in restaurants if cuisine in r["cuisine"]]
-
-            # 예산으로 필터링
-            if budget:
-                budget_ranges = {
-                    "10,000원 이하": lambda r: "10,000원 이하" in r["price_range"],
-                    "10,000-30,000원": lambda r: "10,000-30,000원" in r["price_range"],
-                    "30,000-50,000원": lambda r: "30,000-50,000원" in r["price_range"],
-                    "50,000원 이상": lambda r: "50,000원 이상" in r["price_range"]
+            # 도시/요리 종류/대표 메뉴 색인의 교집합을 평점 순으로 조회
+            # 예산은 문자열("10,000-30,000원") 또는 Price로 받을 수 있습니다
+            budget_price = parse_price(budget)
+            if near is not None:
+                distances = {
+                    venue["name"]: distance
+                    for distance, venue in self._nearby_venues("restaurant", location, near, radius_km)
                 }
-                
-                if budget in budget_ranges:
-                    restaurants = [r for r in restaurants if budget_ranges[budget](r)]
+                restaurants = index.search(
+                    city=location,
+                    cuisine=cuisine if cuisine and cuisine != "기타" else None,
+                    specialty=specialty,
+                    min_price=budget_price.min_minor if budget_price else None,
+                    max_price=budget_price.max_minor if budget_price else None,
+                    currency=budget_price.currency if budget_price else "KRW",
+                    min_rating=min_rating
+                )
+                nearby = sorted(
+                    (dict(restaurant, distance_km=distances[restaurant["name"]])
+                     for restaurant in restaurants if restaurant["name"] in distances),
+                    key=lambda restaurant: restaurant["distance_km"]
+                )
+                return nearby[offset:offset + limit if limit is not None else None]
+            restaurants = index.search(
+                city=location,
+                cuisine=cuisine if cuisine and cuisine != "기타" else None,
+                specialty=specialty,
+                min_price=budget_price.min_minor if budget_price else None,
+                max_price=budget_price.max_minor if budget_price else None,
+                currency=budget_price.currency if budget_price else "KRW",
+                min_rating=min_rating,
+                offset=offset,
+                limit=limit
+            )
 
-            return restaurants if restaurants else default_restaurants
+            # 다음 페이지가 비어 있을 때는 기본 데이터 대신 빈 목록을 반환합니다
+            return restaurants if restaurants or offset else default_restaurants
 
         except Exception as e:
             return f"맛집 추천 중 오류가 발생했습니다: {str(e)}"
     
-    def find_accommodations(self, location, check_in, check_out, guests, budget):
-        """숙소를 추천합니다."""
+    @resolves_destination("location")
+    def get_popular_attractions(self, location, category=None, limit=10):
+        """인기 관광지를 평점과 리뷰 수를 합친 인기 점수 순으로 반환합니다.
+        
+        category(명소, 박물관, 공원, 쇼핑, 문화재, 자연)를 주면 해당 관광지만 반환하고,
+        limit이 None이면 조건에 맞는 관광지를 모두 반환합니다.
+        """
+        try:
+            index = self.get_attraction_index()
+            if location not in index.by_city:
+                return f"{location}의 관광지 정보가 아직 없습니다."
+            return index.top(location, category, limit)
+        except Exception as e:
+            return f"관광지 정보를 가져오는 중 오류가 발생했습니다: {str(e)}"
+    
+    @resolves_destination("location")
+    def find_accommodations(self, location, check_in, check_out, guests, budget, near=None, radius_km=None):
+        """숙소를 추천합니다.
+        
+        near를 주면 그 위치에서 반경 radius_km 안의 숙소 중 체크인부터 체크아웃 전날까지 매일
+        예약할 수 있고 예산에 맞으며 인원에 필요한 객실이 남은 곳을 check_availability와 같은
+        형태로 반환합니다. 옵션은 가까운 순이고 각각 distance_km가 붙습니다.
+        """
+        try:
+            nights(check_in, check_out)
+        except ValueError as e:
+            return f"숙소 검색 중 오류가 발생했습니다: {str(e)}"
+        if near is not None:
+            try:
+                distances = {
+                    venue["name"]: distance
+                    for distance, venue in self._nearby_venues(
+                        "accommodation", location, near, radius_km or DEFAULT_RADIUS_KM * 2
+                    )
+                }
+                availability = self.booking_service.availability(
+                    location, check_in, "숙소",
+                    budget=budget,
+                    check_out=check_out,
+                    limit=len(distances),
+                    names=distances,
+                    units=rooms_for(guests)
+                )
+                options = sorted(
+                    (dict(option, distance_km=distances[option["name"]]) for option in availability["options"]),
+                    key=lambda option: option["distance_km"]
+                )
+                return {"available": bool(options), "options": options}
+            except Exception as e:
+                return f"숙소 검색 중 오류가 발생했습니다: {str(e)}"
         # 날씨 정보 추가
         weather_info = self.get_weather(location, check_in)
+        budget_price = parse_price(budget)
         
         query = f"""
         {location}에서 {check_in}부터 {check_out}까지 
         {guests}명이 묵을 수 있는 숙소를 추천해주세요.
-        예산: {budget}
+        예산: {budget_price.label() if budget_price else budget} (1박 기준)
         날씨 정보: {weather_info}
         """
         return self.get_recommendations(query)
     
+    def _nearby_venues(self, kind, location, near, radius_km=None, limit=None):
+        """near 주변의 kind 장소를 [(거리 km, 장소)] 형태로 반환합니다. radius_km가 없으면 가장 가까운 limit개입니다."""
+        geo = get_geo_dataset()
+        point = geo.locate(near, location)
+        if point is None:
+            raise ValueError(f"위치를 찾을 수 없습니다: {near}")
+        if radius_km is None and limit is not None:
+            return geo.nearest(kind, point[0], point[1], limit)
+        return geo.within(kind, point[0], point[1], radius_km or DEFAULT_RADIUS_KM, limit)
+    
+    @resolves_destination("location")
+    def find_nearby(self, location, near, kind="attraction", radius_km=None, limit=10):
+        """near(장소 이름, "위도,경도" 또는 (위도, 경도)) 주변의 장소를 가까운 순으로 반환합니다.
+        
+        radius_km를 주면 그 반경 안에서, 주지 않으면 가장 가까운 limit개를 찾습니다.
+        kind는 restaurant, accommodation, attraction, tour, activity 중 하나입니다.
+        """
+        return [
+            dict(venue, distance_km=distance)
+            for distance, venue in self._nearby_venues(kind, location, near, radius_km, limit)
+        ]
+    
+    @resolves_destination("origin", "destination")
     def get_transportation(self, origin, destination, date):
         """교통편을 추천합니다."""
         # 날씨 정보 추가
@@ -484,6 +887,8 @@ class TravelAssistant:
         """
         return self.get_recommendations(query)
     
+    @resolves_destination("location")
+    @cached("events")
     def get_events_and_festivals(self, location, start_date=None, end_date=None):
         """여행지의 특별 이벤트와 축제 정보를 제공합니다."""
         try:
@@ -498,7 +903,8 @@ class TravelAssistant:
                 "page_size": 10,
                 "include": "categories,description,venue,price,url"
             }
-            response = requests.get(url, params=params)
+            response = self.http.get(url, params=params)
+            response.raise_for_status()
             data = response.json()
             
             if "events" not in data or not data["events"]:
@@ -530,11 +936,12 @@ class TravelAssistant:
         except Exception as e:
             return f"이벤트 정보를 가져오는 중 오류가 발생했습니다: {str(e)}"
     
+    @resolves_destination("location")
     def recommend_personalized_itinerary(self, location, duration, preferences, budget, start_date=None):
         """사용자 맞춤형 여행 코스를 추천합니다."""
         try:
             # 관광지 정보 가져오기
-            attractions = self.get_popular_attractions(location)
+            attractions = self.get_popular_attractions(location, limit=None)
             if not isinstance(attractions, list):
                 return f"관광지 정보를 가져올 수 없습니다: {attractions}"
             
@@ -545,57 +952,90 @@ class TravelAssistant:
                 start_date + timedelta(days=duration) if start_date else None
             )
             
-            # 날씨 정보 가져오기
-            weather = self.get_weather(location, start_date.strftime("%Y-%m-%d") if start_date else None)
+            # 여행 기간 전체의 날씨 정보를 한 번에 가져오기
+            first_day = self._to_date(start_date)
+            weather_by_day = self.get_weather_range(
+                location, first_day, first_day + timedelta(days=max(duration - 1, 0))
+            )
+            
+            return self._build_itinerary(
+                location, duration, preferences, budget, start_date, attractions, events, weather_by_day
+            )
             
-            # 여행 코스 생성
-            itinerary = {
-                "destination": location,
-                "duration": duration,
-                "preferences": preferences,
-                "budget": budget,
-                "start_date": start_date.strftime("%Y-%m-%d") if start_date else None,
-                "daily_plans": []
+        except Exception as e:
+            return f"여행 코스를 생성하는 중 오류가 발생했습니다: {str(e)}"
+    
+    def _build_itinerary(self, location, duration, preferences, budget, start_date, attractions, events, weather_by_day):
+        """조회한 관광지, 이벤트, 날씨 정보로 일별 여행 코스를 구성합니다."""
+        first_day = self._to_date(start_date)
+        if not isinstance(weather_by_day, dict):
+            weather_by_day = {}
+        
+        # 여행 코스 생성
+        itinerary = {
+            "destination": location,
+            "duration": duration,
+            "preferences": preferences,
+            "budget": budget,
+            "start_date": start_date.strftime("%Y-%m-%d") if start_date else None,
+            "daily_plans": []
+        }
+        
+        # 지역별로 날짜를 나누고 영업시간과 이동 시간에 맞춰 방문 순서를 정합니다
+        start, pois = self._locate_attractions(location, attractions)
+        schedule = ItineraryScheduler(start).schedule(pois, trip_dates(first_day, duration))
+        itinerary["total_travel_minutes"] = schedule["total_travel_minutes"]
+        itinerary["unscheduled"] = schedule["unscheduled"]
+        
+        # 일별 계획 생성
+        for day, scheduled in enumerate(schedule["days"]):
+            weather = weather_by_day.get((first_day + timedelta(days=day)).strftime("%Y-%m-%d"))
+            daily_plan = {
+                "day": day + 1,
+                "date": (start_date + timedelta(days=day)).strftime("%Y-%m-%d") if start_date else None,
+                "weather": weather.get("일일 예보", {}) if isinstance(weather, dict) else None,
+                "morning": [],
+                "afternoon": [],
+                "evening": [],
+                "events": [],
+                "travel_minutes": scheduled["travel_minutes"]
             }
             
-            # 일별 계획 생성
-            for day in range(duration):
-                daily_plan = {
-                    "day": day + 1,
-                    "date": (start_date + timedelta(days=day)).strftime("%Y-%m-%d") if start_date else None,
-                    "weather": weather.get("일일 예보", {}) if isinstance(weather, dict) else None,
-                    "morning": [],
-                    "afternoon": [],
-                    "evening": [],
-                    "events": []
-                }
-                
-                # 관광지 배치
-                attractions_per_day = min(3, len(attractions) // duration)
-                for i in range(attractions_per_day):
-                    if attractions:
-                        attraction = attractions.pop(0)
-                        if i == 0:
-                            daily_plan["morning"].append(attraction)
-                        elif i == 1:
-                            daily_plan["afternoon"].append(attraction)
-                        else:
-                            daily_plan["evening"].append(attraction)
-                
-                # 이벤트 배치
-                if isinstance(events, list):
-                    for event in events:
-                        event_date = datetime.strptime(event["start_time"], "%Y-%m-%d %H:%M:%S").date()
-                        if start_date and event_date == start_date + timedelta(days=day):
-                            daily_plan["events"].append(event)
-                
-                itinerary["daily_plans"].append(daily_plan)
+            # 관광지 배치
+            for visit in scheduled["visits"]:
+                daily_plan[visit["slot"]].append(visit)
             
-            return itinerary
+            # 이벤트 배치
+            if isinstance(events, list):
+                for event in events:
+                    event_date = datetime.strptime(event["start_time"], "%Y-%m-%d %H:%M:%S").date()
+                    if start_date and event_date == start_date + timedelta(days=day):
+                        daily_plan["events"].append(event)
             
-        except Exception as e:
-            return f"여행 코스를 생성하는 중 오류가 발생했습니다: {str(e)}"
+            itinerary["daily_plans"].append(daily_plan)
+        
+        return itinerary
     
+    def _locate_attractions(self, location, attractions):
+        """관광지에 좌표를 붙이고 매일 출발할 도심 좌표와 함께 반환합니다.
+
+        좌표 데이터에 없는 관광지는 도심에 있는 것으로 봅니다.
+        """
+        geo = get_geo_dataset()
+        start = geo.locate(location)
+        pois = []
+        for attraction in attractions:
+            coords = geo.locate(attraction) if "lat" in attraction and "lon" in attraction else None
+            if coords is None:
+                venue = geo.venue(location, attraction.get("name", ""))
+                coords = (venue["lat"], venue["lon"]) if venue is not None else start
+            # 도시 좌표도 없으면 모든 관광지를 한 곳으로 보고 영업시간만 맞춥니다
+            lat, lon = coords or (0.0, 0.0)
+            # 캐시된 관광지 정보가 바뀌지 않도록 복사본에 좌표를 붙입니다
+            pois.append(dict(attraction, lat=lat, lon=lon))
+        return start, pois
+    
+    @resolves_destination("location")
     def get_emergency_info(self, location):
         """여행지의 비상 연락처 및 안전 정보를 제공합니다."""
         try:
@@ -642,192 +1082,25 @@ class TravelAssistant:
         except Exception as e:
             return f"비상 정보 조회 중 오류가 발생했습니다: {str(e)}"
     
+    @resolves_destination("location")
     def get_exchange_info(self, location):
-        """여행지의 통화 및 환율 정보를 제공합니다."""
+        """여행지의 통화 및 환율 정보를 제공합니다.
+        
+        환율은 마지막으로 가져온 결과를 즉시 사용하고, rates_meta에 갱신 시각과 오래됨 여부를 담습니다.
+        """
         try:
-            # 위치에 따른 통화 정보 매핑
-            location_info = {
-                # 한국
-                "서울": {"country": "한국", "currency": "KRW"},
-                "부산": {"country": "한국", "currency": "KRW"},
-                "제주": {"country": "한국", "currency": "KRW"},
-                "인천": {"country": "한국", "currency": "KRW"},
-                # 일본
-                "도쿄": {"country": "일본", "currency": "JPY"},
-                "오사카": {"country": "일본", "currency": "JPY"},
-                "교토": {"country": "일본", "currency": "JPY"},
-                "후쿠오카": {"country": "일본", "currency": "JPY"},
-                "삿포로": {"country": "일본", "currency": "JPY"},
-                # 중국
-                "베이징": {"country": "중국", "currency": "CNY"},
-                "상하이": {"country": "중국", "currency": "CNY"},
-                "광저우": {"country": "중국", "currency": "CNY"},
-                "청두": {"country": "중국", "currency": "CNY"},
-                # 미국
-                "뉴욕": {"country": "미국", "currency": "USD"},
-                "LA": {"country": "미국", "currency": "USD"},
-                "샌프란시스코": {"country": "미국", "currency": "USD"},
-                "시카고": {"country": "미국", "currency": "USD"},
-                "라스베가스": {"country": "미국", "currency": "USD"},
-                "보스턴": {"country": "미국", "currency": "USD"},
-                # 유럽
-                "파리": {"country": "프랑스", "currency": "EUR"},
-                "런던": {"country": "영국", "currency": "GBP"},
-                "로마": {"country": "이탈리아", "currency": "EUR"},
-                "베니스": {"country": "이탈리아", "currency": "EUR"},
-                "바르셀로나": {"country": "스페인", "currency": "EUR"},
-                "마드리드": {"country": "스페인", "currency": "EUR"},
-                "베를린": {"country": "독일", "currency": "EUR"},
-                "뮌헨": {"country": "독일", "currency": "EUR"},
-                "암스테르담": {"country": "네덜란드", "currency": "EUR"},
-                "비엔나": {"country": "오스트리아", "currency": "EUR"},
-                "취리히": {"country": "스위스", "currency": "CHF"},
-                # 아시아
-                "방콕": {"country": "태국", "currency": "THB"},
-                "싱가포르": {"country": "싱가포르", "currency": "SGD"},
-                "타이페이": {"country": "대만", "currency": "TWD"},
-                "홍콩": {"country": "홍콩", "currency": "HKD"},
-                "마카오": {"country": "마카오", "currency": "MOP"},
-                "하노이": {"country": "베트남", "currency": "VND"},
-                "호치민": {"country": "베트남", "currency": "VND"},
-                "쿠알라룸푸르": {"country": "말레이시아", "currency": "MYR"},
-                # 중동
-                "두바이": {"country": "아랍에미리트", "currency": "AED"},
-                "이스탄불": {"country": "터키", "currency": "TRY"}
-            }
-
+            catalog = self.catalog
+            
             # 기본값으로 한국/KRW 설정
-            country_info = location_info.get(location, {"country": "한국", "currency": "KRW"})
+            country_info = catalog.destinations.get(location, {"country": "한국", "currency": "KRW"})
             base_currency = country_info["currency"]
-
-            # 예시 환율 데이터 (실제로는 API를 통해 가져와야 함)
-            exchange_rates = {
-                "KRW": {
-                    "USD": 0.00075,  # 1원 기준
-                    "EUR": 0.0007,   # 1원 기준
-                    "JPY": 0.11,     # 1원 기준
-                    "CNY": 0.0054    # 1원 기준
-                },
-                "JPY": {
-                    "KRW": 9.1,      # 1엔 기준
-                    "USD": 0.0067,   # 1엔 기준
-                    "EUR": 0.0063,   # 1엔 기준
-                    "CNY": 0.048     # 1엔 기준
-                },
-                "USD": {
-                    "KRW": 1330.0,   # 1달러 기준
-                    "JPY": 150.0,    # 1달러 기준
-                    "EUR": 0.93,     # 1달러 기준
-                    "CNY": 7.2       # 1달러 기준
-                },
-                "EUR": {
-                    "KRW": 1430.0,   # 1유로 기준
-                    "USD": 1.07,     # 1유로 기준
-                    "JPY": 158.0,    # 1유로 기준
-                    "CNY": 7.7       # 1유로 기준
-                },
-                "GBP": {
-                    "KRW": 1670.0,   # 1파운드 기준
-                    "USD": 1.25,     # 1파운드 기준
-                    "EUR": 1.17,     # 1파운드 기준
-                    "JPY": 187.0     # 1파운드 기준
-                },
-                "CNY": {
-                    "KRW": 185.0,    # 1위안 기준
-                    "USD": 0.14,     # 1위안 기준
-                    "EUR": 0.13,     # 1위안 기준
-                    "JPY": 20.8      # 1위안 기준
-                }
-            }
-
-            # 국가별 통화 정보
-            currency_info = {
-                "한국": {
-                    "통화명": "대한민국 원",
-                    "기호": "₩",
-                    "소수점": 0,
-                    "현금/카드": {
-                        "현금": "소액 거래 및 전통 시장에서 현금 선호",
-                        "카드": "대부분의 가게에서 신용카드 사용 가능",
-                        "ATM": "은행 및 편의점에서 ATM 이용 가능"
-                    }
-                },
-                "일본": {
-                    "통화명": "일본 엔",
-                    "기호": "¥",
-                    "소수점": 0,
-                    "현금/카드": {
-                        "현금": "현금 사용이 일반적",
-                        "카드": "대형 상점에서만 신용카드 사용 가능",
-                        "ATM": "편의점에서 ATM 이용 가능"
-                    }
-                },
-                "중국": {
-                    "통화명": "중국 위안",
-                    "기호": "¥",
-                    "소수점": 2,
-                    "현금/카드": {
-                        "현금": "현금 사용이 일반적",
-                        "카드": "대형 상점에서만 신용카드 사용 가능",
-                        "ATM": "은행에서 ATM 이용 가능"
-                    }
-                },
-                "미국": {
-                    "통화명": "미국 달러",
-                    "기호": "$",
-                    "소수점": 2,
-                    "현금/카드": {
-                        "현금": "소액 거래에 현금 사용이 편리",
-                        "카드": "대부분의 가게에서 신용카드 사용 가능",
-                        "ATM": "은행 및 편의점에서 ATM 이용 가능"
-                    }
-                },
-                "프랑스": {
-                    "통화명": "유로",
-                    "기호": "€",
-                    "소수점": 2,
-                    "현금/카드": {
-                        "현금": "소액 거래에 현금 사용이 편리",
-                        "카드": "대부분의 가게에서 신용카드 사용 가능",
-                        "ATM": "은행 및 편의점에서 ATM 이용 가능"
-                    }
-                },
-                "영국": {
-                    "통화명": "영국 파운드",
-                    "기호": "£",
-                    "소수점": 2,
-                    "현금/카드": {
-                        "현금": "소액 거래에 현금 사용이 편리",
-                        "카드": "대부분의 가게에서 신용카드 사용 가능",
-                        "ATM": "은행 및 편의점에서 ATM 이용 가능"
-                    }
-                },
-                "이탈리아": {
-                    "통화명": "유로",
-                    "기호": "€",
-                    "소수점": 2,
-                    "현금/카드": {
-                        "현금": "소액 거래에 현금 사용이 편리",
-                        "카드": "대부분의 가게에서 신용카드 사용 가능",
-                        "ATM": "은행 및 편의점에서 ATM 이용 가능"
-                    }
-                },
-                "스페인": {
-                    "통화명": "유로",
-                    "기호": "€",
-                    "소수점": 2,
-                    "현금/카드": {
-                        "현금": "소액 거래에 현금 사용이 편리",
-                        "카드": "대부분의 가게에서 신용카드 사용 가능",
-                        "ATM": "은행 및 편의점에서 ATM 이용 가능"
-                    }
-                }
-            }
-
-            # 기본 통화 정보가 없는 경우 기본값 설정
-            if country_info["country"] not in currency_info:
-                currency_info[country_info["country"]] = {
-                    "통화명": f"{country_info['country']}의 {base_currency}",
+            country = country_info["country"]
+            
+            # 국가별 통화 정보 (없는 경우 기본값 설정)
+            currency = catalog.currencies.get(country)
+            if currency is None:
+                currency = {
+                    "통화명": f"{country}의 {base_currency}",
                     "기호": base_currency,
                     "소수점": 2,
                     "현금/카드": {
@@ -836,28 +1109,32 @@ class TravelAssistant:
                         "ATM": "은행 ATM 이용 가능"
                     }
                 }
-
-            # 해당 통화의 환율 정보가 없는 경우 기본값 설정
-            if base_currency not in exchange_rates:
-                exchange_rates[base_currency] = {
-                    "KRW": 1000.0,  # 예시 환율
+            
+            # 환율 행렬에서 주요 통화 환율을 읽습니다 (계산할 수 없는 통화는 예시 환율 사용)
+            rates = self.get_fx_matrix().rates_from(base_currency, DISPLAY_CURRENCIES)
+            snapshot = self.snapshots.get(("exchange",))
+            if snapshot is not None:
+                rates_meta = snapshot.meta()
+            else:
+                rates_meta = {"updated_at": None, "age_seconds": None, "stale": False, "source": "catalog"}
+            if not rates:
+                rates = {
+                    "KRW": 1000.0,
                     "USD": 1.0,
                     "EUR": 0.9,
                     "JPY": 110.0
                 }
-
-            rates = exchange_rates[base_currency]
-            country = country_info["country"]
-
+            
             return {
                 "exchange_rates": rates,
-                "currency_info": currency_info[country],
-                "base_currency": base_currency
+                "currency_info": currency,
+                "base_currency": base_currency,
+                "rates_meta": rates_meta
             }
-
         except Exception as e:
             return f"환율 정보 조회 중 오류가 발생했습니다: {str(e)}"
     
+    @resolves_destination("location")
     def get_local_food_info(self, location):
         """여행지의 현지 음식 및 식문화 정보를 제공합니다."""
         try:
@@ -895,6 +1172,7 @@ class TravelAssistant:
         except Exception as e:
             return f"음식 정보 조회 중 오류가 발생했습니다: {str(e)}"
     
+    @resolves_destination("location")
     def get_shopping_info(self, location):
         """여행지의 쇼핑 정보를 제공합니다."""
         try:
@@ -936,11 +1214,131 @@ class TravelAssistant:
             }
         except Exception as e:
             return f"쇼핑 정보 조회 중 오류가 발생했습니다: {str(e)}"
+    
+    # ===== 비동기 API =====
+    # 네트워크 호출은 공유 HTTP 클라이언트(keep-alive 풀)를 그대로 사용하고,
+    # 블로킹 구간은 I/O 스레드 풀에서 실행해 이벤트 루프를 막지 않습니다.
+    
+    async def _run_blocking(self, func, *args, **kwargs):
+        """블로킹 함수를 I/O 스레드 풀에서 실행합니다."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(func, *args, **kwargs))
+    
+    async def _gather(self, *aws):
+        """여러 작업을 동시에 실행합니다. 하나가 실패하거나 취소되면 나머지도 취소합니다."""
+        tasks = [asyncio.ensure_future(aw) for aw in aws]
+        try:
+            return await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+    
+    async def aget_weather(self, location, date):
+        """get_weather의 비동기 버전입니다."""
+        return await self._run_blocking(self.get_weather, location, date)
+    
+    async def aget_weather_range(self, location, start_date, end_date):
+        """get_weather_range의 비동기 버전입니다."""
+        return await self._run_blocking(self.get_weather_range, location, start_date, end_date)
+    
+    async def aget_exchange_info(self, location):
+        """get_exchange_info의 비동기 버전입니다."""
+        return await self._run_blocking(self.get_exchange_info, location)
+    
+    async def aget_events_and_festivals(self, location, start_date=None, end_date=None):
+        """get_events_and_festivals의 비동기 버전입니다."""
+        return await self._run_blocking(self.get_events_and_festivals, location, start_date, end_date)
+    
+    async def aget_photo_bytes(self, photo_url):
+        """get_photo_bytes의 비동기 버전입니다."""
+        return await self._run_blocking(self.get_photo_bytes, photo_url)
+    
+    async def aget_photo_base64(self, photo_url):
+        """get_photo_base64의 비동기 버전입니다."""
+        return await self._run_blocking(self.get_photo_base64, photo_url)
+    
+    @resolves_destination("location")
+    async def aget_destination_overview(self, location, date=None, timeout=None):
+        """get_destination_overview의 비동기 버전입니다. 제한 시간을 넘긴 섹션은 취소됩니다."""
+        date_str = self._to_date(date).strftime("%Y-%m-%d")
+        tasks = {
+            "weather": asyncio.ensure_future(self.aget_weather(location, date_str)),
+            "exchange": asyncio.ensure_future(self.aget_exchange_info(location)),
+            "photos": asyncio.ensure_future(self._run_blocking(self.get_travel_photos, location))
+        }
+        overview = {"location": location, "weather": None, "exchange": None, "photos": None, "pending": []}
+        try:
+            await asyncio.wait(tasks.values(), timeout=timeout or self.overview_timeout)
+        finally:
+            for task in tasks.values():
+                task.cancel()
+            # 취소는 이벤트 루프가 한 번 돌아야 반영되므로 끝날 때까지 기다린 뒤 결과를 확인합니다
+            await asyncio.gather(*tasks.values(), return_exceptions=True)
+        for section, task in tasks.items():
+            if task.cancelled():
+                overview["pending"].append(section)
+            elif task.exception() is not None:
+                overview[section] = f"정보를 가져오는 중 오류가 발생했습니다: {str(task.exception())}"
+            else:
+                overview[section] = task.result()
+        return overview
+    
+    @resolves_destination("location")
+    async def arecommend_personalized_itinerary(self, location, duration, preferences, budget, start_date=None):
+        """recommend_personalized_itinerary의 비동기 버전입니다. 관광지, 이벤트, 날씨를 동시에 조회합니다."""
+        try:
+            first_day = self._to_date(start_date)
+            attractions, events, weather_by_day = await self._gather(
+                self._run_blocking(self.get_popular_attractions, location, limit=None),
+                self.aget_events_and_festivals(
+                    location,
+                    start_date,
+                    start_date + timedelta(days=duration) if start_date else None
+                ),
+                self.aget_weather_range(location, first_day, first_day + timedelta(days=max(duration - 1, 0)))
+            )
+            if not isinstance(attractions, list):
+                return f"관광지 정보를 가져올 수 없습니다: {attractions}"
+            
+            return self._build_itinerary(
+                location, duration, preferences, budget, start_date, attractions, events, weather_by_day
+            )
+            
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            return f"여행 코스를 생성하는 중 오류가 발생했습니다: {str(e)}"
+    
+    async def aplan_trip(self, destination, duration, preferences):
+        """plan_trip의 비동기 버전입니다."""
+        return await self._run_blocking(self.plan_trip, destination, duration, preferences)
+    
+    async def afind_accommodations(self, location, check_in, check_out, guests, budget, near=None, radius_km=None):
+        """find_accommodations의 비동기 버전입니다."""
+        return await self._run_blocking(
+            self.find_accommodations, location, check_in, check_out, guests, budget,
+            near=near, radius_km=radius_km
+        )
+    
+    async def aget_transportation(self, origin, destination, date):
+        """get_transportation의 비동기 버전입니다."""
+        return await self._run_blocking(self.get_transportation, origin, destination, date)
 
 # 간단한 테스트 코드
 if __name__ == "__main__":
+    import time
+    
     assistant = TravelAssistant()
     
+    # 제한 시간을 넘긴 섹션은 취소되고 pending으로 표시되어야 합니다
+    get_travel_photos = assistant.get_travel_photos
+    assistant.get_travel_photos = lambda location: time.sleep(1) or get_travel_photos(location)
+    overview = asyncio.run(assistant.aget_destination_overview("서울", timeout=0.3))
+    assert "photos" in overview["pending"] and overview["photos"] is None, overview
+    del assistant.get_travel_photos
+    
     # 테스트 쿼리
     test_query = "서울에서 부산까지 가는 방법을 알려주세요"
     response = assistant.get_recommendations(test_query)